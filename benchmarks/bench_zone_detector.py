@@ -0,0 +1,68 @@
+"""Times the vectorized zone detector against the reference loop.
+
+Run with ``python benchmarks/bench_zone_detector.py`` after ``pip install -e .``, like the other entry points.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from bot.core.bar_series import BarSeries
+from bot.snd.zone_detector import detect_zones, scan_zones
+from bot.snd.zone_models import ZoneConfig
+from bot.utils.indicators import atr
+from zone_detector_reference import detect_zones_loop, scan_zones_loop
+
+
+def synthetic_series(count: int, seed: int = 7) -> BarSeries:
+    rng = np.random.default_rng(seed)
+    start = int(datetime(2020, 1, 1).timestamp())
+    close = 1.1 + np.cumsum(rng.normal(0, 0.0008, count))
+    open_ = np.r_[1.1, close[:-1]]
+    high = np.maximum(open_, close) + np.abs(rng.normal(0, 0.0003, count))
+    low = np.minimum(open_, close) - np.abs(rng.normal(0, 0.0003, count))
+    times = start + np.arange(count, dtype=np.int64) * int(timedelta(hours=4).total_seconds())
+    return BarSeries(times, open_, high, low, close, np.full(count, 100.0))
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", nargs="+", type=int, default=[300, 5_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    cfg = ZoneConfig()
+    # "scan" is candidate detection alone; "total" adds the overlap de-duplication both paths share.
+    print(f"{'bars':>8} {'scan_loop':>10} {'scan_np':>10} {'speedup':>8} {'total_loop':>11} {'total_np':>10} {'zones':>6}")
+    for size in args.sizes:
+        series = synthetic_series(size)
+        bars = series.to_bars()
+        repeat = args.repeat if size <= 10_000 else 1
+        expected = detect_zones_loop("EURUSD", "H4", bars, cfg)
+        result = detect_zones("EURUSD", "H4", series, cfg)
+        assert result == expected, "vectorized detector diverged from the reference loop"
+        atr_val = atr(series)
+        scan_loop = _best_of(lambda: scan_zones_loop("EURUSD", "H4", bars, cfg, atr_val, 0.0001), repeat)
+        scan_np = _best_of(lambda: scan_zones("EURUSD", "H4", series, cfg, atr_val, 0.0001), repeat)
+        total_loop = _best_of(lambda: detect_zones_loop("EURUSD", "H4", bars, cfg), repeat)
+        total_np = _best_of(lambda: detect_zones("EURUSD", "H4", series, cfg), repeat)
+        print(
+            f"{size:>8} {scan_loop:>10.4f} {scan_np:>10.4f} {scan_loop / scan_np:>7.1f}x "
+            f"{total_loop:>11.4f} {total_np:>10.4f} {len(result.zones):>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from typing import List, Optional
+
+import numpy as np
+
+from bot.core.bar_series import BarSeries, from_epoch
+from bot.core.models import Bar
+
+
+class BarRingBuffer:
+    """Fixed-capacity OHLCV history.
+
+    Every row is written twice, ``capacity`` apart, so the newest rows are always one contiguous
+    slice and ``view()`` never copies. Views alias the buffer and are only valid until the next
+    write wraps over them.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = max(int(capacity), 1)
+        self._time = np.zeros(2 * self.capacity, dtype=np.int64)
+        self._prices = np.zeros((5, 2 * self.capacity), dtype=np.float64)
+        self._end = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def last_time(self) -> Optional[int]:
+        if not self._size:
+            return None
+        return int(self._time[(self._end - 1) % self.capacity])
+
+    def _write(self, i: int, ts: int, open: float, high: float, low: float, close: float, volume: float) -> None:
+        for j in (i, i + self.capacity):
+            self._time[j] = ts
+            self._prices[:, j] = (open, high, low, close, volume)
+
+    def append(self, ts: int, open: float, high: float, low: float, close: float, volume: float) -> None:
+        self._write(self._end, ts, open, high, low, close, volume)
+        self._end = (self._end + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def replace_last(self, ts: int, open: float, high: float, low: float, close: float, volume: float) -> None:
+        self._write((self._end - 1) % self.capacity, ts, open, high, low, close, volume)
+
+    def view(self, count: Optional[int] = None) -> BarSeries:
+        n = self._size if count is None else max(0, min(count, self._size))
+        stop = self._end + self.capacity
+        p = self._prices
+        return BarSeries(
+            self._time[stop - n : stop],
+            p[0, stop - n : stop],
+            p[1, stop - n : stop],
+            p[2, stop - n : stop],
+            p[3, stop - n : stop],
+            p[4, stop - n : stop],
+        )
+
+
+def _rate_bar(row) -> Bar:
+    # UTC-naive, like ``BarSeries`` rows, so ``get_bars`` and ``get_bars_array`` agree on bar times.
+    return Bar(
+        time=from_epoch(row["time"]),
+        open=float(row["open"]),
+        high=float(row["high"]),
+        low=float(row["low"]),
+        close=float(row["close"]),
+        volume=float(row["tick_volume"]),
+    )
+
+
+class BarFeed:
+    """Ring buffer plus the matching ``Bar`` objects for one symbol and timeframe, fed from MT5 rates."""
+
+    def __init__(self, capacity: int) -> None:
+        self.buffer = BarRingBuffer(capacity)
+        self.bars: List[Bar] = []
+
+    @property
+    def capacity(self) -> int:
+        return self.buffer.capacity
+
+    @property
+    def last_time(self) -> Optional[int]:
+        return self.buffer.last_time
+
+    def merge(self, rates) -> int:
+        """Applies MT5 rates rows; the row matching the newest held bar replaces it. Returns rows applied."""
+        applied = 0
+        for row in rates:
+            ts = int(row["time"])
+            last = self.buffer.last_time
+            values = (ts, float(row["open"]), float(row["high"]), float(row["low"]), float(row["close"]), float(row["tick_volume"]))
+            if last is not None and ts == last:
+                self.buffer.replace_last(*values)
+                self.bars[-1] = _rate_bar(row)
+            elif last is None or ts > last:
+                self.buffer.append(*values)
+                self.bars.append(_rate_bar(row))
+            else:
+                continue
+            applied += 1
+        if len(self.bars) > self.capacity:
+            del self.bars[: len(self.bars) - self.capacity]
+        return applied
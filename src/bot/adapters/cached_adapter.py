@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+from bot.core.bar_series import BarSeries, Bars
+from bot.core.interfaces import BrokerAdapter
+from bot.core.models import AccountInfo, OrderRequest, OrderResult, Tick
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class CachedAdapter:
+    """Wraps any ``BrokerAdapter`` and caches symbol specs and account info for a TTL.
+
+    Account info is dropped whenever an order, modification or close goes through the wrapper.
+    A TTL of zero disables caching for that item.
+    """
+
+    def __init__(
+        self,
+        adapter: BrokerAdapter,
+        symbol_info_ttl: float = 3600.0,
+        account_info_ttl: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.adapter = adapter
+        self.symbol_info_ttl = symbol_info_ttl
+        self.account_info_ttl = account_info_ttl
+        self.clock = clock
+        self._symbol_info: Dict[str, Tuple[float, dict]] = {}
+        self._account: Optional[Tuple[float, AccountInfo]] = None
+        self.stats: Dict[str, CacheStats] = {"symbol_info": CacheStats(), "account_info": CacheStats()}
+
+    def __getattr__(self, name: str):
+        # Adapter-specific extras (last_error, ensure_symbol, ...) pass straight through.
+        if name == "adapter":
+            raise AttributeError(name)
+        return getattr(self.adapter, name)
+
+    def invalidate(self, symbol: Optional[str] = None) -> None:
+        if symbol is None:
+            self._symbol_info.clear()
+        else:
+            self._symbol_info.pop(symbol, None)
+        self._account = None
+
+    def invalidate_account(self) -> None:
+        self._account = None
+
+    def connect(self) -> bool:
+        self.invalidate()
+        return self.adapter.connect()
+
+    def is_connected(self) -> bool:
+        return self.adapter.is_connected()
+
+    def shutdown(self) -> None:
+        self.invalidate()
+        self.adapter.shutdown()
+
+    def get_bars(self, symbol: str, timeframe: str, count: int) -> Bars:
+        return self.adapter.get_bars(symbol, timeframe, count)
+
+    def get_bars_array(self, symbol: str, timeframe: str, count: int) -> BarSeries:
+        return self.adapter.get_bars_array(symbol, timeframe, count)
+
+    def get_tick(self, symbol: str) -> Tick:
+        return self.adapter.get_tick(symbol)
+
+    def get_account_info(self) -> AccountInfo:
+        now = self.clock()
+        if self._account is not None and now < self._account[0]:
+            self.stats["account_info"].hits += 1
+            return self._account[1]
+        self.stats["account_info"].misses += 1
+        info = self.adapter.get_account_info()
+        self._account = (now + self.account_info_ttl, info) if self.account_info_ttl > 0 else None
+        return info
+
+    def get_open_positions(self, symbol: Optional[str] = None):
+        return self.adapter.get_open_positions(symbol)
+
+    def place_order(self, order: OrderRequest) -> OrderResult:
+        result = self.adapter.place_order(order)
+        self._account = None
+        return result
+
+    def modify_position(self, position_id: str, stop_loss: float, take_profit: float) -> OrderResult:
+        result = self.adapter.modify_position(position_id, stop_loss, take_profit)
+        self._account = None
+        return result
+
+    def close_position(self, position_id: str) -> OrderResult:
+        result = self.adapter.close_position(position_id)
+        self._account = None
+        return result
+
+    def symbol_info(self, symbol: str) -> dict:
+        now = self.clock()
+        cached = self._symbol_info.get(symbol)
+        if cached is not None and now < cached[0]:
+            self.stats["symbol_info"].hits += 1
+            return cached[1]
+        self.stats["symbol_info"].misses += 1
+        info = self.adapter.symbol_info(symbol)
+        # Empty specs mean the symbol was not found; ask again next time.
+        if info and self.symbol_info_ttl > 0:
+            self._symbol_info[symbol] = (now + self.symbol_info_ttl, info)
+        return info
@@ -1,23 +1,46 @@
 from __future__ import annotations
 
+import functools
 import os
-from datetime import datetime
-from typing import List, Optional, Tuple
+import threading
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
 
 try:
     import MetaTrader5 as mt5
 except Exception:  # pragma: no cover
     mt5 = None
 
+from bot.adapters.bar_feed import BarFeed
+from bot.core.bar_series import BarSeries, from_epoch
 from bot.core.models import Bar, Tick, OrderRequest, OrderResult, Position, AccountInfo
 
 
+_F = TypeVar("_F", bound=Callable)
+
+
+def _serialised(method: _F) -> _F:
+    """Runs ``method`` under the adapter's lock: the MetaTrader5 IPC is not documented as thread-safe."""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
 class MT5Adapter:
-    def __init__(self, terminal_path: Optional[str] = None) -> None:
+    """MetaTrader5 terminal access; every public call is serialised, so engine worker threads can share one adapter."""
+
+    def __init__(self, terminal_path: Optional[str] = None, bar_buffer_size: int = 1000) -> None:
+        self._lock = threading.RLock()
         self.terminal_path = terminal_path
+        self.bar_buffer_size = bar_buffer_size
         self._symbol_cache: dict[str, str] = {}
+        self._feeds: Dict[Tuple[str, str], BarFeed] = {}
         self.last_error: Optional[str] = None
 
+    @_serialised
     def connect(self) -> bool:
         if mt5 is None:
             raise RuntimeError("MetaTrader5 package not available. Install on Windows with MT5 terminal.")
@@ -44,37 +67,73 @@ class MT5Adapter:
             self.last_error = msg
         return ok
 
+    @_serialised
     def is_connected(self) -> bool:
         return mt5 is not None and mt5.terminal_info() is not None
 
+    @_serialised
     def shutdown(self) -> None:
         if mt5:
             mt5.shutdown()
         self.last_error = None
 
-    def get_bars(self, symbol: str, timeframe: str, count: int) -> List[Bar]:
+    def _load_feed(self, symbol: str, timeframe: str, capacity: int) -> Optional[BarFeed]:
+        rates = mt5.copy_rates_from_pos(symbol, getattr(mt5, f"TIMEFRAME_{timeframe}"), 0, capacity)
+        if rates is None or not len(rates):
+            self._feeds.pop((symbol, timeframe), None)
+            return None
+        feed = BarFeed(capacity)
+        feed.merge(rates)
+        self._feeds[(symbol, timeframe)] = feed
+        return feed
+
+    @_serialised
+    def bar_feed(self, symbol: str, timeframe: str, count: int) -> Optional[BarFeed]:
+        """Brings the cached feed up to date, asking MT5 only for rows newer than the last one held."""
         symbol = self.ensure_symbol(symbol)
+        feed = self._feeds.get((symbol, timeframe))
+        if feed is None or feed.capacity < count:
+            return self._load_feed(symbol, timeframe, max(count, self.bar_buffer_size))
+
         tf = getattr(mt5, f"TIMEFRAME_{timeframe}")
-        rates = mt5.copy_rates_from_pos(symbol, tf, 0, count)
-        if rates is None:
+        last = feed.last_time
+        fetch = 2
+        while True:
+            rates = mt5.copy_rates_from_pos(symbol, tf, 0, fetch)
+            if rates is None or not len(rates):
+                return feed
+            # Stop once the oldest row fetched overlaps the newest bar held.
+            if int(rates["time"][0]) <= last or fetch >= feed.capacity:
+                break
+            fetch *= 2
+        if int(rates["time"][0]) > last or int(rates["time"][-1]) < last:
+            # Gap wider than the buffer, or history rewritten: start over.
+            return self._load_feed(symbol, timeframe, feed.capacity)
+        feed.merge(rates)
+        return feed
+
+    @_serialised
+    def get_bars(self, symbol: str, timeframe: str, count: int) -> List[Bar]:
+        feed = self.bar_feed(symbol, timeframe, count) if count > 0 else None
+        if feed is None:
             return []
-        return [
-            Bar(
-                time=datetime.fromtimestamp(int(r["time"])),
-                open=float(r["open"]),
-                high=float(r["high"]),
-                low=float(r["low"]),
-                close=float(r["close"]),
-                volume=float(r["tick_volume"]),
-            )
-            for r in rates
-        ]
+        return feed.bars[-count:]
+
+    @_serialised
+    def get_bars_array(self, symbol: str, timeframe: str, count: int) -> BarSeries:
+        # A view into the feed's ring buffer: valid until the next fetch for this symbol and timeframe.
+        feed = self.bar_feed(symbol, timeframe, count) if count > 0 else None
+        if feed is None:
+            return BarSeries.empty()
+        return feed.buffer.view(count)
 
+    @_serialised
     def get_tick(self, symbol: str) -> Tick:
         symbol = self.ensure_symbol(symbol)
         tick = mt5.symbol_info_tick(symbol)
-        return Tick(time=datetime.fromtimestamp(tick.time), bid=tick.bid, ask=tick.ask)
+        return Tick(time=from_epoch(tick.time), bid=tick.bid, ask=tick.ask)
 
+    @_serialised
     def get_account_info(self) -> AccountInfo:
         info = mt5.account_info()
         return AccountInfo(
@@ -84,6 +143,7 @@ class MT5Adapter:
             currency=info.currency,
         )
 
+    @_serialised
     def get_open_positions(self, symbol: Optional[str] = None) -> List[Position]:
         symbol = self.ensure_symbol(symbol) if symbol else symbol
         positions = mt5.positions_get(symbol=symbol) if symbol else mt5.positions_get()
@@ -99,12 +159,13 @@ class MT5Adapter:
                     entry_price=float(p.price_open),
                     stop_loss=float(p.sl),
                     take_profit=float(p.tp),
-                    open_time=datetime.fromtimestamp(p.time),
+                    open_time=from_epoch(p.time),
                     broker_position_id=str(p.ticket),
                 )
             )
         return result
 
+    @_serialised
     def place_order(self, order: OrderRequest) -> OrderResult:
         symbol = self.ensure_symbol(order.symbol)
         request = {
@@ -131,6 +192,7 @@ class MT5Adapter:
             message=str(result.comment),
         )
 
+    @_serialised
     def modify_position(self, position_id: str, stop_loss: float, take_profit: float) -> OrderResult:
         request = {
             "action": mt5.TRADE_ACTION_SLTP,
@@ -148,6 +210,7 @@ class MT5Adapter:
             message=str(result.comment),
         )
 
+    @_serialised
     def close_position(self, position_id: str) -> OrderResult:
         pos = mt5.positions_get(ticket=int(position_id))
         if not pos:
@@ -175,6 +238,7 @@ class MT5Adapter:
             message=str(result.comment),
         )
 
+    @_serialised
     def symbol_info(self, symbol: str) -> dict:
         symbol = self.ensure_symbol(symbol)
         info = mt5.symbol_info(symbol)
@@ -194,6 +258,7 @@ class MT5Adapter:
             "trade_mode": info.trade_mode,
         }
 
+    @_serialised
     def ensure_symbol(self, symbol: str) -> str:
         if symbol is None:
             return symbol
@@ -214,6 +279,7 @@ class MT5Adapter:
         self._symbol_cache[symbol] = symbol
         return symbol
 
+    @_serialised
     def connection_status(self) -> Tuple[bool, str]:
         if mt5 is None:
             return False, "MetaTrader5 package not available."
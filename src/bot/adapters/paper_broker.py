@@ -3,7 +3,8 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Dict, List, Optional
 
-from bot.core.models import Bar, Tick, OrderRequest, OrderResult, Position, AccountInfo
+from bot.core.bar_series import BarSeries, Bars
+from bot.core.models import Tick, OrderRequest, OrderResult, Position, AccountInfo
 
 
 class PaperBroker:
@@ -14,7 +15,7 @@ class PaperBroker:
         self.currency = "USD"
         self.positions: Dict[str, Position] = {}
         self.last_tick: Dict[str, Tick] = {}
-        self.bars: Dict[str, Dict[str, List[Bar]]] = {}
+        self.bars: Dict[str, Dict[str, Bars]] = {}
 
     def connect(self) -> bool:
         return True
@@ -25,7 +26,7 @@ class PaperBroker:
     def shutdown(self) -> None:
         return None
 
-    def seed_bars(self, symbol: str, timeframe: str, bars: List[Bar]) -> None:
+    def seed_bars(self, symbol: str, timeframe: str, bars: Bars) -> None:
         self.bars.setdefault(symbol, {})[timeframe] = bars
 
     def seed_tick(self, symbol: str, tick: Tick) -> None:
@@ -41,8 +42,17 @@ class PaperBroker:
                 if tick.ask >= pos.stop_loss or tick.ask <= pos.take_profit:
                     self.close_position(pid)
 
-    def get_bars(self, symbol: str, timeframe: str, count: int) -> List[Bar]:
-        return list(self.bars.get(symbol, {}).get(timeframe, []))[-count:]
+    def get_bars(self, symbol: str, timeframe: str, count: int) -> Bars:
+        bars = self.bars.get(symbol, {}).get(timeframe, [])
+        if isinstance(bars, BarSeries):
+            return bars[-count:]
+        return list(bars)[-count:]
+
+    def get_bars_array(self, symbol: str, timeframe: str, count: int) -> BarSeries:
+        bars = self.bars.get(symbol, {}).get(timeframe, [])
+        if isinstance(bars, BarSeries):
+            return bars[-count:]
+        return BarSeries.from_bars(list(bars)[-count:])
 
     def get_tick(self, symbol: str) -> Tick:
         return self.last_tick[symbol]
@@ -4,6 +4,7 @@ from typing import List, Optional
 
 from bot.adapters.mt5_adapter import MT5Adapter
 from bot.adapters.paper_broker import PaperBroker
+from bot.core.bar_series import BarSeries
 from bot.core.models import Bar, Tick, OrderRequest, OrderResult, Position, AccountInfo
 
 
@@ -26,6 +27,9 @@ class PaperMT5Adapter:
     def get_bars(self, symbol: str, timeframe: str, count: int) -> List[Bar]:
         return self.mt5.get_bars(symbol, timeframe, count)
 
+    def get_bars_array(self, symbol: str, timeframe: str, count: int) -> BarSeries:
+        return self.mt5.get_bars_array(symbol, timeframe, count)
+
     def get_tick(self, symbol: str) -> Tick:
         tick = self.mt5.get_tick(symbol)
         self.paper.seed_tick(symbol, tick)
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import csv
+import hashlib
+import json
+import re
+import shutil
+from datetime import datetime, timedelta, timezone, tzinfo
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from bot.core.bar_series import BarSeries, to_epoch
+
+COLUMNS = ("time", "open", "high", "low", "close", "volume")
+FORMAT_VERSION = 1
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+_UTC_OFFSET = re.compile(r"(?:Z|[+-]\d{2}:?\d{2})$")
+
+
+def _parse_times(values: List[str]) -> Tuple[np.ndarray, Optional[tzinfo]]:
+    # A series carries one tz, so every row must share the first row's UTC offset (or lack of one).
+    tz = datetime.fromisoformat(values[0]).tzinfo if values else None
+    if tz is None:
+        if any(_UTC_OFFSET.search(v.strip()) for v in values):
+            raise ValueError("CSV mixes naive and UTC-offset timestamps")
+        # Naive timestamps are UTC wall clock, same as ``to_epoch``; numpy parses them in bulk.
+        return np.array(values, dtype="datetime64[s]").astype(np.int64), None
+    parsed = [datetime.fromisoformat(v) for v in values]
+    offsets = {dt.utcoffset() for dt in parsed}
+    if len(offsets) > 1:
+        shown = ", ".join(sorted(str(o) for o in offsets))
+        raise ValueError(f"CSV timestamps use several UTC offsets ({shown}); convert them to UTC or one fixed offset")
+    return np.array([to_epoch(dt) for dt in parsed], dtype=np.int64), tz
+
+
+def read_csv_series(path: str) -> BarSeries:
+    """Parses a ``time,open,high,low,close[,volume]`` CSV into a ``BarSeries``."""
+    with open(path, "r", newline="") as f:
+        reader = csv.DictReader(f)
+        rows = list(reader)
+    times, tz = _parse_times([row["time"] for row in rows])
+    open_, high, low, close = (np.array([row[name] for row in rows], dtype=np.float64) for name in ("open", "high", "low", "close"))
+    volume = np.array([row.get("volume") or 0 for row in rows], dtype=np.float64)
+    return BarSeries(times, open_, high, low, close, volume, tz=tz)
+
+
+class BarCache:
+    """Columnar ``.npy`` bar store under ``<root>/<symbol>/<timeframe>/``.
+
+    Each entry holds one file per column (int64 epoch seconds, float64 prices) plus ``meta.json``
+    recording the source CSV's size, mtime and sha256. Loads memory-map the columns, so opening a
+    multi-year history costs a few page faults rather than a parse.
+    """
+
+    def __init__(self, root: str = "data/bars") -> None:
+        self.root = Path(root)
+
+    def path(self, symbol: str, timeframe: str) -> Path:
+        return self.root / symbol.upper() / timeframe.upper()
+
+    def meta(self, symbol: str, timeframe: str) -> Optional[Dict]:
+        meta_path = self.path(symbol, timeframe) / "meta.json"
+        if not meta_path.exists():
+            return None
+        with open(meta_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def ingest(self, csv_path: str, symbol: str, timeframe: str) -> Dict:
+        source = Path(csv_path)
+        series = read_csv_series(csv_path)
+        stat = source.stat()
+        meta = {
+            "version": FORMAT_VERSION,
+            "symbol": symbol.upper(),
+            "timeframe": timeframe.upper(),
+            "rows": len(series),
+            "first": int(series.time[0]) if len(series) else None,
+            "last": int(series.time[-1]) if len(series) else None,
+            "utc_offset_seconds": series.tz.utcoffset(None).total_seconds() if series.tz is not None else None,
+            "source": str(source.resolve()),
+            "source_size": stat.st_size,
+            "source_mtime": stat.st_mtime,
+            "source_sha256": file_sha256(source),
+        }
+        target = self.path(symbol, timeframe)
+        staging = target.with_name(target.name + ".tmp")
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+        for name in COLUMNS:
+            np.save(staging / f"{name}.npy", np.ascontiguousarray(getattr(series, name)))
+        with open(staging / "meta.json", "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+        # Swap in the finished entry so readers never see a half-written one.
+        shutil.rmtree(target, ignore_errors=True)
+        staging.replace(target)
+        return meta
+
+    def is_fresh(self, csv_path: str, symbol: str, timeframe: str) -> bool:
+        meta = self.meta(symbol, timeframe)
+        if meta is None or meta.get("version") != FORMAT_VERSION:
+            return False
+        source = Path(csv_path)
+        stat = source.stat()
+        if stat.st_size != meta["source_size"]:
+            return False
+        if stat.st_mtime == meta["source_mtime"] and str(source.resolve()) == meta.get("source"):
+            return True
+        # Touched, copied or a different file of the same size: fall back to the content hash.
+        return file_sha256(source) == meta["source_sha256"]
+
+    def load(self, symbol: str, timeframe: str, mmap: bool = True) -> BarSeries:
+        meta = self.meta(symbol, timeframe)
+        if meta is None:
+            raise FileNotFoundError(f"no cached bars for {symbol} {timeframe} under {self.root}")
+        base = self.path(symbol, timeframe)
+        mode = "r" if mmap else None
+        columns = [np.load(base / f"{name}.npy", mmap_mode=mode) for name in COLUMNS]
+        offset = meta.get("utc_offset_seconds")
+        tz = timezone(timedelta(seconds=offset)) if offset is not None else None
+        return BarSeries(*columns, tz=tz)
+
+    def load_csv(self, csv_path: str, symbol: str, timeframe: str) -> BarSeries:
+        """Loads ``csv_path`` through the cache, (re)ingesting it first if it is new or changed."""
+        if not self.is_fresh(csv_path, symbol, timeframe):
+            self.ingest(csv_path, symbol, timeframe)
+        return self.load(symbol, timeframe)
+
+
+def load_bars(csv_path: str, symbol: str, timeframe: str, cache_root: Optional[str] = "data/bars") -> BarSeries:
+    """CSV bars via the binary cache; ``cache_root=None`` parses the CSV directly."""
+    if cache_root is None:
+        return read_csv_series(csv_path)
+    return BarCache(cache_root).load_csv(csv_path, symbol, timeframe)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convert OHLCV CSVs into the binary bar cache")
+    parser.add_argument("--root", default="data/bars")
+    sub = parser.add_subparsers(dest="command", required=True)
+    ingest = sub.add_parser("ingest")
+    ingest.add_argument("--csv", required=True)
+    ingest.add_argument("--symbol", required=True)
+    ingest.add_argument("--timeframe", required=True)
+    info = sub.add_parser("info")
+    info.add_argument("--symbol", required=True)
+    info.add_argument("--timeframe", required=True)
+    args = parser.parse_args()
+
+    cache = BarCache(args.root)
+    if args.command == "ingest":
+        print(json.dumps(cache.ingest(args.csv, args.symbol, args.timeframe), indent=2))
+    else:
+        print(json.dumps(cache.meta(args.symbol, args.timeframe), indent=2))
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Optional, Union
+
+import numpy as np
+
+from bot.core.bar_series import BarSeries
+
+# Which level wins when one bar's range spans both stop and take-profit:
+#   "stop"    - assume the stop filled first (conservative default)
+#   "take"    - assume the take-profit filled first
+#   "nearest" - whichever level is closer to the bar's open
+SAME_BAR_RULES = ("stop", "take", "nearest")
+
+
+def _min_levels(values: np.ndarray) -> List[np.ndarray]:
+    # levels[k][p] = min(values[p : p + 2**k])
+    levels = [np.asarray(values, dtype=np.float64)]
+    span = 1
+    while span * 2 <= levels[0].shape[0]:
+        prev = levels[-1]
+        levels.append(np.minimum(prev[:-span], prev[span:]))
+        span *= 2
+    return levels
+
+
+def _first_at_or_below(levels: List[np.ndarray], start: np.ndarray, end: np.ndarray, bound: np.ndarray) -> np.ndarray:
+    """First index in ``[start, end)`` whose value is <= ``bound``, or ``end`` if there is none.
+
+    Every trade advances past the longest power-of-two run that stays above its bound, largest
+    run first, so a batch resolves in one vectorized step per table level.
+    """
+    pos = start.copy()
+    for k in range(len(levels) - 1, -1, -1):
+        span = 1 << k
+        level = levels[k]
+        fits = pos + span <= end
+        clear = level[np.where(fits, pos, 0)] > bound
+        pos = np.where(fits & clear, pos + span, pos)
+    return pos
+
+
+class ExtremaTable:
+    """Sparse tables of low minima and high maxima over a bar series, built once per series.
+
+    Memory is ``2 * n * log2(n)`` floats; build one per history and reuse it across batches.
+    """
+
+    def __init__(self, high: np.ndarray, low: np.ndarray) -> None:
+        self.size = int(np.asarray(low).shape[0])
+        self._low = _min_levels(low)
+        self._neg_high = _min_levels(-np.asarray(high, dtype=np.float64))
+
+    @classmethod
+    def from_series(cls, bars: BarSeries) -> "ExtremaTable":
+        return cls(bars.high, bars.low)
+
+    def first_low_at_or_below(self, start: np.ndarray, end: np.ndarray, bound: np.ndarray) -> np.ndarray:
+        return _first_at_or_below(self._low, start, end, bound)
+
+    def first_high_at_or_above(self, start: np.ndarray, end: np.ndarray, bound: np.ndarray) -> np.ndarray:
+        return _first_at_or_below(self._neg_high, start, end, -bound)
+
+
+@dataclass
+class ExitBatch:
+    """Per-trade exit bar index, fill price and reason (``stop_loss``, ``take_profit``, ``timeout``, ``end_of_data``)."""
+
+    index: np.ndarray
+    price: np.ndarray
+    reason: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.index.shape[0])
+
+
+def simulate_exits(
+    bars: BarSeries,
+    entry_index: np.ndarray,
+    side: np.ndarray,
+    stop: np.ndarray,
+    take: np.ndarray,
+    max_hold_bars: Optional[Union[int, np.ndarray]] = None,
+    same_bar: str = "stop",
+    table: Optional[ExtremaTable] = None,
+) -> ExitBatch:
+    """Resolves a batch of entries against the bars that follow them.
+
+    Each trade is entered at the close of ``bars[entry_index]`` (``side`` +1 long, -1 short) and
+    exits on the first later bar whose high/low reaches its stop or take-profit. A bar that opens
+    beyond a level fills at the open. A trade still open ``max_hold_bars`` bars after entry exits
+    at that bar's close; one still open when the data ends is marked at the last close. Cost is
+    O(trades * log(bars)) on top of the table build.
+    """
+    if same_bar not in SAME_BAR_RULES:
+        raise ValueError(f"same_bar must be one of {SAME_BAR_RULES}, got {same_bar!r}")
+    entry_index = np.asarray(entry_index, dtype=np.int64)
+    buy = np.asarray(side) > 0
+    stop = np.asarray(stop, dtype=np.float64)
+    take = np.asarray(take, dtype=np.float64)
+    n = len(bars)
+    if table is None:
+        table = ExtremaTable.from_series(bars)
+    elif table.size != n:
+        raise ValueError("extrema table was built for a different series")
+    if entry_index.size and (entry_index.min() < 0 or entry_index.max() >= n):
+        raise ValueError("entry index out of range")
+
+    start = entry_index + 1
+    if max_hold_bars is None:
+        deadline = np.full(entry_index.shape, n, dtype=np.int64)
+    else:
+        deadline = entry_index + np.asarray(max_hold_bars, dtype=np.int64)
+    last = np.minimum(deadline, n - 1)
+    end = np.maximum(last + 1, start)
+
+    low_hit = table.first_low_at_or_below(start, end, np.where(buy, stop, take))
+    high_hit = table.first_high_at_or_above(start, end, np.where(buy, take, stop))
+    stop_at = np.where(buy, low_hit, high_hit)
+    take_at = np.where(buy, high_hit, low_hit)
+    stop_hit = stop_at < end
+    take_hit = take_at < end
+
+    open_ = np.asarray(bars.open, dtype=np.float64)
+    both = stop_hit & take_hit & (stop_at == take_at)
+    if same_bar == "stop":
+        take_first = np.zeros_like(both)
+    elif same_bar == "take":
+        take_first = both
+    else:
+        bar_open = open_[np.where(both, stop_at, 0)]
+        take_first = both & (np.abs(take - bar_open) < np.abs(bar_open - stop))
+    stop_wins = stop_hit & (~take_hit | (stop_at < take_at) | (both & ~take_first))
+    take_wins = take_hit & ~stop_wins
+
+    close = np.asarray(bars.close, dtype=np.float64)
+    index = np.where(stop_wins, stop_at, np.where(take_wins, take_at, last))
+    fill_open = open_[np.minimum(index, n - 1)]
+    stop_fill = np.where(buy, np.minimum(stop, fill_open), np.maximum(stop, fill_open))
+    take_fill = np.where(buy, np.maximum(take, fill_open), np.minimum(take, fill_open))
+    price = np.where(stop_wins, stop_fill, np.where(take_wins, take_fill, close[index]))
+
+    reason = np.where(deadline <= n - 1, "timeout", "end_of_data").astype(object)
+    reason[stop_wins] = "stop_loss"
+    reason[take_wins] = "take_profit"
+    return ExitBatch(index=index, price=price, reason=reason)
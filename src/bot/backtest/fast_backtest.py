@@ -0,0 +1,488 @@
+from __future__ import annotations
+
+import json
+import math
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, time as dtime
+from typing import Callable, Dict, List, Optional, Sequence
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from bot.adapters.paper_broker import PaperBroker
+from bot.backtest.bar_cache import load_bars
+from bot.backtest.metrics import compute_metrics
+from bot.backtest.runner import NullJournal, quiet_logger, simulate
+from bot.core.bar_series import BarSeries, from_epoch
+from bot.core.config import BotConfig, SessionConfig, SymbolConfig, load_config
+from bot.core.models import MarketState, OrderSide, OrderType, Regime, Signal, Tick
+from bot.core.news import NewsRiskFilter
+from bot.core.risk import HardRiskManager
+from bot.db.sqlite_store import SQLiteStore
+from bot.strategies.range import RangeStrategy
+from bot.strategies.trend import TrendStrategy
+from bot.utils.indicators import atr_series, ema_series, range_compression_series, rolling_max, rolling_min, rsi_series, trend_strength_series
+from bot.utils.resample import resample_series
+
+# Mirrors what the engine sees under ``simulate``: ticks at the bar close with a fixed spread,
+# evaluation from the 50th M15 and H1 bar on.
+SPREAD = 0.0001
+MIN_BARS = 50
+H1_SECONDS = 3600
+M15_SECONDS = 900
+
+
+def h1_release_counts(times: np.ndarray) -> np.ndarray:
+    """Closed H1 bars visible after each M15 bar, using ``StreamingResampler``'s close rule."""
+    buckets = times - times % H1_SECONDS
+    last_slot = times + M15_SECONDS >= buckets + H1_SECONDS
+    closes = last_slot.astype(np.int64)
+    # A gap that skips the final slot closes the hour when the next one starts.
+    closes[1:] += (buckets[1:] != buckets[:-1]) & ~last_slot[:-1]
+    return np.cumsum(closes)
+
+
+def _seconds(value: dtime) -> float:
+    return value.hour * 3600 + value.minute * 60 + value.second + value.microsecond / 1e6
+
+
+def session_names(times: np.ndarray, sessions: Sequence[SessionConfig], tz: str) -> np.ndarray:
+    """``in_sessions`` for every bar; the UTC offset is looked up once per hour."""
+    hours, inverse = np.unique(times // H1_SECONDS, return_inverse=True)
+    zone = ZoneInfo(tz)
+    offsets = np.array([datetime.fromtimestamp(int(h) * H1_SECONDS, zone).utcoffset().total_seconds() for h in hours], dtype=np.int64)
+    seconds = (times + offsets[inverse]) % 86400
+    names = np.full(times.shape[0], "OFF", dtype=object)
+    unmatched = np.ones(times.shape[0], dtype=bool)
+    for session in sessions:
+        start, end = _seconds(session.start), _seconds(session.end)
+        if start <= end:
+            hit = (seconds >= start) & (seconds <= end)
+        else:
+            hit = (seconds >= start) | (seconds <= end)
+        hit &= unmatched
+        names[hit] = session.name
+        unmatched &= ~hit
+    return names
+
+
+@dataclass
+class MarketArrays:
+    """``MarketObserver.evaluate`` for every M15 bar; ``ready`` marks bars the engine would evaluate."""
+
+    ready: np.ndarray
+    trend: np.ndarray
+    atr: np.ndarray
+    compression: np.ndarray
+    ret_1: np.ndarray
+    session: np.ndarray
+    confidence: np.ndarray
+    trending: np.ndarray
+    secondary: np.ndarray
+
+    def state(self, symbol: str, i: int, now: datetime) -> MarketState:
+        trending = bool(self.trending[i])
+        compression = float(self.compression[i])
+        notes = ["trend_strength"] if trending else []
+        if compression < 0.001:
+            notes.append("clean_trend" if trending else "tight_range")
+        return MarketState(
+            symbol=symbol,
+            time=now,
+            regime_primary=Regime.TREND if trending else Regime.RANGE,
+            regime_secondary=self.secondary[i],
+            trend_strength=float(self.trend[i]),
+            volatility=float(self.atr[i]),
+            range_compression=compression,
+            return_1=float(self.ret_1[i]),
+            session=self.session[i],
+            confidence=float(self.confidence[i]),
+            notes=notes,
+        )
+
+
+def market_arrays(config: BotConfig, bars: BarSeries) -> MarketArrays:
+    close = np.asarray(bars.close, dtype=np.float64)
+    n = close.shape[0]
+    h1 = resample_series(bars, "M15", "H1", include_partial=True)
+    released = h1_release_counts(np.asarray(bars.time, dtype=np.int64))
+    h1_trend = trend_strength_series(h1.close)
+    trend = np.where(released > 0, h1_trend[np.maximum(released - 1, 0)], 0.0) if len(h1) else np.zeros(n)
+    atr = atr_series(bars.high, bars.low, close)
+
+    prev = np.r_[1.0, close[:-1]]
+    ret_1 = np.zeros(n)
+    ret_1[1:] = (close[1:] - prev[1:]) / np.where(prev[1:] != 0, prev[1:], 1.0)
+
+    session = session_names(np.asarray(bars.time, dtype=np.int64), config.sessions, config.default_timezone)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vol_ratio = atr / close
+    secondary = np.full(n, Regime.LOW_VOL, dtype=object)
+    secondary[(atr > 0) & (vol_ratio > 0.004)] = Regime.HIGH_VOL
+    secondary[(atr > 0) & (vol_ratio >= 0.0015) & (vol_ratio <= 0.004)] = Regime.MIXED
+    return MarketArrays(
+        ready=(np.arange(n) + 1 >= MIN_BARS) & (released >= MIN_BARS),
+        trend=trend,
+        atr=atr,
+        compression=range_compression_series(close),
+        ret_1=ret_1,
+        session=session,
+        confidence=np.minimum(1.0, np.abs(trend) * 1000 + np.where(session != "OFF", 0.2, 0.0)),
+        trending=np.abs(trend) >= 0.0006,
+        secondary=secondary,
+    )
+
+
+@dataclass
+class SignalArrays:
+    """One strategy's signals over every bar; ``side`` is +1 (BUY), -1 (SELL) or 0."""
+
+    strategy: str
+    side: np.ndarray
+    entry: np.ndarray
+    stop: np.ndarray
+    take: np.ndarray
+    confidence: np.ndarray
+    max_hold_minutes: int
+    rationale: Dict[int, List[str]]
+
+
+def trend_signals(strategy: TrendStrategy, bars: BarSeries, market: MarketArrays) -> SignalArrays:
+    """``TrendStrategy.generate`` over every bar."""
+    close, open_, high, low = bars.close, bars.open, bars.high, bars.low
+    trend, atr = market.trend, market.atr
+    ema = ema_series(close, 20)
+    rsi = rsi_series(close, 14)
+    swing_high, swing_low = rolling_max(high, 12), rolling_min(low, 12)
+
+    active = market.ready & market.trending & (np.abs(trend) >= strategy.min_trend)
+    buy = active & (trend > 0) & (close <= ema * 1.001) & (close >= ema * 0.997) & (close > open_) & (rsi <= 70)
+    sell = active & (trend < 0) & (close >= ema * 0.999) & (close <= ema * 1.003) & (close < open_) & (rsi >= 30)
+
+    buy_stop = np.minimum(swing_low, low) - atr * 0.3
+    buy_stop = np.where(close - buy_stop <= atr * 0.5, close - atr * 0.7, buy_stop)
+    sell_stop = np.maximum(swing_high, high) + atr * 0.3
+    sell_stop = np.where(sell_stop - close <= atr * 0.5, close + atr * 0.7, sell_stop)
+    return SignalArrays(
+        strategy=strategy.name,
+        side=np.where(buy, 1, np.where(sell, -1, 0)).astype(np.int8),
+        entry=close,
+        stop=np.where(buy, buy_stop, sell_stop),
+        take=np.where(buy, close + (close - buy_stop) * strategy.rr, close - (sell_stop - close) * strategy.rr),
+        confidence=np.minimum(1.0, 0.5 + np.abs(trend) * 800),
+        max_hold_minutes=180,
+        rationale={1: ["h1_trend_up", "m15_pullback", "ema20_touch"], -1: ["h1_trend_down", "m15_pullback", "ema20_touch"]},
+    )
+
+
+def range_signals(strategy: RangeStrategy, bars: BarSeries, market: MarketArrays) -> SignalArrays:
+    """``RangeStrategy.generate`` over every bar."""
+    close, atr = bars.close, market.atr
+    highs, lows = rolling_max(bars.high, strategy.lookback), rolling_min(bars.low, strategy.lookback)
+    size = highs - lows
+    rsi = rsi_series(close, 14)
+
+    active = market.ready & ~market.trending & (highs != 0.0) & (lows != 0.0) & (size > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        near_high = (highs - close) / size < 0.15
+        near_low = (close - lows) / size < 0.15
+    buy = active & near_low & (rsi < 30)
+    sell = active & ~buy & near_high & (rsi > 70)
+
+    buy_stop = lows - atr * 0.2
+    buy_stop = np.where(close - buy_stop <= atr * 0.4, close - atr * 0.6, buy_stop)
+    sell_stop = highs + atr * 0.2
+    sell_stop = np.where(sell_stop - close <= atr * 0.4, close + atr * 0.6, sell_stop)
+    return SignalArrays(
+        strategy=strategy.name,
+        side=np.where(buy, 1, np.where(sell, -1, 0)).astype(np.int8),
+        entry=close,
+        stop=np.where(buy, buy_stop, sell_stop),
+        take=np.where(buy, close + (close - buy_stop) * strategy.rr, close - (sell_stop - close) * strategy.rr),
+        confidence=np.minimum(1.0, 0.45 + (np.abs(50 - rsi) / 100)),
+        max_hold_minutes=120,
+        rationale={1: ["range_low", "rsi_oversold"], -1: ["range_high", "rsi_overbought"]},
+    )
+
+
+VECTORIZED: Dict[type, Callable[..., SignalArrays]] = {TrendStrategy: trend_signals, RangeStrategy: range_signals}
+
+
+def _symbol_cfg(config: BotConfig, symbol: str) -> SymbolConfig:
+    for cfg in config.symbols:
+        if cfg.symbol == symbol:
+            return cfg
+    raise ValueError(f"No config for symbol {symbol}")
+
+
+@dataclass
+class _OpenTrade:
+    signal: Signal
+    volume: float
+    stop_loss: float
+    take_profit: float
+    atr_at_entry: float
+    entry_epoch: int
+    buy: bool = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.buy = self.signal.side == OrderSide.BUY
+
+
+def unsupported(config: BotConfig, strategies: Optional[list] = None) -> Optional[str]:
+    """Why ``fast_backtest`` cannot reproduce ``simulate`` for this setup, or None when it can."""
+    if config.enable_supply_demand:
+        return "fast backtest does not cover supply/demand; use simulate"
+    if config.max_positions_per_symbol != 1:
+        return "fast backtest models one position per symbol"
+    for strat in strategies if strategies is not None else []:
+        if type(strat) not in VECTORIZED:
+            return f"fast backtest has no vectorized form of {type(strat).__name__}"
+    return None
+
+
+def fast_backtest(
+    config: BotConfig,
+    symbol: str,
+    bars_m15: BarSeries,
+    strategies: Optional[list] = None,
+    market: Optional[MarketArrays] = None,
+    on_trade: Optional[Callable[[dict], bool]] = None,
+) -> List[dict]:
+    """Same trades as ``simulate`` for trend/range strategies, without the engine, store or journal.
+
+    Regime, signals and the stateless risk checks are computed for every bar at once. What is left
+    (``HardRiskManager.approve`` on the remaining candidates, the open position's SL/TP, max-hold,
+    break-even, trailing and regime exits) runs in one pass that only stops at candidate bars and
+    while a position is open. Trades come back in the shape ``simulate`` returns, minus ``id``.
+    ``market`` reuses ``market_arrays(config, bars_m15)`` computed earlier; the replay stops at the
+    first closed trade for which ``on_trade`` returns True.
+    """
+    reason = unsupported(config, strategies)
+    if reason:
+        raise ValueError(reason)
+    strategies = list(strategies) if strategies is not None else [TrendStrategy(), RangeStrategy()]
+    cfg = _symbol_cfg(config, symbol)
+    n = len(bars_m15)
+    if n == 0 or not strategies:
+        return []
+
+    if market is None:
+        market = market_arrays(config, bars_m15)
+    signals = [VECTORIZED[type(strat)](strat, bars_m15, market) for strat in strategies]
+
+    # Best candidate per bar by confidence, first strategy on ties (the engine's stable sort).
+    confidence = np.vstack([np.where(s.side != 0, s.confidence, -np.inf) for s in signals])
+    best = np.argmax(confidence, axis=0)
+    has_signal = np.isfinite(confidence.max(axis=0))
+    entry, stop, take = (np.choose(best, [getattr(s, name) for s in signals]) for name in ("entry", "stop", "take"))
+    risk_dist = np.abs(entry - stop)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rr = np.where(risk_dist > 0, np.abs(take - entry) / risk_dist, 0.0)
+
+    # The checks ahead of any stateful one in ``approve`` can be applied up front.
+    candidates = (
+        has_signal
+        & (market.session != "OFF")
+        & (market.confidence >= cfg.min_regime_confidence)
+        & (market.secondary != Regime.MIXED)
+        & (rr >= cfg.min_rr)
+    )
+
+    broker = PaperBroker()
+    risk = HardRiskManager(config, broker)
+    news = NewsRiskFilter(config.news_risk_window_minutes, config.news_window_pre_minutes, config.news_window_post_minutes)
+    news.load_schedule(config.news_schedule_path)
+    contract_size = float(broker.symbol_info(symbol).get("trade_contract_size", 100000))
+
+    times = bars_m15.time.tolist()
+    closes = bars_m15.close.tolist()
+    trending = market.trending.tolist()
+    trend = market.trend.tolist()
+    is_candidate = candidates.tolist()
+    tz = bars_m15.tz
+    trades: List[dict] = []
+    pos: Optional[_OpenTrade] = None
+    # The engine reconciles against the positions it listed before supervising, so a position the
+    # supervisor closes only leaves the trade book on the next cycle, at that bar's bid.
+    supervisor_closed: List[_OpenTrade] = []
+
+    for i in range(n):
+        if pos is None and not supervisor_closed and not is_candidate[i]:
+            continue
+        t = times[i]
+        bid = closes[i]
+        ask = bid + SPREAD
+        now = None
+        closing, supervisor_closed = supervisor_closed, []
+
+        # PaperBroker.seed_tick: SL/TP against this bar's closing tick.
+        if pos is not None:
+            hit = (bid <= pos.stop_loss or bid >= pos.take_profit) if pos.buy else (ask >= pos.stop_loss or ask <= pos.take_profit)
+            if hit:
+                closing.append(pos)
+                pos = None
+
+        if pos is None and is_candidate[i]:
+            now = from_epoch(t, tz)
+            if not news.in_risk_window(now, symbol=symbol, sensitivity=cfg.news_sensitivity):
+                source = signals[best[i]]
+                side = int(source.side[i])
+                signal = Signal(
+                    symbol=symbol,
+                    time=now,
+                    strategy=source.strategy,
+                    side=OrderSide.BUY if side > 0 else OrderSide.SELL,
+                    order_type=OrderType.MARKET,
+                    entry_price=float(entry[i]),
+                    stop_loss=float(stop[i]),
+                    take_profit=float(take[i]),
+                    max_hold_minutes=source.max_hold_minutes,
+                    confidence=float(source.confidence[i]),
+                    rationale=source.rationale[side],
+                )
+                state = market.state(symbol, i, now)
+                broker.seed_tick(symbol, Tick(time=now, bid=bid, ask=ask))
+                decision = risk.approve(signal, state, broker)
+                if decision.approved and not config.dry_run:
+                    risk.register_trade_open(symbol, signal.time)
+                    pos = _OpenTrade(signal, decision.adjusted_size, signal.stop_loss, signal.take_profit, state.volatility, t)
+
+        # TradeSupervisor.evaluate
+        if pos is not None:
+            now = now or from_epoch(t, tz)
+            if risk.approve_adjustment(symbol, now, broker).approved:
+                current = bid if pos.buy else ask
+                pnl = (current - pos.signal.entry_price) if pos.buy else (pos.signal.entry_price - current)
+                if t - pos.entry_epoch > pos.signal.max_hold_minutes * 60:
+                    supervisor_closed.append(pos)
+                    pos = None
+                else:
+                    entry_price = pos.signal.entry_price
+                    if pnl > max(pos.atr_at_entry, abs(entry_price - pos.stop_loss)):
+                        if (pos.buy and entry_price > pos.stop_loss) or (not pos.buy and entry_price < pos.stop_loss):
+                            pos.stop_loss = entry_price
+                    trail_distance = pos.atr_at_entry * 0.8
+                    if pnl > trail_distance:
+                        trail_sl = current - trail_distance if pos.buy else current + trail_distance
+                        if (pos.buy and trail_sl > pos.stop_loss) or (not pos.buy and trail_sl < pos.stop_loss):
+                            pos.stop_loss = trail_sl
+                    if not trending[i] and abs(trend[i]) < 0.0002:
+                        supervisor_closed.append(pos)
+                        pos = None
+
+        # TradeBook.reconcile: trades whose position is gone exit at this bar's bid.
+        for trade in closing:
+            now = now or from_epoch(t, tz)
+            signal = trade.signal
+            move = bid - signal.entry_price if trade.buy else signal.entry_price - bid
+            pnl = move * trade.volume * contract_size
+            trades.append(
+                {
+                    "symbol": symbol,
+                    "strategy": signal.strategy,
+                    "side": signal.side.value,
+                    "entry_time": signal.time.isoformat(),
+                    "entry_price": signal.entry_price,
+                    "exit_time": now.isoformat(),
+                    "exit_price": bid,
+                    "volume": trade.volume,
+                    "pnl": pnl,
+                    "reason": "broker_exit",
+                    "rr": signal.rr,
+                    "tags": ",".join(signal.rationale),
+                    "hold_minutes": (t - trade.entry_epoch) / 60.0,
+                }
+            )
+            risk.register_trade_result({"symbol": symbol, "pnl": pnl, "close_time": now})
+            if on_trade is not None and on_trade(trades[-1]):
+                return trades
+    return trades
+
+
+COMPARED_FIELDS = ("strategy", "side", "entry_time", "entry_price", "exit_time", "exit_price", "volume", "pnl", "rr", "tags", "hold_minutes")
+
+
+@dataclass
+class ParityReport:
+    start: int
+    end: int
+    fast: List[dict]
+    slow: List[dict]
+    mismatches: List[str]
+
+    @property
+    def ok(self) -> bool:
+        return not self.mismatches
+
+    def to_dict(self) -> dict:
+        return {
+            "start": self.start,
+            "end": self.end,
+            "fast_trades": len(self.fast),
+            "slow_trades": len(self.slow),
+            "ok": self.ok,
+            "mismatches": self.mismatches,
+        }
+
+
+def _same(a, b) -> bool:
+    if isinstance(a, float) and isinstance(b, float):
+        return math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-12)
+    return a == b
+
+
+def parity_check(
+    config: BotConfig,
+    symbol: str,
+    bars_m15: BarSeries,
+    start: int = 0,
+    length: int = 2000,
+    strategies: Optional[list] = None,
+) -> ParityReport:
+    """Runs ``bars_m15[start:start + length]`` through both ``simulate`` and ``fast_backtest`` and diffs the trades."""
+    window = bars_m15[start : start + length]
+    store = SQLiteStore(":memory:")
+    try:
+        slow = simulate(config, symbol, window, store, quiet_logger(), journal=NullJournal(), strategies=strategies)
+    finally:
+        store.close()
+    fast = fast_backtest(config, symbol, window, strategies)
+
+    mismatches = []
+    if len(fast) != len(slow):
+        mismatches.append(f"trade count: fast {len(fast)} != slow {len(slow)}")
+    for k, (f, s) in enumerate(zip(fast, slow)):
+        for name in COMPARED_FIELDS:
+            if not _same(f[name], s[name]):
+                mismatches.append(f"trade {k} {name}: fast {f[name]!r} != slow {s[name]!r}")
+    return ParityReport(start, start + len(window), fast, slow, mismatches)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--config", required=True)
+    parser.add_argument("--symbol", required=True)
+    parser.add_argument("--m15_csv", required=True)
+    parser.add_argument("--bar_cache", default="data/bars")
+    parser.add_argument("--parity", type=int, default=0, help="also replay this many bars through the engine and compare")
+    parser.add_argument("--parity_start", type=int, default=0)
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    series = load_bars(args.m15_csv, args.symbol, "M15", args.bar_cache or None)
+    started = time.perf_counter()
+    trades = fast_backtest(config, args.symbol, series)
+    output = {
+        "bars": len(series),
+        "trades": len(trades),
+        "pnl": sum(t["pnl"] for t in trades),
+        **compute_metrics(trades),
+        "elapsed": time.perf_counter() - started,
+    }
+    if args.parity:
+        output["parity"] = parity_check(config, args.symbol, series, args.parity_start, args.parity).to_dict()
+    print(json.dumps(output, indent=2))
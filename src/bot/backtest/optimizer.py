@@ -0,0 +1,338 @@
+from __future__ import annotations
+
+import copy
+import itertools
+import json
+import os
+import random
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from bot.backtest.bar_cache import load_bars
+from bot.backtest.fast_backtest import MarketArrays, fast_backtest, market_arrays, unsupported
+from bot.backtest.metrics import compute_metrics
+from bot.backtest.runner import NullJournal, quiet_logger, simulate
+from bot.backtest.shared_bars import SharedBarArrays, SharedBarsHandle
+from bot.core.bar_series import BarSeries
+from bot.core.config import BotConfig, load_config
+from bot.db.sqlite_store import SQLiteStore
+from bot.snd.config import SupplyDemandConfig, load_supply_demand_config
+from bot.strategies.range import RangeStrategy
+from bot.strategies.trend import TrendStrategy
+
+# Parameter names are "<scope>.<field>":
+#   trend.min_trend, trend.rr, range.lookback, range.rr  -> strategy constructor arguments
+#   config.<field>   -> BotConfig
+#   symbol.<field>   -> every SymbolConfig
+#   snd.<field>, snd.zone.<field>, snd.confirmation.<field>  -> SupplyDemandConfig
+STRATEGY_SCOPES = {"trend": TrendStrategy, "range": RangeStrategy}
+
+
+@dataclass
+class ParameterSpace:
+    """``grid`` lists explicit values; ``ranges`` are (low, high) bounds used by random search only.
+
+    Integer bounds sample integers, anything else samples uniformly.
+    """
+
+    grid: Dict[str, Sequence[Any]] = field(default_factory=dict)
+    ranges: Dict[str, Tuple[float, float]] = field(default_factory=dict)
+
+    @property
+    def names(self) -> List[str]:
+        return list(self.grid) + list(self.ranges)
+
+    def grid_points(self) -> Iterator[Dict[str, Any]]:
+        if self.ranges:
+            raise ValueError("grid search needs explicit values; move ranges into grid or use random search")
+        names = list(self.grid)
+        for values in itertools.product(*(self.grid[name] for name in names)):
+            yield dict(zip(names, values))
+
+    def sample(self, trials: int, seed: Optional[int] = None) -> List[Dict[str, Any]]:
+        rng = random.Random(seed)
+        points = []
+        for _ in range(trials):
+            point = {name: rng.choice(list(values)) for name, values in self.grid.items()}
+            for name, (low, high) in self.ranges.items():
+                point[name] = rng.randint(low, high) if isinstance(low, int) and isinstance(high, int) else rng.uniform(low, high)
+            points.append(point)
+        return points
+
+    @classmethod
+    def from_json(cls, path: str) -> "ParameterSpace":
+        with open(path, "r", encoding="utf-8") as f:
+            raw = json.load(f)
+        return cls(grid=raw.get("grid", {}), ranges={k: tuple(v) for k, v in raw.get("ranges", {}).items()})
+
+
+def apply_params(config: BotConfig, params: Dict[str, Any]) -> Tuple[BotConfig, List[Any], Optional[SupplyDemandConfig]]:
+    """Returns a copy of ``config`` plus the strategies and S&D config the trial should run with."""
+    config = copy.deepcopy(config)
+    strategy_kwargs: Dict[str, Dict[str, Any]] = {scope: {} for scope in STRATEGY_SCOPES}
+    sd_cfg = load_supply_demand_config(config.supply_demand_config_path) if config.enable_supply_demand else None
+
+    for name, value in params.items():
+        scope, _, attr = name.partition(".")
+        if scope in STRATEGY_SCOPES:
+            strategy_kwargs[scope][attr] = value
+            continue
+        if scope == "config":
+            targets = [config]
+        elif scope == "symbol":
+            targets = config.symbols
+        elif scope == "snd":
+            if sd_cfg is None:
+                raise ValueError(f"{name}: supply/demand is not enabled in this config")
+            *path, attr = attr.split(".")
+            target = sd_cfg
+            for part in path:
+                target = getattr(target, part)
+            targets = [target]
+        else:
+            raise ValueError(f"unknown parameter scope in {name!r}")
+        for target in targets:
+            if not hasattr(target, attr):
+                raise ValueError(f"unknown parameter {name!r}")
+            setattr(target, attr, value)
+
+    strategies = [cls(**strategy_kwargs[scope]) for scope, cls in STRATEGY_SCOPES.items()]
+    return config, strategies, sd_cfg
+
+
+class _DrawdownGuard:
+    """Closed-trade equity of one trial; ``record`` returns True once drawdown exceeds ``limit`` (account currency)."""
+
+    def __init__(self, limit: Optional[float]) -> None:
+        self.limit = limit
+        self.trades: List[dict] = []
+        self.exceeded = False
+        self._equity = 0.0
+        self._peak = 0.0
+
+    def record(self, trade: Dict[str, Any]) -> bool:
+        self.trades.append(dict(trade))
+        self._equity += trade.get("pnl") or 0.0
+        self._peak = max(self._peak, self._equity)
+        if self.limit is not None and self._peak - self._equity > self.limit:
+            self.exceeded = True
+        return self.exceeded
+
+
+@dataclass
+class TrialResult:
+    trial: int
+    params: Dict[str, Any]
+    status: str  # "ok", "stopped" (drawdown limit) or "error"
+    metrics: Dict[str, float]
+    elapsed: float
+    error: str = ""
+
+
+def run_trial(
+    config: BotConfig,
+    symbol: str,
+    bars: BarSeries,
+    trial: int,
+    params: Dict[str, Any],
+    max_drawdown: Optional[float] = None,
+    market: Optional[MarketArrays] = None,
+) -> TrialResult:
+    """Backtests one parameter point, stopping once closed-trade drawdown exceeds ``max_drawdown``.
+
+    Trend/range setups run through ``fast_backtest``, reusing ``market`` (``market_arrays`` of
+    ``config``) unless the trial changes sessions or timezone; anything else replays the engine.
+    """
+    started = time.perf_counter()
+    guard = _DrawdownGuard(max_drawdown)
+    status, error = "ok", ""
+    try:
+        trial_config, strategies, sd_cfg = apply_params(config, params)
+        if unsupported(trial_config, strategies) is None:
+            same_sessions = (trial_config.sessions, trial_config.default_timezone) == (config.sessions, config.default_timezone)
+            fast_backtest(trial_config, symbol, bars, strategies, market=market if same_sessions else None, on_trade=guard.record)
+        else:
+            store = SQLiteStore(":memory:")
+            try:
+                simulate(trial_config, symbol, bars, store, quiet_logger(), journal=NullJournal(), strategies=strategies, sd_cfg=sd_cfg, on_trade=guard.record)
+            finally:
+                store.close()
+        if guard.exceeded:
+            status = "stopped"
+    except Exception as exc:  # a bad parameter combination should not take the sweep down
+        status, error = "error", repr(exc)
+    trades = guard.trades
+    metrics = {"trades": len(trades), "pnl": sum(t.get("pnl") or 0.0 for t in trades), **compute_metrics(trades)}
+    return TrialResult(trial, params, status, metrics, time.perf_counter() - started, error)
+
+
+_worker_bars: Optional[SharedBarArrays] = None
+_worker_market: Optional[MarketArrays] = None
+
+
+def _init_worker(handle: SharedBarsHandle, market: Optional[MarketArrays]) -> None:
+    global _worker_bars, _worker_market
+    _worker_bars = SharedBarArrays.attach(handle)
+    _worker_market = market
+
+
+def _run_trial_shared(config: BotConfig, symbol: str, trial: int, params: Dict[str, Any], max_drawdown: Optional[float]) -> TrialResult:
+    return run_trial(config, symbol, _worker_bars.series(), trial, params, max_drawdown, _worker_market)
+
+
+class ResultStore:
+    """Optimizer trials in SQLite, one row per trial, ranked by the run's objective."""
+
+    def __init__(self, path: str) -> None:
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS optimizer_trials (
+                run_id TEXT NOT NULL,
+                trial INTEGER NOT NULL,
+                params TEXT NOT NULL,
+                status TEXT NOT NULL,
+                score REAL,
+                trades INTEGER,
+                pnl REAL,
+                win_rate REAL,
+                profit_factor REAL,
+                expectancy REAL,
+                max_drawdown REAL,
+                elapsed REAL,
+                error TEXT,
+                PRIMARY KEY (run_id, trial)
+            )
+            """
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_optimizer_trials_score ON optimizer_trials (run_id, score DESC)")
+        self.conn.commit()
+
+    def add(self, run_id: str, result: TrialResult, objective: str) -> None:
+        m = result.metrics
+        # Stopped and failed trials are kept for the record but never outrank completed ones.
+        score = m.get(objective) if result.status == "ok" else None
+        self.conn.execute(
+            "INSERT OR REPLACE INTO optimizer_trials VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                run_id,
+                result.trial,
+                json.dumps(result.params, sort_keys=True),
+                result.status,
+                score,
+                m["trades"],
+                m["pnl"],
+                m["win_rate"],
+                m["profit_factor"],
+                m["expectancy"],
+                m["max_drawdown"],
+                result.elapsed,
+                result.error,
+            ),
+        )
+
+    def commit(self) -> None:
+        self.conn.commit()
+
+    def top(self, run_id: str, limit: int = 10) -> List[dict]:
+        rows = self.conn.execute(
+            "SELECT * FROM optimizer_trials WHERE run_id = ? AND score IS NOT NULL ORDER BY score DESC, trial LIMIT ?",
+            (run_id, limit),
+        ).fetchall()
+        return [{**dict(row), "params": json.loads(row["params"])} for row in rows]
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def optimize(
+    config: BotConfig,
+    symbol: str,
+    bars: BarSeries,
+    points: Sequence[Dict[str, Any]],
+    results: ResultStore,
+    run_id: str,
+    objective: str = "pnl",
+    max_drawdown: Optional[float] = None,
+    workers: Optional[int] = None,
+    commit_every: int = 20,
+) -> List[dict]:
+    """Runs one backtest per parameter point and records each as it finishes; returns the ranking.
+
+    Trials run in a process pool attached to the bars through shared memory; the regime and
+    session arrays the fast path needs are computed once here and handed to each worker at start.
+    A trial whose closed-trade drawdown exceeds ``max_drawdown`` (account currency) stops early.
+    """
+    for point in points[:1]:
+        apply_params(config, point)  # reject unknown parameter names before starting workers
+    market = market_arrays(config, bars) if unsupported(config) is None and len(bars) else None
+    workers = min(workers or os.cpu_count() or 1, max(len(points), 1))
+    done = 0
+
+    def record(result: TrialResult) -> None:
+        nonlocal done
+        results.add(run_id, result, objective)
+        done += 1
+        if done % commit_every == 0:
+            results.commit()
+
+    try:
+        if workers <= 1:
+            for trial, params in enumerate(points):
+                record(run_trial(config, symbol, bars, trial, params, max_drawdown, market))
+        else:
+            with SharedBarArrays.create(bars) as shared:
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(shared.handle, market)) as pool:
+                    futures = [pool.submit(_run_trial_shared, config, symbol, trial, params, max_drawdown) for trial, params in enumerate(points)]
+                    for future in as_completed(futures):
+                        record(future.result())
+    finally:
+        results.commit()
+    return results.top(run_id)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--config", required=True)
+    parser.add_argument("--symbol", required=True)
+    parser.add_argument("--m15_csv", required=True)
+    parser.add_argument("--bar_cache", default="data/bars")
+    parser.add_argument("--space", required=True, help='JSON file: {"grid": {name: [values]}, "ranges": {name: [low, high]}}')
+    parser.add_argument("--search", choices=["grid", "random"], default="grid")
+    parser.add_argument("--trials", type=int, default=100, help="random search only")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--objective", default="pnl")
+    parser.add_argument("--max_drawdown", type=float, default=None, help="stop a trial once closed-trade drawdown exceeds this much PnL (account currency, not a fraction)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--db", default="data/optimizer.sqlite")
+    parser.add_argument("--run_id", default=None)
+    args = parser.parse_args()
+
+    space = ParameterSpace.from_json(args.space)
+    points = list(space.grid_points()) if args.search == "grid" else space.sample(args.trials, args.seed)
+    run_id = args.run_id or time.strftime("%Y%m%d-%H%M%S")
+    store = ResultStore(args.db)
+    try:
+        ranking = optimize(
+            load_config(args.config),
+            args.symbol,
+            load_bars(args.m15_csv, args.symbol, "M15", args.bar_cache or None),
+            points,
+            store,
+            run_id,
+            objective=args.objective,
+            max_drawdown=args.max_drawdown,
+            workers=args.workers,
+        )
+    finally:
+        store.close()
+    print(json.dumps({"run_id": run_id, "trials": len(points), "top": ranking}, indent=2))
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import heapq
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby, repeat
+from operator import itemgetter
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from bot.adapters.paper_broker import PaperBroker
+from bot.backtest.bar_cache import load_bars
+from bot.core.bar_series import BarSeries, from_epoch
+from bot.core.config import BotConfig, load_config
+from bot.core.engine import BotEngine
+from bot.core.models import Tick
+from bot.db.sqlite_store import SQLiteStore
+from bot.utils.logging import EventPolicy, setup_logging, shutdown_logging
+from bot.utils.resample import MultiTimeframeResampler
+
+
+def prefetch_bars(csv_by_symbol: Dict[str, str], bar_cache: Optional[str] = "data/bars", workers: int = 8) -> Dict[str, BarSeries]:
+    """Loads every symbol's M15 bars on a thread pool; results keep the order of ``csv_by_symbol``."""
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(csv_by_symbol)))) as pool:
+        futures = {symbol: pool.submit(load_bars, path, symbol, "M15", bar_cache) for symbol, path in csv_by_symbol.items()}
+        return {symbol: future.result() for symbol, future in futures.items()}
+
+
+def merged_bars(bars_by_symbol: Dict[str, BarSeries]) -> Iterator[Tuple[int, List[Tuple[str, int]]]]:
+    """Yields ``(timestamp, [(symbol, index), ...])`` for every distinct bar time across the symbols, in order."""
+    streams = [zip(bars.time.tolist(), repeat(symbol), range(len(bars))) for symbol, bars in bars_by_symbol.items()]
+    for ts, group in groupby(heapq.merge(*streams), key=itemgetter(0)):
+        yield ts, [(symbol, index) for _, symbol, index in group]
+
+
+def simulate_portfolio(
+    config: BotConfig,
+    bars_by_symbol: Dict[str, BarSeries],
+    store: SQLiteStore,
+    logger,
+    journal=None,
+    strategies=None,
+    sd_cfg=None,
+    on_trade: Optional[Callable[[dict], bool]] = None,
+) -> List[dict]:
+    """Replays several symbols' M15 bars through one ``BotEngine`` and returns the trades it closed.
+
+    The engine runs once per distinct bar time, after every symbol with a bar at that time has been
+    fed, so candidate selection and the global risk caps see all symbols together. Stepping starts
+    once every symbol has had a bar (earlier bars only warm up the feeds); after that a symbol without
+    a bar at some time keeps its last bars and tick, as a live terminal would. ``on_trade`` sees each
+    closed trade; once it returns True the replay stops after the current step.
+    """
+    stop = False
+
+    def closed(trade: dict) -> None:
+        nonlocal stop
+        stop = bool(on_trade(trade)) or stop
+
+    broker = PaperBroker()
+    engine = BotEngine(
+        config, broker, logger, store, journal=journal, strategies=strategies, sd_cfg=sd_cfg, on_trade_closed=closed if on_trade else None
+    )
+    store.flush()
+    first_id = store.conn.execute("SELECT COALESCE(MAX(id), 0) FROM trades").fetchone()[0]
+
+    timeframes = ["H1"] + (engine.sd_cfg.htf_timeframes if engine.sd_cfg else [])
+    tz = next(iter(bars_by_symbol.values())).tz if bars_by_symbol else None
+    resamplers = {}
+    for symbol, bars in bars_by_symbol.items():
+        resamplers[symbol] = MultiTimeframeResampler("M15", timeframes, tz=bars.tz)
+        for tf in resamplers[symbol].buffers:
+            broker.seed_bars(symbol, tf, resamplers[symbol].series(tf))
+
+    waiting = set(bars_by_symbol)
+    try:
+        for ts, group in merged_bars(bars_by_symbol):
+            now = from_epoch(ts, tz)
+            for symbol, i in group:
+                bars = bars_by_symbol[symbol]
+                resampler = resamplers[symbol]
+                broker.seed_bars(symbol, "M15", bars[: i + 1])
+                closed_tfs = resampler.update_raw(ts, bars.open[i], bars.high[i], bars.low[i], bars.close[i], bars.volume[i])
+                for tf in closed_tfs:
+                    broker.seed_bars(symbol, tf, resampler.series(tf))
+                close = float(bars.close[i])
+                broker.seed_tick(symbol, Tick(time=now, bid=close, ask=close + 0.0001))
+                waiting.discard(symbol)
+            if not waiting:
+                engine.run_once(now)
+                if stop:
+                    break
+    finally:
+        engine.close()
+
+    store.flush()
+    rows = store.conn.execute("SELECT * FROM trades WHERE id > ? ORDER BY id", (first_id,)).fetchall()
+    return [dict(row) for row in rows]
+
+
+def run_portfolio_backtest(config_path: str, csv_by_symbol: Dict[str, str], bar_cache: Optional[str] = "data/bars", workers: int = 8) -> List[dict]:
+    config = load_config(config_path)
+    configured = {s.symbol for s in config.symbols}
+    if set(csv_by_symbol) != configured:
+        extra = sorted(set(csv_by_symbol) - configured)
+        missing = sorted(configured - set(csv_by_symbol))
+        raise ValueError(f"--csv symbols must match the config; not in config: {extra}, no CSV: {missing}")
+
+    bars_by_symbol = prefetch_bars(csv_by_symbol, bar_cache, workers)
+    logger = setup_logging(
+        "logs",
+        policy=EventPolicy(config.log_event_levels, config.log_sample_every, set(config.log_disabled_events)),
+    )
+    store = SQLiteStore("data/trades.sqlite")
+    try:
+        trades = simulate_portfolio(config, bars_by_symbol, store, logger)
+    finally:
+        store.close()
+        shutdown_logging()
+
+    pnl: Dict[str, float] = defaultdict(float)
+    count: Dict[str, int] = defaultdict(int)
+    for trade in trades:
+        pnl[trade["symbol"]] += trade["pnl"]
+        count[trade["symbol"]] += 1
+    for symbol in bars_by_symbol:
+        print(f"{symbol}: trades={count[symbol]} pnl={pnl[symbol]:.2f}")
+    print(f"Portfolio: trades={len(trades)} pnl={sum(pnl.values()):.2f}")
+    return trades
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--config", required=True, help="config listing every traded symbol")
+    parser.add_argument("--csv", action="append", required=True, metavar="SYMBOL=PATH", help="M15 CSV per symbol; repeat for each symbol")
+    parser.add_argument("--bar_cache", default="data/bars", help="binary bar cache root; empty to parse the CSVs every run")
+    parser.add_argument("--workers", type=int, default=8, help="threads loading symbols in parallel")
+    args = parser.parse_args()
+
+    sources = dict(item.split("=", 1) for item in args.csv)
+    run_portfolio_backtest(args.config, sources, args.bar_cache or None, args.workers)
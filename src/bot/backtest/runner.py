@@ -1,76 +1,67 @@
 from __future__ import annotations
 
-import csv
-from datetime import datetime
-from typing import List
+import logging
+from typing import Callable, List, Optional
 
-from bot.adapters.paper_broker import PaperBroker
+from bot.backtest.bar_cache import load_bars
+from bot.backtest.portfolio import simulate_portfolio
+from bot.core.bar_series import BarSeries
 from bot.core.config import BotConfig, load_config
-from bot.core.engine import BotEngine
-from bot.core.models import Bar, Tick
 from bot.db.sqlite_store import SQLiteStore
-from bot.utils.logging import setup_logging
-
-
-def _load_bars_csv(path: str) -> List[Bar]:
-    bars: List[Bar] = []
-    with open(path, "r", newline="") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            bars.append(
-                Bar(
-                    time=datetime.fromisoformat(row["time"]),
-                    open=float(row["open"]),
-                    high=float(row["high"]),
-                    low=float(row["low"]),
-                    close=float(row["close"]),
-                    volume=float(row.get("volume", 0)),
-                )
-            )
-    return bars
-
-
-def _resample_h1(m15_bars: List[Bar]) -> List[Bar]:
-    h1 = []
-    for i in range(0, len(m15_bars), 4):
-        chunk = m15_bars[i : i + 4]
-        if len(chunk) < 4:
-            break
-        h1.append(
-            Bar(
-                time=chunk[-1].time,
-                open=chunk[0].open,
-                high=max(b.high for b in chunk),
-                low=min(b.low for b in chunk),
-                close=chunk[-1].close,
-                volume=sum(b.volume for b in chunk),
-            )
-        )
-    return h1
-
-
-def run_backtest(config_path: str, symbol: str, m15_csv: str) -> None:
-    config = load_config(config_path)
-    logger = setup_logging("logs")
-    store = SQLiteStore("data/trades.sqlite")
-    broker = PaperBroker()
+from bot.utils.logging import EventPolicy, setup_logging, shutdown_logging
+
+
+class NullJournal:
+    def write(self, payload: dict) -> None:
+        pass
+
+    def flush_if_due(self) -> None:
+        pass
 
-    bars_m15 = _load_bars_csv(m15_csv)
-    bars_h1 = _resample_h1(bars_m15)
+    def close(self) -> None:
+        pass
 
-    broker.seed_bars(symbol, "M15", [])
-    broker.seed_bars(symbol, "H1", [])
 
-    engine = BotEngine(config, broker, logger, store)
+def quiet_logger(name: str = "bot.backtest.quiet") -> logging.Logger:
+    """A logger with every level disabled, so ``log_event`` returns before building payloads."""
+    logger = logging.getLogger(name)
+    logger.handlers.clear()
+    logger.addHandler(logging.NullHandler())
+    logger.setLevel(logging.CRITICAL + 1)
+    logger.propagate = False
+    return logger
 
-    for i in range(len(bars_m15)):
-        broker.seed_bars(symbol, "M15", bars_m15[: i + 1])
-        broker.seed_bars(symbol, "H1", _resample_h1(bars_m15[: i + 1]))
-        last = bars_m15[i]
-        broker.seed_tick(symbol, Tick(time=last.time, bid=last.close, ask=last.close + 0.0001))
-        engine.run_once(last.time)
 
+def simulate(
+    config: BotConfig,
+    symbol: str,
+    bars_m15: BarSeries,
+    store: SQLiteStore,
+    logger,
+    journal=None,
+    strategies=None,
+    sd_cfg=None,
+    on_trade: Optional[Callable[[dict], bool]] = None,
+) -> List[dict]:
+    """Replays M15 bars through a ``BotEngine`` on a ``PaperBroker`` and returns the trades it closed."""
+    return simulate_portfolio(config, {symbol: bars_m15}, store, logger, journal=journal, strategies=strategies, sd_cfg=sd_cfg, on_trade=on_trade)
+
+
+def run_backtest(config_path: str, symbol: str, m15_csv: str, bar_cache: Optional[str] = "data/bars") -> List[dict]:
+    config = load_config(config_path)
+    logger = setup_logging(
+        "logs",
+        policy=EventPolicy(config.log_event_levels, config.log_sample_every, set(config.log_disabled_events)),
+    )
+    store = SQLiteStore("data/trades.sqlite")
+    bars_m15 = load_bars(m15_csv, symbol, "M15", bar_cache)
+    try:
+        trades = simulate(config, symbol, bars_m15, store, logger)
+    finally:
+        store.close()
+        shutdown_logging()
     print("Backtest complete. See logs and data/trades.sqlite")
+    return trades
 
 
 if __name__ == "__main__":
@@ -80,6 +71,7 @@ if __name__ == "__main__":
     parser.add_argument("--config", required=True)
     parser.add_argument("--symbol", required=True)
     parser.add_argument("--m15_csv", required=True)
+    parser.add_argument("--bar_cache", default="data/bars", help="binary bar cache root; empty to parse the CSV every run")
     args = parser.parse_args()
 
-    run_backtest(args.config, args.symbol, args.m15_csv)
+    run_backtest(args.config, args.symbol, args.m15_csv, args.bar_cache or None)
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import tzinfo
+from multiprocessing import resource_tracker, shared_memory
+from typing import Optional
+
+import numpy as np
+
+from bot.core.bar_series import BarSeries
+
+
+def _open_untracked(name: str) -> shared_memory.SharedMemory:
+    # Only the owner unlinks. Before 3.13 attaching also registers the block with the resource
+    # tracker, which then unlinks or double-unregisters it when workers exit (bpo-39959).
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args, **kwargs: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+@dataclass(frozen=True)
+class SharedBarsHandle:
+    """Picklable reference to a ``SharedBarArrays`` block; this is all a worker task carries."""
+
+    name: str
+    length: int
+    tz: Optional[tzinfo] = None
+
+
+class SharedBarArrays:
+    """OHLCV columns in one shared-memory block: int64 times followed by five float64 rows.
+
+    The creating process owns the block and must ``close()`` it (which also unlinks it). Workers
+    ``attach()`` by handle and read the same pages without copying.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, length: int, tz: Optional[tzinfo], owner: bool) -> None:
+        self._shm = shm
+        self.length = length
+        self.tz = tz
+        self.owner = owner
+        self._time = np.ndarray((length,), dtype=np.int64, buffer=shm.buf)
+        self._prices = np.ndarray((5, length), dtype=np.float64, buffer=shm.buf, offset=8 * length)
+
+    @classmethod
+    def create(cls, series: BarSeries) -> "SharedBarArrays":
+        n = len(series)
+        shm = shared_memory.SharedMemory(create=True, size=max(6 * 8 * n, 1))
+        shared = cls(shm, n, series.tz, owner=True)
+        shared._time[:] = series.time
+        for row, column in enumerate((series.open, series.high, series.low, series.close, series.volume)):
+            shared._prices[row] = column
+        return shared
+
+    @classmethod
+    def attach(cls, handle: SharedBarsHandle) -> "SharedBarArrays":
+        return cls(_open_untracked(handle.name), handle.length, handle.tz, owner=False)
+
+    @property
+    def handle(self) -> SharedBarsHandle:
+        return SharedBarsHandle(self._shm.name, self.length, self.tz)
+
+    def series(self) -> BarSeries:
+        p = self._prices
+        return BarSeries(self._time, p[0], p[1], p[2], p[3], p[4], tz=self.tz)
+
+    def close(self) -> None:
+        if self._shm is None:
+            return
+        # Views must go before the mapping can be released.
+        del self._time, self._prices
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
+        self._shm = None
+
+    def __enter__(self) -> "SharedBarArrays":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
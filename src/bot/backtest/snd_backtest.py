@@ -1,77 +1,200 @@
 from __future__ import annotations
 
-import csv
+from collections import Counter, deque
 from dataclasses import dataclass
-from datetime import datetime
-from typing import List
+from datetime import datetime, tzinfo
+from typing import Deque, List, Optional
 
-from bot.core.models import Bar
-from bot.snd.config import load_supply_demand_config
-from bot.snd.zone_detector import detect_zones
-from bot.snd.confirmation import confirmation_passed
+import numpy as np
+
+from bot.backtest.bar_cache import load_bars
+from bot.backtest.exits import SAME_BAR_RULES, simulate_exits
+from bot.core.bar_series import BarSeries, from_epoch
+from bot.snd.config import SupplyDemandConfig, load_supply_demand_config
+from bot.snd.confirmation import confirmation_signals, confirmation_window
+from bot.snd.zone_models import ZoneType
+from bot.snd.zone_registry import ZoneRegistry
 from bot.utils.pips import pip_size
+from bot.utils.resample import StreamingResampler
+from bot.utils.time import timeframe_seconds
 
 
 @dataclass
 class Trade:
     entry_time: datetime
     entry_price: float
+    exit_time: datetime
     exit_price: float
     pnl: float
+    r_multiple: float
+    reason: str
+    zone_id: str = ""
 
 
-def _load_csv(path: str) -> List[Bar]:
-    bars: List[Bar] = []
-    with open(path, "r", newline="") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            bars.append(
-                Bar(
-                    time=datetime.fromisoformat(row["time"]),
-                    open=float(row["open"]),
-                    high=float(row["high"]),
-                    low=float(row["low"]),
-                    close=float(row["close"]),
-                    volume=float(row.get("volume", 0)),
-                )
-            )
-    return bars
-
-
-def run_backtest(config_path: str, symbol: str, ltf_csv: str, htf_csv: str) -> None:
-    cfg = load_supply_demand_config(config_path)
-    ltf_bars = _load_csv(ltf_csv)
-    htf_bars = _load_csv(htf_csv)
-    pips = pip_size(symbol, digits=5, point=0.0001)
+class _HTFStream:
+    """Closed bars of one HTF timeframe, released as the LTF stream reaches their close.
+
+    Bars come from the LTF stream through a ``StreamingResampler`` or, when given, from ``bars``.
+    Only the newest ``window`` bars are kept, which is all the zone registry scans.
+    """
+
+    def __init__(self, timeframe: str, ltf_timeframe: str, window: int, bars: Optional[BarSeries], tz: Optional[tzinfo]) -> None:
+        self.timeframe = timeframe
+        self.tz = tz
+        self.rows: Deque[tuple] = deque(maxlen=window)
+        self.bars = bars
+        self.resampler = StreamingResampler(ltf_timeframe, timeframe, tz=tz) if bars is None else None
+        self._tf_seconds = timeframe_seconds(timeframe)
+        self._ltf_seconds = timeframe_seconds(ltf_timeframe)
+        self._next = 0
+
+    def push(self, ts: int, open: float, high: float, low: float, close: float, volume: float) -> bool:
+        if self.resampler is not None:
+            closed = self.resampler.update_raw(ts, open, high, low, close, volume)
+        else:
+            closed = []
+            bars = self.bars
+            while self._next < len(bars) and int(bars.time[self._next]) + self._tf_seconds <= ts + self._ltf_seconds:
+                j = self._next
+                closed.append((int(bars.time[j]), bars.open[j], bars.high[j], bars.low[j], bars.close[j], bars.volume[j]))
+                self._next += 1
+        self.rows.extend(closed)
+        return bool(closed)
+
+    def series(self) -> BarSeries:
+        rows = np.array(self.rows, dtype=np.float64)
+        return BarSeries(rows[:, 0].astype(np.int64), rows[:, 1], rows[:, 2], rows[:, 3], rows[:, 4], rows[:, 5], tz=self.tz)
+
+
+def _resolve(bars: BarSeries, entries: List[tuple], start: int, end: int, max_hold_bars: Optional[int], same_bar: str) -> List[Trade]:
+    if not entries:
+        return []
+    index, side, entry, stop, take, zone_ids = zip(*entries)
+    index, side, entry, stop, take = (np.array(col) for col in (index, side, entry, stop, take))
+    n = len(bars)
+    exit_index = np.empty(len(entries), dtype=np.int64)
+    exit_price = np.empty(len(entries))
+    reason = np.empty(len(entries), dtype=object)
+
+    # Exits are resolved over windows of at most one chunk past this one (or the longest hold).
+    # Trades still open at a window's last bar continue from there in the next window, which
+    # scans exactly the bars an unbounded scan would.
+    span = max(end - start, 2) if max_hold_bars is None else max_hold_bars + 1
+    at = index.copy()
+    pending = np.arange(len(entries))
+    lo, hi = start, min(n, end + span)
+    while pending.size:
+        exits = simulate_exits(
+            bars[lo:hi], at[pending] - lo, side[pending], stop[pending], take[pending], max_hold_bars=max_hold_bars, same_bar=same_bar
+        )
+        done = (exits.reason != "end_of_data") | (hi >= n)
+        finished = pending[done]
+        exit_index[finished] = exits.index[done] + lo
+        exit_price[finished] = exits.price[done]
+        reason[finished] = exits.reason[done]
+        pending = pending[~done]
+        at[pending] = hi - 1
+        lo, hi = hi - 1, min(n, hi - 1 + span)
 
-    zones = detect_zones(symbol, cfg.htf_timeframes[0], htf_bars, cfg.zone, pip_size=pips).zones
+    pnl = (exit_price - entry) * side
+    risk = np.abs(entry - stop)
+    r_multiple = np.divide(pnl, risk, out=np.zeros_like(pnl), where=risk > 0)
+    return [
+        Trade(
+            entry_time=from_epoch(bars.time[index[k]], bars.tz),
+            entry_price=float(entry[k]),
+            exit_time=from_epoch(bars.time[exit_index[k]], bars.tz),
+            exit_price=float(exit_price[k]),
+            pnl=float(pnl[k]),
+            r_multiple=float(r_multiple[k]),
+            reason=reason[k],
+            zone_id=zone_ids[k],
+        )
+        for k in range(len(entries))
+    ]
+
+
+def backtest_snd(
+    symbol: str,
+    cfg: SupplyDemandConfig,
+    ltf_bars: BarSeries,
+    htf_bars: Optional[BarSeries] = None,
+    max_hold_minutes: Optional[int] = 240,
+    same_bar: str = "stop",
+    chunk_size: int = 50_000,
+    htf_window: int = 300,
+) -> List[Trade]:
+    """Replays LTF bars in order against zones known at each bar, with no look-ahead.
+
+    HTF bars (``htf_bars`` for the first HTF timeframe, otherwise resampled from the LTF stream)
+    reach the zone registry only once closed, so a zone appears after its impulse candles close,
+    and touches accumulate as price enters zones. Confirmation flags and exits are computed per
+    chunk of ``chunk_size`` LTF bars, so memory does not grow with the length of the history.
+    """
+    pips = pip_size(symbol, digits=5, point=0.0001)
+    registry = ZoneRegistry(cfg.zone, scan_on_close=cfg.scan_on_close)
+    streams = [
+        _HTFStream(tf, cfg.ltf_timeframe, htf_window, htf_bars if k == 0 else None, ltf_bars.tz)
+        for k, tf in enumerate(cfg.htf_timeframes)
+    ]
+    max_hold_bars = max_hold_minutes * 60 // timeframe_seconds(cfg.ltf_timeframe) if max_hold_minutes else None
+    pad = confirmation_window(cfg.confirmation) - 1  # bars before a chunk its first flags look back over
 
     trades: List[Trade] = []
-    for i in range(30, len(ltf_bars)):
-        window = ltf_bars[: i + 1]
-        last = window[-1]
-        for zone in zones:
-            if not zone.active or not zone.contains(last.close):
-                continue
-            if not confirmation_passed(window, zone, cfg.confirmation):
-                continue
-            entry = last.close
-            if zone.zone_type.value == "DEMAND":
-                stop = zone.lower - cfg.sl_buffer_pips * pips
-                take = entry + (entry - stop) * cfg.min_rr
-            else:
-                stop = zone.upper + cfg.sl_buffer_pips * pips
-                take = entry - (stop - entry) * cfg.min_rr
-            exit_price = take
-            pnl = exit_price - entry
-            trades.append(Trade(entry_time=last.time, entry_price=entry, exit_price=exit_price, pnl=pnl))
-            break
+    for start in range(0, len(ltf_bars), chunk_size):
+        end = min(start + chunk_size, len(ltf_bars))
+        lead = min(pad, start)
+        chunk = ltf_bars[start - lead : end]
+        signals = confirmation_signals(chunk, cfg.confirmation)
+        rows = zip(*(getattr(chunk, name)[lead:].tolist() for name in ("time", "open", "high", "low", "close", "volume")))
+
+        entries = []  # (bar index, side, entry, stop, take, zone id)
+        for k, (ts, open_, high, low, close, volume) in enumerate(rows, start=lead):
+            zones = []
+            for stream in streams:
+                if stream.push(ts, open_, high, low, close, volume):
+                    registry.update(symbol, stream.timeframe, stream.series(), pips)
+                registry.touch(symbol, stream.timeframe, close)
+                zones.extend(registry.containing(symbol, stream.timeframe, close))
+
+            for zone in sorted(zones, key=lambda z: z.score, reverse=True):
+                if not signals.passed(zone.zone_type, k):
+                    continue
+                if zone.zone_type == ZoneType.DEMAND:
+                    stop = zone.lower - cfg.sl_buffer_pips * pips
+                    take = close + (close - stop) * cfg.min_rr
+                    side = 1
+                else:
+                    stop = zone.upper + cfg.sl_buffer_pips * pips
+                    take = close - (stop - close) * cfg.min_rr
+                    side = -1
+                entries.append((start + k - lead, side, close, stop, take, zone.id))
+                break
+        trades.extend(_resolve(ltf_bars, entries, start, end, max_hold_bars, same_bar))
+    return trades
+
+
+def run_backtest(
+    config_path: str,
+    symbol: str,
+    ltf_csv: str,
+    htf_csv: Optional[str] = None,
+    bar_cache: Optional[str] = "data/bars",
+    max_hold_minutes: Optional[int] = 240,
+    same_bar: str = "stop",
+) -> List[Trade]:
+    cfg = load_supply_demand_config(config_path)
+    ltf_bars = load_bars(ltf_csv, symbol, cfg.ltf_timeframe, bar_cache)
+    htf_bars = load_bars(htf_csv, symbol, cfg.htf_timeframes[0], bar_cache) if htf_csv else None
+    trades = backtest_snd(symbol, cfg, ltf_bars, htf_bars, max_hold_minutes=max_hold_minutes, same_bar=same_bar)
 
     win_rate = len([t for t in trades if t.pnl > 0]) / len(trades) if trades else 0.0
-    avg_r = sum(t.pnl for t in trades) / len(trades) if trades else 0.0
+    avg_r = sum(t.r_multiple for t in trades) / len(trades) if trades else 0.0
     print(f"Trades: {len(trades)}")
     print(f"Win rate: {win_rate:.2%}")
-    print(f"AvgR: {avg_r:.5f}")
+    print(f"AvgR: {avg_r:.3f}")
+    print("Exits: " + ", ".join(f"{reason}={count}" for reason, count in sorted(Counter(t.reason for t in trades).items())))
+    return trades
 
 
 if __name__ == "__main__":
@@ -81,7 +204,10 @@ if __name__ == "__main__":
     parser.add_argument("--config", required=True)
     parser.add_argument("--symbol", required=True)
     parser.add_argument("--ltf_csv", required=True)
-    parser.add_argument("--htf_csv", required=True)
+    parser.add_argument("--htf_csv", help="Resampled from --ltf_csv when omitted")
+    parser.add_argument("--bar_cache", default="data/bars", help="binary bar cache root; empty to parse the CSVs every run")
+    parser.add_argument("--max_hold_minutes", type=int, default=240, help="0 holds until stop, target or end of data")
+    parser.add_argument("--same_bar", choices=SAME_BAR_RULES, default="stop", help="which level fills first when one bar touches both")
     args = parser.parse_args()
 
-    run_backtest(args.config, args.symbol, args.ltf_csv, args.htf_csv)
+    run_backtest(args.config, args.symbol, args.ltf_csv, args.htf_csv, args.bar_cache or None, args.max_hold_minutes, args.same_bar)
@@ -1,7 +1,19 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List, Tuple
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from itertools import repeat
+from typing import Dict, List, Optional
+
+from bot.backtest.bar_cache import load_bars
+from bot.backtest.metrics import compute_metrics
+from bot.backtest.runner import NullJournal, quiet_logger, simulate
+from bot.backtest.shared_bars import SharedBarArrays, SharedBarsHandle
+from bot.core.bar_series import BarSeries, from_epoch
+from bot.core.config import BotConfig, load_config
+from bot.db.sqlite_store import SQLiteStore
 
 
 @dataclass
@@ -26,3 +38,99 @@ def generate_splits(total_bars: int, train_size: int, test_size: int, step: int)
         )
         start += step
     return splits
+
+
+@dataclass
+class SplitResult:
+    split: WalkForwardSplit
+    train_metrics: Dict[str, float]
+    test_metrics: Dict[str, float]
+    test_trades: List[dict] = field(default_factory=list)
+
+
+@dataclass
+class WalkForwardReport:
+    splits: List[SplitResult]
+    aggregate: Dict[str, float]
+
+    def to_dict(self) -> dict:
+        return {
+            "aggregate": self.aggregate,
+            "splits": [
+                {**asdict(r.split), "train": r.train_metrics, "test": r.test_metrics, "test_trades": len(r.test_trades)}
+                for r in self.splits
+            ],
+        }
+
+
+def run_split(config: BotConfig, symbol: str, bars: BarSeries, split: WalkForwardSplit) -> SplitResult:
+    """Replays ``train`` + ``test`` bars with no disk I/O; trades entered in the test window are out-of-sample."""
+    window = bars[split.train_start : split.test_end]
+    store = SQLiteStore(":memory:")
+    try:
+        trades = simulate(config, symbol, window, store, quiet_logger(), journal=NullJournal())
+    finally:
+        store.close()
+    test_start = from_epoch(bars.time[split.test_start], bars.tz).isoformat()
+    train = [t for t in trades if t["entry_time"] < test_start]
+    test = [t for t in trades if t["entry_time"] >= test_start]
+    return SplitResult(split, compute_metrics(train), compute_metrics(test), test)
+
+
+_worker_bars: Optional[SharedBarArrays] = None
+
+
+def _init_worker(handle: SharedBarsHandle) -> None:
+    global _worker_bars
+    _worker_bars = SharedBarArrays.attach(handle)
+
+
+def _run_split_shared(config: BotConfig, symbol: str, split: WalkForwardSplit) -> SplitResult:
+    return run_split(config, symbol, _worker_bars.series(), split)
+
+
+def run_walkforward(
+    config: BotConfig,
+    symbol: str,
+    bars: BarSeries,
+    train_size: int,
+    test_size: int,
+    step: int,
+    workers: Optional[int] = None,
+) -> WalkForwardReport:
+    """Runs every split from ``generate_splits``, in a process pool when ``workers`` > 1.
+
+    Workers attach to the bars through shared memory once at start-up; tasks only carry the
+    config and split indices.
+    """
+    splits = generate_splits(len(bars), train_size, test_size, step)
+    workers = min(workers or os.cpu_count() or 1, max(len(splits), 1))
+    if workers <= 1:
+        results = [run_split(config, symbol, bars, split) for split in splits]
+    else:
+        with SharedBarArrays.create(bars) as shared:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(shared.handle,)) as pool:
+                results = list(pool.map(_run_split_shared, repeat(config), repeat(symbol), splits))
+
+    oos_trades = [t for r in results for t in r.test_trades]
+    aggregate = {"splits": len(results), "trades": len(oos_trades), **compute_metrics(oos_trades)}
+    return WalkForwardReport(results, aggregate)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--config", required=True)
+    parser.add_argument("--symbol", required=True)
+    parser.add_argument("--m15_csv", required=True)
+    parser.add_argument("--bar_cache", default="data/bars")
+    parser.add_argument("--train", type=int, required=True, help="train window in M15 bars")
+    parser.add_argument("--test", type=int, required=True, help="test window in M15 bars")
+    parser.add_argument("--step", type=int, default=None, help="defaults to --test")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    series = load_bars(args.m15_csv, args.symbol, "M15", args.bar_cache or None)
+    report = run_walkforward(load_config(args.config), args.symbol, series, args.train, args.test, args.step or args.test, args.workers)
+    print(json.dumps(report.to_dict(), indent=2))
@@ -1,21 +1,23 @@
 from __future__ import annotations
 
-import time
-from datetime import datetime, timezone
-
+from bot.adapters.cached_adapter import CachedAdapter
 from bot.adapters.mt5_adapter import MT5Adapter
 from bot.adapters.paper_broker import PaperBroker
 from bot.adapters.paper_mt5_adapter import PaperMT5Adapter
 from bot.core.config import load_config
 from bot.core.engine import BotEngine
+from bot.core.scheduler import BarCloseScheduler
 from bot.db.sqlite_store import SQLiteStore
-from bot.utils.logging import setup_logging
+from bot.utils.logging import EventPolicy, setup_logging, shutdown_logging
 from bot.utils.logging import log_event
 
 
 def run(config_path: str, mode: str) -> None:
     config = load_config(config_path)
-    logger = setup_logging("logs")
+    logger = setup_logging(
+        "logs",
+        policy=EventPolicy(config.log_event_levels, config.log_sample_every, set(config.log_disabled_events)),
+    )
     store = SQLiteStore("data/trades.sqlite")
 
     if mode == "live":
@@ -43,20 +45,34 @@ def run(config_path: str, mode: str) -> None:
     else:
         raise ValueError("Mode must be 'paper', 'dry-run', or 'live'")
 
+    adapter = CachedAdapter(
+        adapter,
+        symbol_info_ttl=config.symbol_info_ttl_seconds,
+        account_info_ttl=config.account_info_ttl_seconds,
+    )
     if not adapter.connect():
         if hasattr(adapter, "last_error") and adapter.last_error:
             raise RuntimeError(f"Failed to connect to MT5: {adapter.last_error}")
         raise RuntimeError("Failed to connect to MT5")
 
     engine = BotEngine(config, adapter, logger, store)
+    timeframes = ["M15", "H1"] + (engine.sd_cfg.htf_timeframes if engine.sd_cfg else [])
+    scheduler = BarCloseScheduler(
+        engine,
+        timeframes,
+        grace_seconds=config.bar_close_grace_seconds,
+        supervise_interval=config.supervise_interval_seconds,
+        server_offset_seconds=config.server_utc_offset_minutes * 60,
+        logger=logger,
+    )
 
     try:
-        while True:
-            now = datetime.now(timezone.utc)
-            engine.run_once(now)
-            time.sleep(60)
+        scheduler.run()
     finally:
+        engine.close()
+        store.close()
         adapter.shutdown()
+        shutdown_logging()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone, tzinfo
+from typing import Iterator, List, Optional, Sequence, Union, overload
+
+import numpy as np
+
+from bot.core.models import Bar
+
+
+def to_epoch(dt: datetime) -> int:
+    # Naive datetimes are treated as UTC wall-clock so they round-trip unchanged.
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+def from_epoch(ts: int, tz: Optional[tzinfo] = None) -> datetime:
+    dt = datetime.fromtimestamp(int(ts), tz=timezone.utc)
+    if tz is None:
+        return dt.replace(tzinfo=None)
+    return dt.astimezone(tz)
+
+
+class BarSeries:
+    """Columnar OHLCV bars. Slices are zero-copy views; indexing yields ``Bar``."""
+
+    __slots__ = ("time", "open", "high", "low", "close", "volume", "tz")
+
+    def __init__(
+        self,
+        time: np.ndarray,
+        open: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        volume: np.ndarray,
+        tz: Optional[tzinfo] = None,
+    ) -> None:
+        self.time = time
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self.tz = tz
+
+    @classmethod
+    def empty(cls, tz: Optional[tzinfo] = None) -> "BarSeries":
+        prices = [np.empty(0, dtype=np.float64) for _ in range(5)]
+        return cls(np.empty(0, dtype=np.int64), *prices, tz=tz)
+
+    @classmethod
+    def from_bars(cls, bars: Sequence[Bar]) -> "BarSeries":
+        if isinstance(bars, BarSeries):
+            return bars
+        if not bars:
+            return cls.empty()
+        tz = bars[0].time.tzinfo
+        return cls(
+            time=np.fromiter((to_epoch(b.time) for b in bars), dtype=np.int64, count=len(bars)),
+            open=np.fromiter((b.open for b in bars), dtype=np.float64, count=len(bars)),
+            high=np.fromiter((b.high for b in bars), dtype=np.float64, count=len(bars)),
+            low=np.fromiter((b.low for b in bars), dtype=np.float64, count=len(bars)),
+            close=np.fromiter((b.close for b in bars), dtype=np.float64, count=len(bars)),
+            volume=np.fromiter((b.volume for b in bars), dtype=np.float64, count=len(bars)),
+            tz=tz,
+        )
+
+    @classmethod
+    def from_rates(cls, rates: np.ndarray, tz: Optional[tzinfo] = None) -> "BarSeries":
+        """Builds a series from an MT5 rates structured array (``time``, OHLC, ``tick_volume``)."""
+        if rates is None or not len(rates):
+            return cls.empty(tz=tz)
+        return cls(
+            time=rates["time"].astype(np.int64),
+            open=rates["open"].astype(np.float64),
+            high=rates["high"].astype(np.float64),
+            low=rates["low"].astype(np.float64),
+            close=rates["close"].astype(np.float64),
+            volume=rates["tick_volume"].astype(np.float64),
+            tz=tz,
+        )
+
+    def __len__(self) -> int:
+        return int(self.time.shape[0])
+
+    @overload
+    def __getitem__(self, index: int) -> Bar: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "BarSeries": ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return BarSeries(
+                self.time[index],
+                self.open[index],
+                self.high[index],
+                self.low[index],
+                self.close[index],
+                self.volume[index],
+                tz=self.tz,
+            )
+        return Bar(
+            time=from_epoch(self.time[index], self.tz),
+            open=float(self.open[index]),
+            high=float(self.high[index]),
+            low=float(self.low[index]),
+            close=float(self.close[index]),
+            volume=float(self.volume[index]),
+        )
+
+    def __iter__(self) -> Iterator[Bar]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def to_bars(self) -> List[Bar]:
+        return list(self)
+
+
+Bars = Union[List[Bar], BarSeries]
+
+
+class BarSeriesBuffer:
+    """Append-only columnar store; ``view()`` exposes the filled prefix without copying."""
+
+    def __init__(self, capacity: int = 1024, tz: Optional[tzinfo] = None) -> None:
+        self.tz = tz
+        self._size = 0
+        self._time = np.empty(max(capacity, 1), dtype=np.int64)
+        self._prices = np.empty((5, max(capacity, 1)), dtype=np.float64)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _grow(self) -> None:
+        capacity = self._time.shape[0] * 2
+        time = np.empty(capacity, dtype=np.int64)
+        time[: self._size] = self._time[: self._size]
+        prices = np.empty((5, capacity), dtype=np.float64)
+        prices[:, : self._size] = self._prices[:, : self._size]
+        self._time = time
+        self._prices = prices
+
+    def append_raw(self, ts: int, open: float, high: float, low: float, close: float, volume: float) -> None:
+        if self._size == self._time.shape[0]:
+            self._grow()
+        i = self._size
+        self._time[i] = ts
+        self._prices[:, i] = (open, high, low, close, volume)
+        self._size += 1
+
+    def append(self, bar: Bar) -> None:
+        self.append_raw(to_epoch(bar.time), bar.open, bar.high, bar.low, bar.close, bar.volume)
+
+    def view(self) -> BarSeries:
+        n = self._size
+        p = self._prices
+        return BarSeries(self._time[:n], p[0, :n], p[1, :n], p[2, :n], p[3, :n], p[4, :n], tz=self.tz)
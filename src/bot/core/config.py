@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import time
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 try:
     import tomllib  # py3.11
@@ -62,6 +62,15 @@ class BotConfig:
     news_schedule_path: Optional[str] = None
     trade_cooldown_minutes: int = 20
     drawdown_kill_switch: float = 0.05
+    evaluation_workers: int = 1
+    bar_close_grace_seconds: float = 2.0
+    supervise_interval_seconds: float = 10.0
+    server_utc_offset_minutes: int = 0
+    symbol_info_ttl_seconds: float = 3600.0
+    account_info_ttl_seconds: float = 2.0
+    log_event_levels: Dict[str, str] = field(default_factory=dict)
+    log_sample_every: Dict[str, int] = field(default_factory=dict)
+    log_disabled_events: List[str] = field(default_factory=list)
 
 
 def _parse_time(value: str) -> time:
@@ -106,6 +115,8 @@ def load_config(path: str) -> BotConfig:
         for cfg in raw.get("symbols", [])
     ]
 
+    logging_cfg = raw.get("logging", {})
+
     return BotConfig(
         symbols=symbols,
         sessions=sessions,
@@ -128,4 +139,13 @@ def load_config(path: str) -> BotConfig:
         news_schedule_path=raw.get("news_schedule_path"),
         trade_cooldown_minutes=int(raw.get("trade_cooldown_minutes", 20)),
         drawdown_kill_switch=float(raw.get("drawdown_kill_switch", 0.05)),
+        evaluation_workers=int(raw.get("evaluation_workers", 1)),
+        bar_close_grace_seconds=float(raw.get("bar_close_grace_seconds", 2.0)),
+        supervise_interval_seconds=float(raw.get("supervise_interval_seconds", 10.0)),
+        server_utc_offset_minutes=int(raw.get("server_utc_offset_minutes", 0)),
+        symbol_info_ttl_seconds=float(raw.get("symbol_info_ttl_seconds", 3600.0)),
+        account_info_ttl_seconds=float(raw.get("account_info_ttl_seconds", 2.0)),
+        log_event_levels={k: str(v) for k, v in logging_cfg.get("levels", {}).items()},
+        log_sample_every={k: int(v) for k, v in logging_cfg.get("sample_every", {}).items()},
+        log_disabled_events=list(logging_cfg.get("disabled", [])),
     )
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
 from datetime import datetime
+from typing import Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional
 
-from bot.core.config import BotConfig
+from bot.core.config import BotConfig, SymbolConfig
 from bot.core.interfaces import BrokerAdapter
 from bot.core.market_observer import MarketObserver
 from bot.core.risk import HardRiskManager
@@ -10,18 +13,28 @@ from bot.core.execution import ExecutionEngine
 from bot.core.news import NewsRiskFilter
 from bot.core.supervisor import TradeSupervisor, PositionMeta
 from bot.core.trade_book import TradeBook
-from bot.core.models import TradeRecord
+from bot.core.models import MarketState, Signal, TradeRecord
+from bot.core.snapshot import MarketSnapshot
 from bot.core.health import health_check
 from bot.db.sqlite_store import SQLiteStore
 from bot.ml.filter import MLFilter
 from bot.strategies.trend import TrendStrategy
 from bot.strategies.range import RangeStrategy
 from bot.strategies.supply_demand_strategy import SupplyDemandStrategy
-from bot.snd.config import load_supply_demand_config
+from bot.snd.config import SupplyDemandConfig, load_supply_demand_config
 from bot.storage.trade_journal import TradeJournal
+from bot.utils.indicator_state import IndicatorBank
 from bot.utils.logging import log_event
 
 
+@dataclass
+class SymbolEvaluation:
+    symbol: str
+    state: Optional[MarketState] = None
+    skip: Optional[str] = None
+    candidates: List[Signal] = field(default_factory=list)
+
+
 class BotEngine:
     def __init__(
         self,
@@ -30,6 +43,10 @@ class BotEngine:
         logger,
         store: SQLiteStore,
         ml_filter: MLFilter | None = None,
+        journal: TradeJournal | None = None,
+        strategies: list | None = None,
+        sd_cfg: SupplyDemandConfig | None = None,
+        on_trade_closed: Callable[[dict], None] | None = None,
     ) -> None:
         self.config = config
         self.adapter = adapter
@@ -42,14 +59,33 @@ class BotEngine:
         self.news = NewsRiskFilter(config.news_risk_window_minutes, config.news_window_pre_minutes, config.news_window_post_minutes)
         self.news.load_schedule(config.news_schedule_path)
         self.ml_filter = ml_filter or MLFilter()
-        self.strategies = [TrendStrategy(), RangeStrategy()]
+        self.strategies = list(strategies) if strategies is not None else [TrendStrategy(), RangeStrategy()]
         self.sd_cfg = None
         if config.enable_supply_demand:
-            self.sd_cfg = load_supply_demand_config(config.supply_demand_config_path)
+            self.sd_cfg = sd_cfg or load_supply_demand_config(config.supply_demand_config_path)
             self.sd_cfg.enable = True
             self.strategies.append(SupplyDemandStrategy(self.sd_cfg))
         self.trade_book = TradeBook()
-        self.journal = TradeJournal()
+        self.journal = journal or TradeJournal()
+        self.indicators = IndicatorBank()
+        self.on_trade_closed = on_trade_closed
+        self._last_states: Dict[str, MarketState] = {}
+        self._pool = None
+        if config.evaluation_workers > 1:
+            self._pool = ThreadPoolExecutor(max_workers=config.evaluation_workers, thread_name_prefix="evaluate")
+
+    def close(self) -> None:
+        """Stops the evaluation pool and flushes the journal. The store belongs to the caller."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        self.journal.close()
+
+    def _sync_indicators(self, symbol: str, bars_m15, bars_h1) -> dict:
+        return {
+            "M15": self.indicators.sync(symbol, "M15", bars_m15),
+            "H1": self.indicators.sync(symbol, "H1", bars_h1),
+        }
 
     def _journal_decision(self, now: datetime, symbol: str, action: str, reason: str, **extra) -> None:
         self.journal.write(
@@ -62,55 +98,79 @@ class BotEngine:
             }
         )
 
-    def run_once(self, now: datetime) -> None:
-        if not health_check(self.adapter, self.logger):
-            return
-        candidate_pool = []
-        for symbol_cfg in self.config.symbols:
-            symbol = symbol_cfg.symbol
-            bars_m15 = self.adapter.get_bars(symbol, "M15", 200)
-            bars_h1 = self.adapter.get_bars(symbol, "H1", 200)
-            if len(bars_m15) < 50 or len(bars_h1) < 50:
-                self._journal_decision(now, symbol, "skip", "insufficient_bars")
-                continue
+    def _evaluate_symbol(
+        self, symbol_cfg: SymbolConfig, now: datetime, snapshot: MarketSnapshot, closed_timeframes: Optional[FrozenSet[str]] = None
+    ) -> SymbolEvaluation:
+        symbol = symbol_cfg.symbol
+        bars_m15 = snapshot.get_bars(symbol, "M15", 200)
+        bars_h1 = snapshot.get_bars(symbol, "H1", 200)
+        if len(bars_m15) < 50 or len(bars_h1) < 50:
+            return SymbolEvaluation(symbol, skip="insufficient_bars")
 
-            context = {}
-            if self.config.enable_supply_demand and self.sd_cfg:
-                bars_by_tf = {"M15": bars_m15, "H1": bars_h1}
-                for tf in self.sd_cfg.htf_timeframes + [self.sd_cfg.ltf_timeframe]:
-                    if tf not in bars_by_tf:
-                        bars_by_tf[tf] = self.adapter.get_bars(symbol, tf, 300)
-                context = {
+        indicators = self._sync_indicators(symbol, bars_m15, bars_h1)
+        context = {"indicators": indicators, "closed_timeframes": closed_timeframes}
+        if self.config.enable_supply_demand and self.sd_cfg:
+            bars_by_tf = {"M15": bars_m15, "H1": bars_h1}
+            for tf in self.sd_cfg.htf_timeframes + [self.sd_cfg.ltf_timeframe]:
+                if tf not in bars_by_tf:
+                    bars_by_tf[tf] = snapshot.get_bars(symbol, tf, 300)
+            context.update(
+                {
                     "bars": bars_by_tf,
-                    "symbol_info": self.adapter.symbol_info(symbol),
+                    "symbol_info": snapshot.symbol_info(symbol),
                     "logger": self.logger,
                     "journal": self.journal,
                 }
+            )
 
-            state = self.observer.evaluate(symbol, bars_m15, bars_h1, now)
-            log_event(self.logger, "market_state", symbol=symbol, regime=state.regime_primary.value, vol=state.volatility, session=state.session)
+        state = self.observer.evaluate(symbol, bars_m15, bars_h1, now, indicators=indicators)
+        if self.news.in_risk_window(now, symbol=symbol, sensitivity=symbol_cfg.news_sensitivity):
+            return SymbolEvaluation(symbol, state, skip="news_window")
+        if not self.execution.can_open(symbol, self.config.max_positions_per_symbol):
+            return SymbolEvaluation(symbol, state, skip="position_exists")
 
-            if self.news.in_risk_window(now, symbol=symbol, sensitivity=symbol_cfg.news_sensitivity):
-                log_event(self.logger, "no_trade", symbol=symbol, reason="news_window")
-                self.store.insert_event(now.isoformat(), "no_trade", f"{symbol}:news_window")
-                self._journal_decision(now, symbol, "skip", "news_window")
-                continue
+        candidates = []
+        for strat in self.strategies:
+            signal = strat.generate(state, bars_m15, bars_h1, context=context)
+            if signal:
+                candidates.append(signal)
+        return SymbolEvaluation(symbol, state, candidates=candidates)
 
-            if not self.execution.can_open(symbol, self.config.max_positions_per_symbol):
-                log_event(self.logger, "no_trade", symbol=symbol, reason="position_exists")
-                self.store.insert_event(now.isoformat(), "no_trade", f"{symbol}:position_exists")
-                self._journal_decision(now, symbol, "skip", "position_exists")
+    def _evaluate_symbols(self, now: datetime, snapshot: MarketSnapshot, closed_timeframes: Optional[FrozenSet[str]] = None) -> Iterator[SymbolEvaluation]:
+        # Fetching and signal generation fan out per symbol; results always come back in config order.
+        symbols = self.config.symbols
+        if self._pool is None or len(symbols) < 2:
+            return (self._evaluate_symbol(cfg, now, snapshot, closed_timeframes) for cfg in symbols)
+        return self._pool.map(lambda cfg: self._evaluate_symbol(cfg, now, snapshot, closed_timeframes), symbols)
+
+    def run_once(self, now: datetime, closed_timeframes: Optional[Iterable[str]] = None) -> None:
+        """One decision cycle; work tied to a timeframe missing from ``closed_timeframes`` (S&D zone scans) is skipped, None runs it all."""
+        if not health_check(self.adapter, self.logger):
+            return
+        closed = frozenset(closed_timeframes) if closed_timeframes is not None else None
+        snapshot = MarketSnapshot(self.adapter)
+        states = {}
+        candidate_pool = []
+        for evaluation in self._evaluate_symbols(now, snapshot, closed):
+            symbol = evaluation.symbol
+            if evaluation.state is None:
+                self._journal_decision(now, symbol, "skip", evaluation.skip)
                 continue
 
-            candidates = []
-            for strat in self.strategies:
-                signal = strat.generate(state, bars_m15, bars_h1, context=context)
-                if signal:
-                    candidates.append(signal)
+            state = evaluation.state
+            states[symbol] = state
+            log_event(self.logger, "market_state", symbol=symbol, regime=state.regime_primary.value, vol=state.volatility, session=state.session)
+
+            if evaluation.skip:
+                log_event(self.logger, "no_trade", symbol=symbol, reason=evaluation.skip)
+                self.store.insert_event(now.isoformat(), "no_trade", f"{symbol}:{evaluation.skip}", symbol=symbol, reason=evaluation.skip)
+                self._journal_decision(now, symbol, "skip", evaluation.skip)
+                continue
 
+            candidates = evaluation.candidates
             if not candidates:
                 log_event(self.logger, "no_trade", symbol=symbol, reason="no_signal")
-                self.store.insert_event(now.isoformat(), "no_trade", f"{symbol}:no_signal")
+                self.store.insert_event(now.isoformat(), "no_trade", f"{symbol}:no_signal", symbol=symbol, reason="no_signal")
                 self._journal_decision(now, symbol, "skip", "no_signal")
                 continue
 
@@ -121,14 +181,14 @@ class BotEngine:
             ml_decision = self.ml_filter.score(signal, state)
             if not ml_decision.approved:
                 log_event(self.logger, "no_trade", symbol=symbol, reason="ml_filter", score=ml_decision.score)
-                self.store.insert_event(now.isoformat(), "no_trade", f"{symbol}:ml_filter")
+                self.store.insert_event(now.isoformat(), "no_trade", f"{symbol}:ml_filter", symbol=symbol, reason="ml_filter")
                 self._journal_decision(now, symbol, "skip", "ml_filter", score=ml_decision.score)
                 continue
 
-            risk_decision = self.risk.approve(signal, state)
+            risk_decision = self.risk.approve(signal, state, snapshot)
             if not risk_decision.approved:
                 log_event(self.logger, "no_trade", symbol=symbol, reason=self.risk.reason_text(risk_decision.reason))
-                self.store.insert_event(now.isoformat(), "no_trade", f"{symbol}:{risk_decision.reason}")
+                self.store.insert_event(now.isoformat(), "no_trade", f"{symbol}:{risk_decision.reason}", symbol=symbol, reason=risk_decision.reason)
                 self._journal_decision(now, symbol, "skip", risk_decision.reason)
                 continue
 
@@ -139,16 +199,17 @@ class BotEngine:
             best_signal, best_state, best_risk, best_score = candidate_pool[0]
             for signal, _, _, _ in candidate_pool[1:]:
                 log_event(self.logger, "no_trade", symbol=signal.symbol, reason="lower_quality_candidate")
-                self.store.insert_event(now.isoformat(), "no_trade", f"{signal.symbol}:lower_quality_candidate")
+                self.store.insert_event(now.isoformat(), "no_trade", f"{signal.symbol}:lower_quality_candidate", symbol=signal.symbol, reason="lower_quality_candidate")
                 self._journal_decision(now, signal.symbol, "skip", "lower_quality_candidate")
 
             if self.config.dry_run:
                 log_event(self.logger, "dry_run", symbol=best_signal.symbol, reason="dry_run_enabled")
-                self.store.insert_event(now.isoformat(), "no_trade", f"{best_signal.symbol}:dry_run")
+                self.store.insert_event(now.isoformat(), "no_trade", f"{best_signal.symbol}:dry_run", symbol=best_signal.symbol, reason="dry_run")
                 self._journal_decision(now, best_signal.symbol, "skip", "dry_run_enabled")
             else:
                 result = self.execution.place(best_signal, best_risk.adjusted_size)
                 self.execution.log_result(best_signal, result, best_risk.adjusted_size)
+                snapshot.invalidate_account()
 
                 if result.success and result.broker_order_id:
                     self.risk.register_trade_open(best_signal.symbol, best_signal.time)
@@ -161,7 +222,7 @@ class BotEngine:
                             atr_at_entry=best_state.volatility,
                         ),
                     )
-                    symbol_info = self.adapter.symbol_info(best_signal.symbol)
+                    symbol_info = snapshot.symbol_info(best_signal.symbol)
                     contract_size = float(symbol_info.get("trade_contract_size", 100000))
                     trade = TradeRecord(
                         symbol=best_signal.symbol,
@@ -189,36 +250,54 @@ class BotEngine:
                         rr=best_signal.rr,
                     )
 
-                self.store.insert_event(now.isoformat(), "order", f"{best_signal.strategy}:{result.status}")
+                self.store.insert_event(now.isoformat(), "order", f"{best_signal.strategy}:{result.status}", symbol=best_signal.symbol)
+
+        self._last_states = states
+        self.supervise(now, snapshot, states)
 
-        # manage open positions
+    def supervise(self, now: datetime, snapshot: Optional[MarketSnapshot] = None, states: Optional[Dict[str, MarketState]] = None) -> None:
+        """Manages open positions; between bar closes it reuses the last cycle's market states."""
+        if snapshot is None:
+            if not health_check(self.adapter, self.logger):
+                return
+            snapshot = MarketSnapshot(self.adapter)
+        if states is None:
+            states = {symbol: replace(state, time=now) for symbol, state in self._last_states.items()}
         all_positions = []
         tick_map = {}
         for symbol_cfg in self.config.symbols:
             positions = self.adapter.get_open_positions(symbol_cfg.symbol)
             if positions:
-                state = self.observer.evaluate(symbol_cfg.symbol, self.adapter.get_bars(symbol_cfg.symbol, "M15", 200), self.adapter.get_bars(symbol_cfg.symbol, "H1", 200), now)
-                self.supervisor.evaluate(state, positions)
+                state = states.get(symbol_cfg.symbol)
+                if state is None:
+                    bars_m15 = snapshot.get_bars(symbol_cfg.symbol, "M15", 200)
+                    bars_h1 = snapshot.get_bars(symbol_cfg.symbol, "H1", 200)
+                    indicators = self._sync_indicators(symbol_cfg.symbol, bars_m15, bars_h1)
+                    state = self.observer.evaluate(symbol_cfg.symbol, bars_m15, bars_h1, now, indicators=indicators)
+                self.supervisor.evaluate(state, positions, snapshot)
             all_positions.extend(positions)
-            tick_map[symbol_cfg.symbol] = self.adapter.get_tick(symbol_cfg.symbol).bid
+            tick_map[symbol_cfg.symbol] = snapshot.get_tick(symbol_cfg.symbol).bid
 
         closed = self.trade_book.reconcile(all_positions, tick_map, now)
         for trade in closed:
-            self.store.insert_trade(
-                {
-                    "symbol": trade.symbol,
-                    "strategy": trade.strategy,
-                    "side": trade.side.value,
-                    "entry_time": trade.entry_time.isoformat(),
-                    "entry_price": trade.entry_price,
-                    "exit_time": trade.exit_time.isoformat() if trade.exit_time else None,
-                    "exit_price": trade.exit_price,
-                    "volume": trade.volume,
-                    "pnl": trade.pnl,
-                    "reason": trade.reason,
-                    "rr": trade.rr,
-                    "tags": trade.tags,
-                    "hold_minutes": trade.hold_minutes,
-                }
-            )
+            row = {
+                "symbol": trade.symbol,
+                "strategy": trade.strategy,
+                "side": trade.side.value,
+                "entry_time": trade.entry_time.isoformat(),
+                "entry_price": trade.entry_price,
+                "exit_time": trade.exit_time.isoformat() if trade.exit_time else None,
+                "exit_price": trade.exit_price,
+                "volume": trade.volume,
+                "pnl": trade.pnl,
+                "reason": trade.reason,
+                "rr": trade.rr,
+                "tags": trade.tags,
+                "hold_minutes": trade.hold_minutes,
+            }
+            self.store.insert_trade(row)
+            if self.on_trade_closed is not None:
+                self.on_trade_closed(row)
             self.risk.register_trade_result({"symbol": trade.symbol, "pnl": trade.pnl, "close_time": trade.exit_time})
+        self.store.end_cycle()
+        self.journal.flush_if_due()
@@ -1,17 +1,22 @@
 from __future__ import annotations
 
-from typing import Protocol, Iterable, Optional, List
+from typing import TYPE_CHECKING, Protocol, Iterable, Optional, List
 from datetime import datetime
 
+from bot.core.bar_series import BarSeries, Bars
 from bot.core.models import Bar, Tick, OrderRequest, OrderResult, Position, MarketState, Signal, RiskDecision, AccountInfo
 
+if TYPE_CHECKING:
+    from bot.core.snapshot import MarketSnapshot
+
 
 class BrokerAdapter(Protocol):
     def connect(self) -> bool: ...
     def is_connected(self) -> bool: ...
     def shutdown(self) -> None: ...
 
-    def get_bars(self, symbol: str, timeframe: str, count: int) -> List[Bar]: ...
+    def get_bars(self, symbol: str, timeframe: str, count: int) -> Bars: ...
+    def get_bars_array(self, symbol: str, timeframe: str, count: int) -> BarSeries: ...
     def get_tick(self, symbol: str) -> Tick: ...
     def get_account_info(self) -> AccountInfo: ...
     def get_open_positions(self, symbol: Optional[str] = None) -> List[Position]: ...
@@ -28,20 +33,20 @@ class Strategy(Protocol):
     def generate(
         self,
         state: MarketState,
-        bars_m15: List[Bar],
-        bars_h1: List[Bar],
+        bars_m15: Bars,
+        bars_h1: Bars,
         context: Optional[dict] = None,
     ) -> Optional[Signal]: ...
 
 
 class RiskManager(Protocol):
-    def approve(self, signal: Signal, state: MarketState) -> RiskDecision: ...
+    def approve(self, signal: Signal, state: MarketState, snapshot: Optional["MarketSnapshot"] = None) -> RiskDecision: ...
     def register_trade_result(self, trade: dict) -> None: ...
     def reset_daily(self, date: datetime) -> None: ...
 
 
 class TradeSupervisor(Protocol):
-    def evaluate(self, state: MarketState, positions: List[Position]) -> None: ...
+    def evaluate(self, state: MarketState, positions: List[Position], snapshot: Optional["MarketSnapshot"] = None) -> None: ...
 
 
 class Reporter(Protocol):
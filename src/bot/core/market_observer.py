@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import List
+from typing import Dict, Optional
 
-from bot.core.models import MarketState, Regime, Bar
+from bot.core.bar_series import Bars
+from bot.core.models import MarketState, Regime
 from bot.core.config import BotConfig
-from bot.utils.indicators import atr, trend_strength, range_compression
+from bot.utils.indicator_state import IndicatorSet, indicator_view
 from bot.utils.time import in_sessions
 
 
@@ -13,10 +14,18 @@ class MarketObserver:
     def __init__(self, config: BotConfig) -> None:
         self.config = config
 
-    def evaluate(self, symbol: str, bars_m15: List[Bar], bars_h1: List[Bar], now: datetime) -> MarketState:
-        trend = trend_strength(bars_h1)
-        volatility = atr(bars_m15)
-        compression = range_compression(bars_m15)
+    def evaluate(
+        self,
+        symbol: str,
+        bars_m15: Bars,
+        bars_h1: Bars,
+        now: datetime,
+        indicators: Optional[Dict[str, IndicatorSet]] = None,
+    ) -> MarketState:
+        m15 = indicator_view(indicators, "M15", bars_m15)
+        trend = indicator_view(indicators, "H1", bars_h1).trend_strength()
+        volatility = m15.atr()
+        compression = m15.range_compression()
         session = in_sessions(now, self.config.sessions, self.config.default_timezone)
         ret_1 = 0.0
         if len(bars_m15) >= 2:
@@ -7,6 +7,7 @@ from typing import Dict, Optional
 from bot.core.models import MarketState, Signal, RiskDecision, Regime
 from bot.core.config import BotConfig, SymbolConfig
 from bot.core.interfaces import BrokerAdapter
+from bot.core.snapshot import MarketSnapshot
 from bot.utils.pips import spread_in_pips, spread_in_points
 
 
@@ -47,22 +48,26 @@ class HardRiskManager:
                 return cfg
         raise ValueError(f"No config for symbol {symbol}")
 
-    def _reset_if_new_day(self, symbol: str, now: datetime) -> None:
+    def _market(self, snapshot: Optional[MarketSnapshot]):
+        return snapshot if snapshot is not None else self.adapter
+
+    def _reset_if_new_day(self, symbol: str, now: datetime, snapshot: Optional[MarketSnapshot] = None) -> None:
         key = symbol
         date = now.strftime("%Y-%m-%d")
         if key not in self.stats or self.stats[key].date != date:
-            equity = self.adapter.get_account_info().equity
+            equity = self._market(snapshot).get_account_info().equity
             self.stats[key] = RiskStats(date=date, peak_equity=equity)
 
-    def _reset_global_if_new_day(self, now: datetime) -> None:
+    def _reset_global_if_new_day(self, now: datetime, snapshot: Optional[MarketSnapshot] = None) -> None:
         date = now.strftime("%Y-%m-%d")
         if self.global_stats is None or self.global_stats.date != date:
-            equity = self.adapter.get_account_info().equity
+            equity = self._market(snapshot).get_account_info().equity
             self.global_stats = GlobalRiskStats(date=date, peak_equity=equity)
 
-    def approve(self, signal: Signal, state: MarketState) -> RiskDecision:
-        self._reset_if_new_day(signal.symbol, signal.time)
-        self._reset_global_if_new_day(signal.time)
+    def approve(self, signal: Signal, state: MarketState, snapshot: Optional[MarketSnapshot] = None) -> RiskDecision:
+        market = self._market(snapshot)
+        self._reset_if_new_day(signal.symbol, signal.time, snapshot)
+        self._reset_global_if_new_day(signal.time, snapshot)
         stats = self.stats[signal.symbol]
         global_stats = self.global_stats
         cfg = self._symbol_cfg(signal.symbol)
@@ -83,14 +88,14 @@ class HardRiskManager:
         if stats.last_close_time and signal.time < stats.last_close_time + timedelta(minutes=cooldown_minutes):
             return RiskDecision(False, "cooldown_active")
 
-        symbol_info = self.adapter.symbol_info(signal.symbol)
+        symbol_info = market.symbol_info(signal.symbol)
         trade_mode = int(symbol_info.get("trade_mode", 1)) if symbol_info else 1
         if trade_mode == 0:
             return RiskDecision(False, "market_closed")
         point = float(symbol_info.get("point", 0.0001))
         digits = int(symbol_info.get("digits", 5))
 
-        tick = self.adapter.get_tick(signal.symbol)
+        tick = market.get_tick(signal.symbol)
         if stats.spread_cooldown_until and signal.time < stats.spread_cooldown_until:
             return RiskDecision(False, "spread_spike_cooldown")
 
@@ -125,7 +130,7 @@ class HardRiskManager:
         if global_stats and global_stats.consecutive_losses >= self.config.max_consecutive_losses:
             return RiskDecision(False, "global_consecutive_losses")
 
-        info = self.adapter.get_account_info()
+        info = market.get_account_info()
         if info.margin_free <= 0:
             return RiskDecision(False, "insufficient_margin")
 
@@ -221,9 +226,9 @@ class HardRiskManager:
             self.stats[symbol] = RiskStats(date=date.strftime("%Y-%m-%d"))
         self.global_stats = GlobalRiskStats(date=date.strftime("%Y-%m-%d"))
 
-    def approve_adjustment(self, symbol: str, now: datetime) -> RiskDecision:
-        self._reset_if_new_day(symbol, now)
-        self._reset_global_if_new_day(now)
+    def approve_adjustment(self, symbol: str, now: datetime, snapshot: Optional[MarketSnapshot] = None) -> RiskDecision:
+        self._reset_if_new_day(symbol, now, snapshot)
+        self._reset_global_if_new_day(now, snapshot)
         stats = self.stats[symbol]
         if stats.kill_switch or (self.global_stats and self.global_stats.kill_switch):
             return RiskDecision(False, "kill_switch")
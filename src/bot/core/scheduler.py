@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import time
+from datetime import datetime, timezone
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from bot.utils.logging import log_event
+from bot.utils.time import timeframe_seconds
+
+
+class BarCloseScheduler:
+    """Runs an engine cycle just after each subscribed bar close and supervises positions in between.
+
+    Each cycle is told which timeframes closed, so work tied to a timeframe that did not close
+    (S&D zone scans on H1/H4) is skipped.
+
+    Bar boundaries are computed on the broker server clock (UTC plus ``server_offset_seconds``) so
+    H4 and D1 closes line up with the broker's candles.
+    """
+
+    def __init__(
+        self,
+        engine,
+        timeframes: Iterable[str],
+        grace_seconds: float = 2.0,
+        supervise_interval: float = 10.0,
+        server_offset_seconds: int = 0,
+        logger=None,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.engine = engine
+        self.timeframes = {tf: timeframe_seconds(tf) for tf in dict.fromkeys(timeframes)}
+        if not self.timeframes:
+            raise ValueError("BarCloseScheduler needs at least one timeframe")
+        self.grace_seconds = grace_seconds
+        self.supervise_interval = supervise_interval
+        self.server_offset_seconds = server_offset_seconds
+        self.logger = logger
+        self.clock = clock
+        self.sleep = sleep
+        self._running = False
+
+    def next_close(self, ts: float) -> Tuple[float, List[str]]:
+        """Returns the next bar close strictly after ``ts`` and the timeframes closing then."""
+        server_ts = ts + self.server_offset_seconds
+        closes = {tf: server_ts - server_ts % seconds + seconds for tf, seconds in self.timeframes.items()}
+        first = min(closes.values())
+        return first - self.server_offset_seconds, [tf for tf, close in closes.items() if close == first]
+
+    def _now(self) -> datetime:
+        return datetime.fromtimestamp(self.clock(), tz=timezone.utc)
+
+    def stop(self) -> None:
+        self._running = False
+
+    def run(self, max_closes: Optional[int] = None) -> None:
+        self._running = True
+        self.engine.run_once(self._now())
+        closes = 0
+        while self._running and (max_closes is None or closes < max_closes):
+            close_ts, closed = self.next_close(self.clock())
+            wake = close_ts + self.grace_seconds
+            while self._running:
+                remaining = wake - self.clock()
+                if remaining <= 0:
+                    break
+                self.sleep(min(remaining, self.supervise_interval))
+                if self.clock() < wake:
+                    self.engine.supervise(self._now())
+            if not self._running:
+                break
+            if self.logger:
+                log_event(self.logger, "bar_close", timeframes=closed)
+            self.engine.run_once(self._now(), closed)
+            closes += 1
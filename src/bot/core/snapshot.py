@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from typing import Dict, Optional, Tuple
+
+from bot.core.bar_series import BarSeries
+from bot.core.interfaces import BrokerAdapter
+from bot.core.models import AccountInfo, Tick
+
+
+class MarketSnapshot:
+    """Cycle-scoped read-through cache over a broker adapter's market data.
+
+    Bars, ticks, symbol info and account info are fetched at most once per cycle. A bars request
+    is served from the largest window already fetched for that symbol and timeframe.
+    """
+
+    def __init__(self, adapter: BrokerAdapter) -> None:
+        self.adapter = adapter
+        self._bars: Dict[Tuple[str, str], Tuple[int, BarSeries]] = {}
+        self._ticks: Dict[str, Tick] = {}
+        self._symbol_info: Dict[str, dict] = {}
+        self._account: Optional[AccountInfo] = None
+
+    def get_bars(self, symbol: str, timeframe: str, count: int) -> BarSeries:
+        key = (symbol, timeframe)
+        cached = self._bars.get(key)
+        if cached is None or count > cached[0]:
+            cached = (count, self.adapter.get_bars_array(symbol, timeframe, count))
+            self._bars[key] = cached
+        fetched, bars = cached
+        if count >= fetched or len(bars) <= count:
+            return bars
+        return bars[-count:]
+
+    def get_tick(self, symbol: str) -> Tick:
+        if symbol not in self._ticks:
+            self._ticks[symbol] = self.adapter.get_tick(symbol)
+        return self._ticks[symbol]
+
+    def symbol_info(self, symbol: str) -> dict:
+        if symbol not in self._symbol_info:
+            self._symbol_info[symbol] = self.adapter.symbol_info(symbol)
+        return self._symbol_info[symbol]
+
+    def get_account_info(self) -> AccountInfo:
+        if self._account is None:
+            self._account = self.adapter.get_account_info()
+        return self._account
+
+    def invalidate_account(self) -> None:
+        # Margin and equity move once an order fills.
+        self._account = None
@@ -2,11 +2,12 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from bot.core.interfaces import BrokerAdapter
 from bot.core.models import MarketState, Position
 from bot.core.risk import HardRiskManager
+from bot.core.snapshot import MarketSnapshot
 
 
 @dataclass
@@ -26,16 +27,17 @@ class TradeSupervisor:
     def register(self, position_id: str, meta: PositionMeta) -> None:
         self.meta[position_id] = meta
 
-    def evaluate(self, state: MarketState, positions: List[Position]) -> None:
+    def evaluate(self, state: MarketState, positions: List[Position], snapshot: Optional[MarketSnapshot] = None) -> None:
+        market = snapshot if snapshot is not None else self.adapter
         for pos in positions:
             if pos.broker_position_id is None:
                 continue
             meta = self.meta.get(pos.broker_position_id)
-            decision = self.risk.approve_adjustment(pos.symbol, state.time)
+            decision = self.risk.approve_adjustment(pos.symbol, state.time, snapshot)
             if not decision.approved:
                 continue
 
-            tick = self.adapter.get_tick(pos.symbol)
+            tick = market.get_tick(pos.symbol)
             current_price = tick.bid if pos.side.value == "BUY" else tick.ask
             pnl = (current_price - pos.entry_price) if pos.side.value == "BUY" else (pos.entry_price - current_price)
 
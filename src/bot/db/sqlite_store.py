@@ -1,18 +1,83 @@
 from __future__ import annotations
 
+import atexit
+import queue
 import sqlite3
+import threading
 from pathlib import Path
-from typing import Iterable, Dict, Any
+from typing import Iterable, Dict, Any, List, Optional, Tuple
+
+TRADE_INSERT = """
+    INSERT INTO trades (symbol, strategy, side, entry_time, entry_price, exit_time, exit_price, volume, pnl, reason, rr, tags, hold_minutes)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+EVENT_INSERT = "INSERT INTO events (time, event_type, payload, symbol, reason) VALUES (?, ?, ?, ?, ?)"
+
+# Per-day running totals; peak/trough/max_drawdown track the intraday equity curve from zero.
+TRADE_ROLLUP = """
+    INSERT INTO daily_trade_rollup (day, trades, wins, pnl, rr_sum, peak, trough, max_drawdown)
+    VALUES (?1, 1, ?2 > 0, ?2, ?3, max(?2, 0.0), ?2, max(-?2, 0.0))
+    ON CONFLICT(day) DO UPDATE SET
+        trades = trades + 1,
+        wins = wins + (excluded.pnl > 0),
+        pnl = pnl + excluded.pnl,
+        rr_sum = rr_sum + excluded.rr_sum,
+        peak = max(peak, pnl + excluded.pnl),
+        trough = min(trough, pnl + excluded.pnl),
+        max_drawdown = max(max_drawdown, max(peak, pnl + excluded.pnl) - (pnl + excluded.pnl))
+"""
+SKIP_ROLLUP = """
+    INSERT INTO daily_skip_rollup (day, reason, count) VALUES (?, ?, 1)
+    ON CONFLICT(day, reason) DO UPDATE SET count = count + 1
+"""
+
+SCHEMA_VERSION = 1
+
+Batch = List[Tuple[str, tuple]]
+
+
+def _payload_reason(payload: Optional[str]) -> str:
+    # Payloads are "<symbol or strategy>:<reason>".
+    payload = payload or ""
+    return payload.rsplit(":", 1)[-1]
+
+
+def _trade_rollup_row(entry_time: str, pnl: Optional[float], rr: Optional[float]) -> tuple:
+    return (entry_time[:10], float(pnl or 0.0), float(rr or 0.0))
 
 
 class SQLiteStore:
-    def __init__(self, path: str) -> None:
+    """Trade/event store. Writes are buffered per cycle and committed in one transaction.
+
+    ``end_cycle()`` hands the cycle's rows to a background writer thread with its own connection
+    (or writes them inline when ``background`` is off or the database is in memory). Readers call
+    ``flush()`` first; ``close()`` flushes and also runs at interpreter exit.
+    """
+
+    def __init__(self, path: str, background: bool = True) -> None:
+        self.memory = path == ":memory:"
         self.path = Path(path)
-        self.path.parent.mkdir(parents=True, exist_ok=True)
-        self.conn = sqlite3.connect(self.path)
+        if not self.memory:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
         self.conn.row_factory = sqlite3.Row
+        if not self.memory:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
         self._init_tables()
 
+        self._pending: Batch = []
+        self._lock = threading.Lock()
+        self._error: Optional[BaseException] = None
+        self._closed = False
+        self._queue: Optional[queue.Queue] = None
+        self._writer: Optional[threading.Thread] = None
+        if background and not self.memory:
+            self._queue = queue.Queue()
+            self._writer = threading.Thread(target=self._drain, name="sqlite-writer", daemon=True)
+            self._writer.start()
+        atexit.register(self.close)
+
     def _init_tables(self) -> None:
         cur = self.conn.cursor()
         cur.execute(
@@ -41,41 +106,166 @@ class SQLiteStore:
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 time TEXT,
                 event_type TEXT,
-                payload TEXT
+                payload TEXT,
+                symbol TEXT,
+                reason TEXT
             )
             """
         )
-        self.conn.commit()
-
-    def insert_trade(self, trade: Dict[str, Any]) -> None:
-        cur = self.conn.cursor()
         cur.execute(
             """
-            INSERT INTO trades (symbol, strategy, side, entry_time, entry_price, exit_time, exit_price, volume, pnl, reason, rr, tags, hold_minutes)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                trade.get("symbol"),
-                trade.get("strategy"),
-                trade.get("side"),
-                trade.get("entry_time"),
-                trade.get("entry_price"),
-                trade.get("exit_time"),
-                trade.get("exit_price"),
-                trade.get("volume"),
-                trade.get("pnl"),
-                trade.get("reason"),
-                trade.get("rr"),
-                ",".join(trade.get("tags", [])),
-                trade.get("hold_minutes"),
-            ),
+            CREATE TABLE IF NOT EXISTS daily_trade_rollup (
+                day TEXT PRIMARY KEY,
+                trades INTEGER NOT NULL,
+                wins INTEGER NOT NULL,
+                pnl REAL NOT NULL,
+                rr_sum REAL NOT NULL,
+                peak REAL NOT NULL,
+                trough REAL NOT NULL,
+                max_drawdown REAL NOT NULL
+            )
+            """
         )
-        self.conn.commit()
-
-    def insert_event(self, time: str, event_type: str, payload: str) -> None:
-        cur = self.conn.cursor()
         cur.execute(
-            "INSERT INTO events (time, event_type, payload) VALUES (?, ?, ?)",
-            (time, event_type, payload),
+            """
+            CREATE TABLE IF NOT EXISTS daily_skip_rollup (
+                day TEXT NOT NULL,
+                reason TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                PRIMARY KEY (day, reason)
+            )
+            """
         )
+        version = cur.execute("PRAGMA user_version").fetchone()[0]
+        if version < 1:
+            self._migrate_v1(cur)
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_trades_entry_time ON trades (entry_time)")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_events_time ON events (time)")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_events_type_time ON events (event_type, time)")
+        cur.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
         self.conn.commit()
+
+    def _migrate_v1(self, cur: sqlite3.Cursor) -> None:
+        """Adds structured event columns to older databases and rebuilds the rollups from history."""
+        columns = {row[1] for row in cur.execute("PRAGMA table_info(events)")}
+        for column in ("symbol", "reason"):
+            if column not in columns:
+                cur.execute(f"ALTER TABLE events ADD COLUMN {column} TEXT")
+        updates = []
+        for row_id, event_type, payload in cur.execute("SELECT id, event_type, payload FROM events WHERE reason IS NULL").fetchall():
+            symbol = payload.split(":")[0] if event_type == "no_trade" and payload and ":" in payload else None
+            updates.append((symbol, _payload_reason(payload), row_id))
+        cur.executemany("UPDATE events SET symbol = coalesce(symbol, ?), reason = ? WHERE id = ?", updates)
+
+        cur.execute("DELETE FROM daily_trade_rollup")
+        cur.execute("DELETE FROM daily_skip_rollup")
+        trades = cur.execute("SELECT entry_time, pnl, rr FROM trades ORDER BY id").fetchall()
+        cur.executemany(TRADE_ROLLUP, [_trade_rollup_row(*row) for row in trades if row[0]])
+        skips = cur.execute("SELECT time, reason FROM events WHERE event_type = 'no_trade' ORDER BY id").fetchall()
+        cur.executemany(SKIP_ROLLUP, [(time[:10], reason or "") for time, reason in skips if time])
+
+    def insert_trade(self, trade: Dict[str, Any]) -> None:
+        row = (
+            trade.get("symbol"),
+            trade.get("strategy"),
+            trade.get("side"),
+            trade.get("entry_time"),
+            trade.get("entry_price"),
+            trade.get("exit_time"),
+            trade.get("exit_price"),
+            trade.get("volume"),
+            trade.get("pnl"),
+            trade.get("reason"),
+            trade.get("rr"),
+            ",".join(trade.get("tags", [])),
+            trade.get("hold_minutes"),
+        )
+        with self._lock:
+            self._pending.append(("trade", row))
+
+    def insert_event(self, time: str, event_type: str, payload: str, symbol: Optional[str] = None, reason: Optional[str] = None) -> None:
+        if reason is None:
+            reason = _payload_reason(payload)
+        with self._lock:
+            self._pending.append(("event", (time, event_type, payload, symbol, reason)))
+
+    @staticmethod
+    def _write(conn: sqlite3.Connection, batch: Batch) -> None:
+        trades = [row for kind, row in batch if kind == "trade"]
+        events = [row for kind, row in batch if kind == "event"]
+        with conn:
+            if trades:
+                conn.executemany(TRADE_INSERT, trades)
+                # entry_time, pnl, rr
+                conn.executemany(TRADE_ROLLUP, [_trade_rollup_row(t[3], t[8], t[10]) for t in trades if t[3]])
+            if events:
+                conn.executemany(EVENT_INSERT, events)
+                skips = [(e[0][:10], e[4] or "") for e in events if e[1] == "no_trade" and e[0]]
+                if skips:
+                    conn.executemany(SKIP_ROLLUP, skips)
+
+    def _drain(self) -> None:
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        try:
+            while True:
+                batch = self._queue.get()
+                done = 1
+                stop = batch is None
+                batch = batch or []
+                # Coalesce whatever else is already queued into the same transaction.
+                while not stop:
+                    try:
+                        more = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    done += 1
+                    if more is None:
+                        stop = True
+                    else:
+                        batch.extend(more)
+                try:
+                    if batch:
+                        self._write(conn, batch)
+                except Exception as exc:  # surfaced on the next flush()
+                    self._error = exc
+                finally:
+                    for _ in range(done):
+                        self._queue.task_done()
+                if stop:
+                    return
+        finally:
+            conn.close()
+
+    def end_cycle(self) -> None:
+        """Commits everything inserted since the last call, off-thread when a writer is running."""
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if not batch:
+            return
+        if self._queue is not None:
+            self._queue.put(batch)
+        else:
+            self._write(self.conn, batch)
+
+    def flush(self) -> None:
+        """Blocks until every row inserted so far is committed."""
+        self.end_cycle()
+        if self._queue is not None:
+            self._queue.join()
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        try:
+            self.flush()
+        finally:
+            if self._writer is not None:
+                self._queue.put(None)
+                self._writer.join()
+            self.conn.close()
@@ -1,97 +1,95 @@
 from __future__ import annotations
 
 import json
-from datetime import datetime
+from datetime import date as Date, datetime
+from typing import Any, Dict, Optional, Union
 
 from bot.db.sqlite_store import SQLiteStore
 
+Day = Union[Date, datetime]
+
 
 class DailyReporter:
+    """Reports built from the store's daily rollup tables, so cost grows with days, not rows."""
+
     def __init__(self, store: SQLiteStore) -> None:
         self.store = store
 
-    def daily_report(self, date: datetime) -> str:
+    def summary(self, start: Day, end: Optional[Day] = None) -> Dict[str, Any]:
+        """Aggregates trades and skips with entry/event dates in ``[start, end]`` (inclusive)."""
+        self.store.flush()
+        first = start.strftime("%Y-%m-%d")
+        last = (end or start).strftime("%Y-%m-%d")
         cur = self.store.conn.cursor()
-        date_str = date.strftime("%Y-%m-%d")
-        cur.execute("SELECT * FROM trades WHERE entry_time LIKE ?", (f"{date_str}%",))
-        rows = cur.fetchall()
-        cur.execute("SELECT * FROM events WHERE time LIKE ? AND event_type = ?", (f"{date_str}%", "no_trade"))
-        no_trade_rows = cur.fetchall()
+        days = cur.execute(
+            """
+            SELECT trades, wins, pnl, rr_sum, peak, trough, max_drawdown
+            FROM daily_trade_rollup WHERE day BETWEEN ? AND ? ORDER BY day
+            """,
+            (first, last),
+        ).fetchall()
+        skips = cur.execute(
+            """
+            SELECT reason, SUM(count) AS count FROM daily_skip_rollup
+            WHERE day BETWEEN ? AND ? GROUP BY reason ORDER BY count DESC, reason
+            """,
+            (first, last),
+        ).fetchall()
 
-        pnl = sum(r["pnl"] for r in rows) if rows else 0.0
-        wins = [r for r in rows if r["pnl"] > 0]
-        win_rate = len(wins) / len(rows) if rows else 0.0
-        avg_rr = sum(r["rr"] for r in rows) / len(rows) if rows else 0.0
-        expectancy = pnl / len(rows) if rows else 0.0
-        max_dd = 0.0
-        if rows:
-            equity = 0.0
-            peak = 0.0
-            for r in rows:
-                equity += r["pnl"]
-                if equity > peak:
-                    peak = equity
-                drawdown = peak - equity
-                if drawdown > max_dd:
-                    max_dd = drawdown
+        trades = wins = 0
+        pnl = rr_sum = 0.0
+        peak = max_dd = 0.0
+        # Chain the per-day equity curves: a drawdown may start on one day and bottom out on a later one.
+        for row in days:
+            max_dd = max(max_dd, row["max_drawdown"], peak - (pnl + row["trough"]))
+            peak = max(peak, pnl + row["peak"])
+            pnl += row["pnl"]
+            trades += row["trades"]
+            wins += row["wins"]
+            rr_sum += row["rr_sum"]
 
-        reasons = {}
-        for r in no_trade_rows:
-            payload = r["payload"] or ""
-            reason = payload.split(":")[-1] if ":" in payload else payload
-            reasons[reason] = reasons.get(reason, 0) + 1
+        reasons = {row["reason"]: row["count"] for row in skips}
+        return {
+            "start": first,
+            "end": last,
+            "trades": trades,
+            "trades_skipped": sum(reasons.values()),
+            "win_rate": wins / trades if trades else 0.0,
+            "pnl": pnl,
+            "expectancy": pnl / trades if trades else 0.0,
+            "avg_rr": rr_sum / trades if trades else 0.0,
+            "max_drawdown": max_dd,
+            "skip_reasons": reasons,
+        }
 
+    def daily_report(self, date: datetime) -> str:
+        s = self.summary(date)
         report = [
-            f"Daily Report {date_str}",
-            f"Trades: {len(rows)}",
-            f"Trades skipped: {len(no_trade_rows)}",
-            f"Win rate: {win_rate:.2%}",
-            f"PnL: {pnl:.2f}",
-            f"Max Drawdown: {max_dd:.2f}",
-            f"Expectancy: {expectancy:.2f}",
-            f"Avg RR: {avg_rr:.2f}",
-            f"Skip reasons: {json.dumps(reasons)}",
+            f"Daily Report {s['start']}",
+            f"Trades: {s['trades']}",
+            f"Trades skipped: {s['trades_skipped']}",
+            f"Win rate: {s['win_rate']:.2%}",
+            f"PnL: {s['pnl']:.2f}",
+            f"Max Drawdown: {s['max_drawdown']:.2f}",
+            f"Expectancy: {s['expectancy']:.2f}",
+            f"Avg RR: {s['avg_rr']:.2f}",
+            f"Skip reasons: {json.dumps(s['skip_reasons'])}",
         ]
         return "\n".join(report)
 
     def daily_report_json(self, date: datetime) -> str:
-        cur = self.store.conn.cursor()
-        date_str = date.strftime("%Y-%m-%d")
-        cur.execute("SELECT * FROM trades WHERE entry_time LIKE ?", (f"{date_str}%",))
-        rows = cur.fetchall()
-        cur.execute("SELECT * FROM events WHERE time LIKE ? AND event_type = ?", (f"{date_str}%", "no_trade"))
-        no_trade_rows = cur.fetchall()
-
-        pnl = sum(r["pnl"] for r in rows) if rows else 0.0
-        wins = [r for r in rows if r["pnl"] > 0]
-        win_rate = len(wins) / len(rows) if rows else 0.0
-        expectancy = pnl / len(rows) if rows else 0.0
-        max_dd = 0.0
-        if rows:
-            equity = 0.0
-            peak = 0.0
-            for r in rows:
-                equity += r["pnl"]
-                if equity > peak:
-                    peak = equity
-                drawdown = peak - equity
-                if drawdown > max_dd:
-                    max_dd = drawdown
-
-        reasons = {}
-        for r in no_trade_rows:
-            payload = r["payload"] or ""
-            reason = payload.split(":")[-1] if ":" in payload else payload
-            reasons[reason] = reasons.get(reason, 0) + 1
-
+        s = self.summary(date)
         payload = {
-            "date": date_str,
-            "trades": len(rows),
-            "trades_skipped": len(no_trade_rows),
-            "win_rate": win_rate,
-            "pnl": pnl,
-            "expectancy": expectancy,
-            "max_drawdown": max_dd,
-            "skip_reasons": reasons,
+            "date": s["start"],
+            "trades": s["trades"],
+            "trades_skipped": s["trades_skipped"],
+            "win_rate": s["win_rate"],
+            "pnl": s["pnl"],
+            "expectancy": s["expectancy"],
+            "max_drawdown": s["max_drawdown"],
+            "skip_reasons": s["skip_reasons"],
         }
         return json.dumps(payload, indent=2)
+
+    def range_report_json(self, start: Day, end: Day) -> str:
+        return json.dumps(self.summary(start, end), indent=2)
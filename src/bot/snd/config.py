@@ -25,8 +25,8 @@ class SupplyDemandConfig:
     partial_tp: bool = True
     partial_tp_rr: float = 1.0
     partial_tp_pct: float = 0.5
-    confirmation: ConfirmationConfig = ConfirmationConfig()
-    zone: ZoneConfig = ZoneConfig()
+    confirmation: ConfirmationConfig = field(default_factory=ConfirmationConfig)
+    zone: ZoneConfig = field(default_factory=ZoneConfig)
 
 
 def load_supply_demand_config(path: Optional[str]) -> SupplyDemandConfig:
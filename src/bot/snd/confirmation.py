@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Optional
 
-from bot.core.models import Bar
+import numpy as np
+
+from bot.core.bar_series import Bars
 from bot.snd.zone_models import Zone, ZoneType
+from bot.utils.indicators import column, rolling_max, rolling_min
 
 
 @dataclass
@@ -16,21 +19,79 @@ class ConfirmationConfig:
     swing_lookback: int = 5
 
 
-def _swing_high(bars: List[Bar], lookback: int) -> Optional[float]:
+def _swing_high(bars: Bars, lookback: int) -> Optional[float]:
     if len(bars) < lookback + 2:
         return None
-    highs = [b.high for b in bars[-lookback:]]
-    return max(highs) if highs else None
+    highs = column(bars[-lookback:], "high")
+    return float(highs.max()) if highs.size else None
 
 
-def _swing_low(bars: List[Bar], lookback: int) -> Optional[float]:
+def _swing_low(bars: Bars, lookback: int) -> Optional[float]:
     if len(bars) < lookback + 2:
         return None
-    lows = [b.low for b in bars[-lookback:]]
-    return min(lows) if lows else None
+    lows = column(bars[-lookback:], "low")
+    return float(lows.min()) if lows.size else None
+
+
+def swing_high_series(high: np.ndarray, lookback: int) -> np.ndarray:
+    """Element i is the swing high ``bos_confirmed`` compares bar i against (NaN where it has none)."""
+    high = np.asarray(high, dtype=np.float64)
+    out = np.full(high.shape[0], np.nan)
+    if high.shape[0] > lookback + 2:
+        out[lookback + 2 :] = rolling_max(high, lookback)[lookback + 1 : -1]
+    return out
+
+
+def swing_low_series(low: np.ndarray, lookback: int) -> np.ndarray:
+    low = np.asarray(low, dtype=np.float64)
+    out = np.full(low.shape[0], np.nan)
+    if low.shape[0] > lookback + 2:
+        out[lookback + 2 :] = rolling_min(low, lookback)[lookback + 1 : -1]
+    return out
+
+
+@dataclass
+class ConfirmationSignals:
+    """Per-bar confirmation flags for a whole series; ``demand``/``supply`` combine the checks ``cfg`` requires."""
+
+    bos_up: np.ndarray
+    bos_down: np.ndarray
+    rejection_up: np.ndarray
+    rejection_down: np.ndarray
+    demand: np.ndarray
+    supply: np.ndarray
+
+    def passed(self, zone_type: ZoneType, index: int = -1) -> bool:
+        flags = self.demand if zone_type == ZoneType.DEMAND else self.supply
+        return bool(flags[index])
+
+
+def confirmation_window(cfg: ConfirmationConfig) -> int:
+    """Bars ``confirmation_signals`` needs for its last flag to match the one over a full history."""
+    return cfg.swing_lookback + 3
+
+
+def confirmation_signals(bars: Bars, cfg: ConfirmationConfig) -> ConfirmationSignals:
+    """Flag i equals ``confirmation_passed(bars[: i + 1], zone, cfg)`` for a zone of that side."""
+    open_, high, low, close = (column(bars, name) for name in ("open", "high", "low", "close"))
+    bos_up = close > swing_high_series(high, cfg.swing_lookback)
+    bos_down = close < swing_low_series(low, cfg.swing_lookback)
+    body = np.abs(close - open_) * cfg.wick_body_ratio
+    rejection_up = (np.minimum(open_, close) - low > body) & (close > open_)
+    rejection_down = (high - np.maximum(open_, close) > body) & (close < open_)
+
+    demand = np.ones(close.shape[0], dtype=bool)
+    supply = np.ones(close.shape[0], dtype=bool)
+    if cfg.require_bos:
+        demand &= bos_up
+        supply &= bos_down
+    if cfg.require_rejection:
+        demand &= rejection_up
+        supply &= rejection_down
+    return ConfirmationSignals(bos_up, bos_down, rejection_up, rejection_down, demand, supply)
 
 
-def bos_confirmed(bars: List[Bar], zone: Zone, cfg: ConfirmationConfig) -> bool:
+def bos_confirmed(bars: Bars, zone: Zone, cfg: ConfirmationConfig) -> bool:
     if len(bars) < cfg.swing_lookback + 2:
         return False
     last = bars[-1]
@@ -43,8 +104,8 @@ def bos_confirmed(bars: List[Bar], zone: Zone, cfg: ConfirmationConfig) -> bool:
     return False
 
 
-def rejection_confirmed(bars: List[Bar], zone: Zone, cfg: ConfirmationConfig) -> bool:
-    if not bars:
+def rejection_confirmed(bars: Bars, zone: Zone, cfg: ConfirmationConfig) -> bool:
+    if not len(bars):
         return False
     last = bars[-1]
     body = abs(last.close - last.open)
@@ -55,7 +116,7 @@ def rejection_confirmed(bars: List[Bar], zone: Zone, cfg: ConfirmationConfig) ->
     return upper_wick > (body * cfg.wick_body_ratio) and last.close < last.open
 
 
-def confirmation_passed(bars: List[Bar], zone: Zone, cfg: ConfirmationConfig) -> bool:
+def confirmation_passed(bars: Bars, zone: Zone, cfg: ConfirmationConfig) -> bool:
     checks = []
     if cfg.require_bos:
         checks.append(bos_confirmed(bars, zone, cfg))
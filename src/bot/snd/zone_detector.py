@@ -4,8 +4,11 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import List
 
-from bot.core.models import Bar
-from bot.utils.indicators import atr as atr_calc
+import numpy as np
+
+from bot.core.bar_series import BarSeries, Bars, from_epoch
+from bot.utils.indicators import atr as atr_calc, column
+from bot.snd.zone_index import ZoneIndex
 from bot.snd.zone_models import Zone, ZoneType, ZoneConfig
 from bot.snd.zone_scoring import score_zone
 
@@ -16,137 +19,174 @@ class ZoneDetectionResult:
     atr: float
 
 
-def _body_high(bar: Bar) -> float:
-    return max(bar.open, bar.close)
+def _overlap_ratio(a: Zone, b: Zone) -> float:
+    if a.upper <= b.lower or b.upper <= a.lower:
+        return 0.0
+    overlap = min(a.upper, b.upper) - max(a.lower, b.lower)
+    return overlap / max(a.width(), b.width(), 1e-9)
 
 
-def _body_low(bar: Bar) -> float:
-    return min(bar.open, bar.close)
+def dedupe_zones(zones: List[Zone], cfg: ZoneConfig) -> List[Zone]:
+    # De-duplicate overlapping zones by keeping best score
+    ordered = sorted(zones, key=lambda x: x.score, reverse=True)
+    if cfg.overlap_threshold <= 0:
+        # Every pair "overlaps" at a ratio of at least zero, so only the best zone survives.
+        return ordered[:1]
+    filtered: List[Zone] = []
+    index = ZoneIndex()
+    for z in ordered:
+        overlap = any(_overlap_ratio(z, other) >= cfg.overlap_threshold for other in index.overlapping(z.lower, z.upper))
+        if not overlap:
+            filtered.append(z)
+            index.add(z)
+    return filtered
 
 
-def _impulsive_candles(bars: List[Bar], direction: int) -> int:
-    count = 0
-    for b in bars:
-        if direction > 0 and b.close > b.open:
-            count += 1
-        elif direction < 0 and b.close < b.open:
-            count += 1
-    return count
+def _bar_time(bars: Bars, index: int) -> datetime:
+    if isinstance(bars, BarSeries):
+        return from_epoch(bars.time[index], bars.tz)
+    return bars[index].time
 
 
-def _overlap_ratio(a: Zone, b: Zone) -> float:
-    if a.upper <= b.lower or b.upper <= a.lower:
-        return 0.0
-    overlap = min(a.upper, b.upper) - max(a.lower, b.lower)
-    return overlap / max(a.width(), b.width(), 1e-9)
+def _make_zone(
+    symbol: str,
+    timeframe: str,
+    bars: Bars,
+    zone_type: ZoneType,
+    i: int,
+    start: int,
+    lower: float,
+    upper: float,
+    impulse: float,
+    atr_val: float,
+) -> Zone:
+    created = _bar_time(bars, i)
+    tag = "D" if zone_type == ZoneType.DEMAND else "S"
+    zone = Zone(
+        id=f"{symbol}-{timeframe}-{tag}-{created.timestamp():.0f}",
+        symbol=symbol,
+        zone_type=zone_type,
+        timeframe=timeframe,
+        created_at=created,
+        lower=lower,
+        upper=upper,
+        base_start=_bar_time(bars, start),
+        base_end=created,
+        impulse_size=impulse,
+        atr=atr_val,
+        score=0.0,
+        notes=["DBR" if zone_type == ZoneType.DEMAND else "RBD"],
+    )
+    zone.score = score_zone(zone)
+    return zone
+
+
+def scan_zones(
+    symbol: str,
+    timeframe: str,
+    bars: Bars,
+    cfg: ZoneConfig,
+    atr_val: float,
+    pip_size: float,
+    first_index: int = 0,
+) -> List[Zone]:
+    """Finds DBR/RBD bases for every base length at once with sliding extrema and masks."""
+    n = len(bars)
+    imp = cfg.impulsive_min_candles
+    last_index = n - imp - 2
+    first_index = max(first_index, cfg.base_min)
+    if last_index < first_index:
+        return []
+
+    opens = column(bars, "open")
+    highs = column(bars, "high")
+    lows = column(bars, "low")
+    closes = column(bars, "close")
+    bull = closes > opens
+    bear = closes < opens
+    body_high = np.maximum(opens, closes)
+    body_low = np.minimum(opens, closes)
+
+    idx = np.arange(first_index, last_index + 1)
+    # The impulse window after a base ending at i is bars[i + 1 : i + 1 + imp]; all of them must point the same way.
+    bull_run = np.concatenate(([0], np.cumsum(bull)))
+    bear_run = np.concatenate(([0], np.cumsum(bear)))
+    rally_after = (bull_run[idx + 1 + imp] - bull_run[idx + 1]) >= imp
+    drop_after = (bear_run[idx + 1 + imp] - bear_run[idx + 1]) >= imp
+    after_close = closes[idx + imp]
+    atr_move = cfg.impulse_atr_mult * atr_val
+    pip_move = cfg.impulse_min_pips * pip_size
+    max_range = cfg.max_base_atr_mult * atr_val
+
+    # Trailing extrema over the base, extended one bar per base length: *_max[i] covers bars[i - L + 1 : i + 1].
+    base_high = highs.copy()
+    base_low = lows.copy()
+    base_body_high = body_high.copy()
+    base_body_low = body_low.copy()
+    found = []
+    for base_len in range(1, cfg.base_max + 1):
+        if base_len > 1:
+            k = base_len - 1
+            np.maximum(base_high[k:], highs[:-k], out=base_high[k:])
+            np.minimum(base_low[k:], lows[:-k], out=base_low[k:])
+            np.maximum(base_body_high[k:], body_high[:-k], out=base_body_high[k:])
+            np.minimum(base_body_low[k:], body_low[:-k], out=base_body_low[k:])
+        if base_len < cfg.base_min:
+            continue
+        valid = idx >= base_len
+        hi = base_high[idx]
+        lo = base_low[idx]
+        if atr_val > 0:
+            valid &= ~((hi - lo) > max_range)
+        before = np.maximum(idx - base_len, 0)
+
+        move = after_close - hi
+        demand = valid & bear[before] & rally_after & ((move >= atr_move) | (move >= pip_move))
+        move_supply = lo - after_close
+        supply = valid & bull[before] & drop_after & ((move_supply >= atr_move) | (move_supply >= pip_move))
+
+        wick = cfg.zone_body_rule == "wick"
+        for pos in np.flatnonzero(demand):
+            i = int(idx[pos])
+            upper = hi[pos] if wick else base_body_high[i]
+            found.append((i, base_len, 0, float(lo[pos]), float(upper), float(move[pos])))
+        for pos in np.flatnonzero(supply):
+            i = int(idx[pos])
+            lower = lo[pos] if wick else base_body_low[i]
+            found.append((i, base_len, 1, float(lower), float(hi[pos]), float(move_supply[pos])))
+
+    # Same order the nested loop produced (bar, base length, demand before supply) so ties sort identically.
+    found.sort(key=lambda row: row[:3])
+    return [
+        _make_zone(
+            symbol,
+            timeframe,
+            bars,
+            ZoneType.DEMAND if kind == 0 else ZoneType.SUPPLY,
+            i,
+            i - base_len + 1,
+            lower,
+            upper,
+            impulse,
+            atr_val,
+        )
+        for i, base_len, kind, lower, upper, impulse in found
+    ]
 
 
 def detect_zones(
     symbol: str,
     timeframe: str,
-    bars: List[Bar],
+    bars: Bars,
     cfg: ZoneConfig,
     atr_period: int = 14,
     pip_size: float = 0.0001,
 ) -> ZoneDetectionResult:
-    zones: List[Zone] = []
     if len(bars) < cfg.base_max + cfg.impulsive_min_candles + 2:
-        return ZoneDetectionResult(zones=zones, atr=0.0)
-
+        return ZoneDetectionResult(zones=[], atr=0.0)
     atr_val = atr_calc(bars, period=atr_period)
-
-    for i in range(cfg.base_min, len(bars) - cfg.impulsive_min_candles - 1):
-        # Base window at [i - base_len + 1 : i]
-        for base_len in range(cfg.base_min, cfg.base_max + 1):
-            start = i - base_len + 1
-            if start < 1:
-                continue
-            base = bars[start : i + 1]
-            base_high = max(b.high for b in base)
-            base_low = min(b.low for b in base)
-            base_range = base_high - base_low
-            if atr_val > 0 and base_range > cfg.max_base_atr_mult * atr_val:
-                continue
-
-            before = bars[start - 1]
-            after = bars[i + 1 : i + 1 + cfg.impulsive_min_candles]
-
-            # Demand: Drop -> Base -> Rally (DBR)
-            drop = before.close < before.open
-            rally = _impulsive_candles(after, direction=1) >= cfg.impulsive_min_candles
-            move_away = after[-1].close - base_high
-            if drop and rally:
-                impulse_ok = (
-                    move_away >= cfg.impulse_atr_mult * atr_val
-                    or move_away >= cfg.impulse_min_pips * pip_size
-                )
-                if impulse_ok:
-                    if cfg.zone_body_rule == "wick":
-                        lower = base_low
-                        upper = base_high
-                    else:
-                        lower = base_low
-                        upper = max(_body_high(b) for b in base)
-                    zone = Zone(
-                        id=f"{symbol}-{timeframe}-D-{bars[i].time.timestamp():.0f}",
-                        symbol=symbol,
-                        zone_type=ZoneType.DEMAND,
-                        timeframe=timeframe,
-                        created_at=bars[i].time,
-                        lower=lower,
-                        upper=upper,
-                        base_start=base[0].time,
-                        base_end=base[-1].time,
-                        impulse_size=move_away,
-                        atr=atr_val,
-                        score=0.0,
-                        notes=["DBR"],
-                    )
-                    zone.score = score_zone(zone)
-                    zones.append(zone)
-
-            # Supply: Rally -> Base -> Drop (RBD)
-            rally_before = before.close > before.open
-            drop_after = _impulsive_candles(after, direction=-1) >= cfg.impulsive_min_candles
-            move_away_supply = base_low - after[-1].close
-            if rally_before and drop_after:
-                impulse_ok = (
-                    move_away_supply >= cfg.impulse_atr_mult * atr_val
-                    or move_away_supply >= cfg.impulse_min_pips * pip_size
-                )
-                if impulse_ok:
-                    if cfg.zone_body_rule == "wick":
-                        lower = base_low
-                        upper = base_high
-                    else:
-                        upper = base_high
-                        lower = min(_body_low(b) for b in base)
-                    zone = Zone(
-                        id=f"{symbol}-{timeframe}-S-{bars[i].time.timestamp():.0f}",
-                        symbol=symbol,
-                        zone_type=ZoneType.SUPPLY,
-                        timeframe=timeframe,
-                        created_at=bars[i].time,
-                        lower=lower,
-                        upper=upper,
-                        base_start=base[0].time,
-                        base_end=base[-1].time,
-                        impulse_size=move_away_supply,
-                        atr=atr_val,
-                        score=0.0,
-                        notes=["RBD"],
-                    )
-                    zone.score = score_zone(zone)
-                    zones.append(zone)
-
-    # De-duplicate overlapping zones by keeping best score
-    filtered: List[Zone] = []
-    for z in sorted(zones, key=lambda x: x.score, reverse=True):
-        overlap = any(_overlap_ratio(z, other) >= cfg.overlap_threshold for other in filtered)
-        if not overlap:
-            filtered.append(z)
-
-    return ZoneDetectionResult(zones=filtered, atr=atr_val)
+    zones = scan_zones(symbol, timeframe, bars, cfg, atr_val, pip_size)
+    return ZoneDetectionResult(zones=dedupe_zones(zones, cfg), atr=atr_val)
 
 
 def update_zone_touches(zone: Zone, price: float, cfg: ZoneConfig) -> Zone:
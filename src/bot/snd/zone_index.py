@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import random
+from typing import Iterable, Iterator, List, Optional
+
+from bot.snd.zone_models import Zone
+
+
+class _Node:
+    __slots__ = ("zone", "priority", "max_upper", "left", "right")
+
+    def __init__(self, zone: Zone, priority: float) -> None:
+        self.zone = zone
+        self.priority = priority
+        self.max_upper = zone.upper
+        self.left: Optional[_Node] = None
+        self.right: Optional[_Node] = None
+
+    def refresh(self) -> None:
+        best = self.zone.upper
+        if self.left is not None and self.left.max_upper > best:
+            best = self.left.max_upper
+        if self.right is not None and self.right.max_upper > best:
+            best = self.right.max_upper
+        self.max_upper = best
+
+
+def _insert(node: Optional[_Node], new: _Node) -> _Node:
+    # Equal lowers go right, so iteration keeps insertion order among them.
+    if node is None:
+        return new
+    if new.zone.lower < node.zone.lower:
+        node.left = _insert(node.left, new)
+        if node.left.priority > node.priority:
+            top, node.left = node.left, node.left.right
+            node.refresh()
+            top.right = node
+            node = top
+    else:
+        node.right = _insert(node.right, new)
+        if node.right.priority > node.priority:
+            top, node.right = node.right, node.right.left
+            node.refresh()
+            top.left = node
+            node = top
+    node.refresh()
+    return node
+
+
+class ZoneIndex:
+    """Interval treap over zones: keyed by lower bound, each node holds its subtree's highest upper.
+
+    Queries skip any subtree whose highest upper is below the price/range or whose lowers are all
+    above it, so a lookup costs O((k + 1) log n) for k matches however wide any zone is. Results
+    come back ordered by lower bound.
+    """
+
+    def __init__(self, zones: Optional[Iterable[Zone]] = None) -> None:
+        self._root: Optional[_Node] = None
+        self._size = 0
+        self._rng = random.Random(0)
+        for zone in sorted(zones or [], key=lambda z: z.lower):
+            self.add(zone)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[Zone]:
+        stack: List[_Node] = []
+        node = self._root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.zone
+            node = node.right
+
+    def add(self, zone: Zone) -> None:
+        self._root = _insert(self._root, _Node(zone, self._rng.random()))
+        self._size += 1
+
+    def overlapping(self, lower: float, upper: float) -> List[Zone]:
+        # Strict overlap, matching the de-duplication ratio: touching edges do not count.
+        out: List[Zone] = []
+
+        def visit(node: Optional[_Node]) -> None:
+            if node is None or node.max_upper <= lower:
+                return
+            visit(node.left)
+            if node.zone.lower < upper:
+                if node.zone.upper > lower:
+                    out.append(node.zone)
+                visit(node.right)
+
+        visit(self._root)
+        return out
+
+    def containing(self, price: float) -> List[Zone]:
+        out: List[Zone] = []
+
+        def visit(node: Optional[_Node]) -> None:
+            if node is None or node.max_upper < price:
+                return
+            visit(node.left)
+            if node.zone.lower <= price:
+                if node.zone.contains(price):
+                    out.append(node.zone)
+                visit(node.right)
+
+        visit(self._root)
+        return out
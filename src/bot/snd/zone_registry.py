@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+from bot.core.bar_series import BarSeries, Bars, to_epoch
+from bot.snd.zone_detector import dedupe_zones, scan_zones, update_zone_touches
+from bot.snd.zone_index import ZoneIndex
+from bot.snd.zone_models import Zone, ZoneConfig
+from bot.utils.indicators import atr as atr_calc
+
+
+def _bar_epoch(bars: Bars, index: int) -> int:
+    if isinstance(bars, BarSeries):
+        return int(bars.time[index])
+    return to_epoch(bars[index].time)
+
+
+def _first_after(bars: Bars, ts: int) -> int:
+    # Walks back from the newest bar; only a handful of bars are new per cycle.
+    i = len(bars)
+    while i > 0 and _bar_epoch(bars, i - 1) > ts:
+        i -= 1
+    return i
+
+
+def _zone_key(zone: Zone) -> Tuple[str, datetime]:
+    # Ids repeat when bases of different lengths end on the same bar.
+    return zone.id, zone.base_start
+
+
+@dataclass
+class ZoneBook:
+    zones: List[Zone] = field(default_factory=list)
+    last_bar: Optional[int] = None
+    scanned_through: Optional[int] = None
+    inside: Set[Tuple[str, datetime]] = field(default_factory=set)
+    index: ZoneIndex = field(default_factory=ZoneIndex)
+
+
+class ZoneRegistry:
+    """Keeps zones per (symbol, timeframe) across cycles.
+
+    With ``scan_on_close`` only bases completed by newly closed bars are scanned; the newest
+    bar is treated as forming, as in ``detect_zones``. Otherwise the window is re-detected every
+    call and touch state is carried over by zone identity.
+    """
+
+    def __init__(self, cfg: ZoneConfig, scan_on_close: bool = True, atr_period: int = 14) -> None:
+        self.cfg = cfg
+        self.scan_on_close = scan_on_close
+        self.atr_period = atr_period
+        self.books: Dict[Tuple[str, str], ZoneBook] = {}
+
+    def book(self, symbol: str, timeframe: str) -> ZoneBook:
+        key = (symbol, timeframe)
+        if key not in self.books:
+            self.books[key] = ZoneBook()
+        return self.books[key]
+
+    def update(self, symbol: str, timeframe: str, bars: Bars, pip_size: float) -> List[Zone]:
+        book = self.book(symbol, timeframe)
+        cfg = self.cfg
+        if len(bars) < cfg.base_max + cfg.impulsive_min_candles + 2:
+            return book.zones
+        last_bar = _bar_epoch(bars, -1)
+        if self.scan_on_close and last_bar == book.last_bar:
+            return book.zones
+        book.last_bar = last_bar
+
+        first_index = 0
+        if self.scan_on_close and book.scanned_through is not None:
+            first_index = _first_after(bars, book.scanned_through)
+        atr_val = atr_calc(bars, period=self.atr_period)
+        found = scan_zones(symbol, timeframe, bars, cfg, atr_val, pip_size, first_index=first_index)
+        book.scanned_through = _bar_epoch(bars, len(bars) - cfg.impulsive_min_candles - 2)
+
+        # Zones whose base has scrolled out of the window are dropped, as a full re-scan would.
+        oldest = _bar_epoch(bars, 0)
+        kept = [z for z in book.zones if to_epoch(z.base_start) > oldest]
+        if self.scan_on_close:
+            book.zones = dedupe_zones(kept + found, cfg) if found else kept
+        else:
+            previous = {_zone_key(z): z for z in kept}
+            for zone in found:
+                old = previous.get(_zone_key(zone))
+                if old is not None:
+                    zone.touches = old.touches
+                    zone.active = old.active
+            book.zones = dedupe_zones(found, cfg)
+        book.index = ZoneIndex(book.zones)
+        book.inside &= {_zone_key(z) for z in book.zones}
+        return book.zones
+
+    def touch(self, symbol: str, timeframe: str, price: float) -> None:
+        # A touch is counted when price enters a zone, not on every cycle it stays inside.
+        book = self.book(symbol, timeframe)
+        inside = set()
+        for zone in book.index.containing(price):
+            key = _zone_key(zone)
+            inside.add(key)
+            if key not in book.inside:
+                update_zone_touches(zone, price, self.cfg)
+        book.inside = inside
+
+    def containing(self, symbol: str, timeframe: str, price: float) -> List[Zone]:
+        return [z for z in self.book(symbol, timeframe).index.containing(price) if z.active]
+
+    def active_zones(self, symbol: str, timeframe: str) -> List[Zone]:
+        return [z for z in self.book(symbol, timeframe).zones if z.active]
@@ -1,15 +1,147 @@
 from __future__ import annotations
 
+import atexit
+import gzip
 import json
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
 from pathlib import Path
-from typing import Dict, Any
+from typing import Callable, Dict, Any, List, Optional, TextIO
+
+
+def _gzip_segment(segment: Path) -> None:
+    partial = segment.with_name(segment.name + ".gz.part")
+    with segment.open("rb") as src, gzip.open(partial, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    partial.replace(segment.with_name(segment.name + ".gz"))
+    segment.unlink()
 
 
 class TradeJournal:
-    def __init__(self, path: str = "journal/trades.jsonl") -> None:
+    """Append-only JSON-lines journal kept open between writes.
+
+    Lines are buffered and written out once ``flush_bytes`` are pending or ``flush_interval``
+    seconds have passed since the last flush, so the file only ever holds whole lines. The live
+    file rolls over to ``<stem>.<day>.<n><suffix>`` (gzipped when ``compress`` is set) once it
+    would exceed ``max_bytes`` or the local day changes. ``0`` disables a threshold. Rolled segments
+    are gzipped on a background thread so a write never waits for the compression; ``close`` does.
+    """
+
+    def __init__(
+        self,
+        path: str = "journal/trades.jsonl",
+        max_bytes: int = 50_000_000,
+        rotate_daily: bool = True,
+        compress: bool = False,
+        flush_bytes: int = 64_000,
+        flush_interval: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+        today: Callable[[], date] = date.today,
+    ) -> None:
         self.path = Path(path)
         self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.rotate_daily = rotate_daily
+        self.compress = compress
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self.clock = clock
+        self.today = today
+        self._lock = threading.Lock()
+        self._buffer: List[str] = []
+        self._buffered = 0
+        self._file: Optional[TextIO] = None
+        self._size = 0
+        self._day: Optional[date] = None
+        self._last_flush = clock()
+        self._closed = False
+        self._compressor: Optional[ThreadPoolExecutor] = None
+        atexit.register(self.close)
 
     def write(self, payload: Dict[str, Any]) -> None:
-        with self.path.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(payload, default=str) + "\n")
+        line = json.dumps(payload, default=str) + "\n"
+        with self._lock:
+            if self._closed:
+                raise ValueError("write to a closed TradeJournal")
+            if self._file is None:
+                self._open()
+            size = len(line.encode("utf-8"))
+            if self._should_rotate(size):
+                self._flush_locked()
+                self._rotate()
+            self._buffer.append(line)
+            self._buffered += size
+            self._size += size
+            if self._buffered >= self.flush_bytes or self.clock() - self._last_flush >= self.flush_interval:
+                self._flush_locked()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def flush_if_due(self) -> None:
+        """Writes out buffered lines older than ``flush_interval``; call it periodically so quiet spells do not hold them."""
+        with self._lock:
+            if self._buffer and self.clock() - self._last_flush >= self.flush_interval:
+                self._flush_locked()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._flush_locked()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        if self._compressor is not None:
+            self._compressor.shutdown(wait=True)
+        atexit.unregister(self.close)
+
+    def _open(self) -> None:
+        self._file = self.path.open("a", encoding="utf-8")
+        stat = self.path.stat()
+        self._size = stat.st_size
+        # A file left over from an earlier day rolls over on the first write today.
+        self._day = datetime.fromtimestamp(stat.st_mtime).date() if self._size else self.today()
+
+    def _should_rotate(self, incoming: int) -> bool:
+        today = self.today()
+        if not self._size:
+            self._day = today
+            return False
+        if self.rotate_daily and today != self._day:
+            return True
+        return bool(self.max_bytes) and self._size + incoming > self.max_bytes
+
+    def _flush_locked(self) -> None:
+        if self._buffer and self._file is not None:
+            self._file.write("".join(self._buffer))
+            self._file.flush()
+        self._buffer.clear()
+        self._buffered = 0
+        self._last_flush = self.clock()
+
+    def _segment_path(self) -> Path:
+        stem, suffix = self.path.stem, self.path.suffix
+        n = 1
+        while True:
+            candidate = self.path.with_name(f"{stem}.{self._day.isoformat()}.{n}{suffix}")
+            if not candidate.exists() and not candidate.with_name(candidate.name + ".gz").exists():
+                return candidate
+            n += 1
+
+    def _rotate(self) -> None:
+        self._file.close()
+        segment = self._segment_path()
+        self.path.replace(segment)
+        if self.compress:
+            if self._compressor is None:
+                self._compressor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="journal-gzip")
+            self._compressor.submit(_gzip_segment, segment)
+        self._file = self.path.open("a", encoding="utf-8")
+        self._size = 0
+        self._day = self.today()
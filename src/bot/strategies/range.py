@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Optional
 
-from bot.core.models import Bar, MarketState, Signal, OrderSide, OrderType, Regime
-from bot.utils.indicators import atr, rsi, rolling_high_low
+from bot.core.models import MarketState, Signal, OrderSide, OrderType, Regime
+from bot.core.bar_series import Bars
+from bot.utils.indicator_state import indicator_view
 
 
 class RangeStrategy:
@@ -13,14 +14,15 @@ class RangeStrategy:
         self.lookback = lookback
         self.rr = rr
 
-    def generate(self, state: MarketState, bars_m15: List[Bar], bars_h1: List[Bar], context: Optional[dict] = None) -> Optional[Signal]:
+    def generate(self, state: MarketState, bars_m15: Bars, bars_h1: Bars, context: Optional[dict] = None) -> Optional[Signal]:
         if state.regime_primary != Regime.RANGE:
             return None
         if not bars_m15:
             return None
 
+        m15 = indicator_view((context or {}).get("indicators"), "M15", bars_m15)
         last = bars_m15[-1]
-        highs, lows = rolling_high_low(bars_m15, self.lookback)
+        highs, lows = m15.rolling_high_low(self.lookback)
         if highs == 0.0 or lows == 0.0:
             return None
 
@@ -28,8 +30,8 @@ class RangeStrategy:
         if range_size <= 0:
             return None
 
-        last_rsi = rsi([b.close for b in bars_m15])
-        atr_val = atr(bars_m15)
+        last_rsi = m15.rsi()
+        atr_val = m15.atr()
 
         near_high = (highs - last.close) / range_size < 0.15
         near_low = (last.close - lows) / range_size < 0.15
@@ -3,11 +3,13 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Dict, List, Optional
 
-from bot.core.models import Bar, MarketState, Signal, OrderSide, OrderType
+from bot.core.bar_series import Bars
+from bot.core.models import MarketState, Signal, OrderSide, OrderType
 from bot.snd.config import SupplyDemandConfig
-from bot.snd.zone_detector import detect_zones, update_zone_touches
+from bot.snd.zone_registry import ZoneRegistry
 from bot.snd.zone_models import Zone, ZoneType
-from bot.snd.confirmation import confirmation_passed
+from bot.snd.confirmation import ConfirmationSignals, confirmation_signals, confirmation_window
+from bot.utils.indicators import column
 from bot.utils.pips import pip_size
 from bot.utils.logging import log_event
 
@@ -22,13 +24,13 @@ class SupplyDemandStrategy:
 
     def __init__(self, cfg: SupplyDemandConfig) -> None:
         self.cfg = cfg
-        self.zones: Dict[str, List[Zone]] = {}
+        self.zones = ZoneRegistry(cfg.zone, scan_on_close=cfg.scan_on_close)
 
-    def _trend_state(self, bars: List[Bar]) -> TrendState:
+    def _trend_state(self, bars: Bars) -> TrendState:
         if len(bars) < 10:
             return TrendState("NEUTRAL")
-        highs = [b.high for b in bars]
-        lows = [b.low for b in bars]
+        highs = column(bars, "high")
+        lows = column(bars, "low")
         hh = highs[-1] > max(highs[-6:-1])
         hl = lows[-1] > min(lows[-6:-1])
         lh = highs[-1] < max(highs[-6:-1])
@@ -39,27 +41,31 @@ class SupplyDemandStrategy:
             return TrendState("BEAR")
         return TrendState("NEUTRAL")
 
-    def _select_zones(self, symbol: str, timeframe: str, bars: List[Bar], pipsize: float) -> List[Zone]:
-        result = detect_zones(symbol, timeframe, bars, self.cfg.zone, pip_size=pipsize)
-        zones = sorted(result.zones, key=lambda z: z.score, reverse=True)
+    def _select_zones(self, symbol: str, timeframe: str, bars: Bars, pipsize: float, price: float, rescan: bool = True) -> List[Zone]:
+        # Zones only change when a bar of their timeframe closes.
+        if rescan or self.zones.book(symbol, timeframe).last_bar is None:
+            self.zones.update(symbol, timeframe, bars, pipsize)
+        self.zones.touch(symbol, timeframe, price)
+        zones = sorted(self.zones.active_zones(symbol, timeframe), key=lambda z: z.score, reverse=True)
         return zones[: self.cfg.top_k_zones]
 
     def generate(
         self,
         state: MarketState,
-        bars_m15: List[Bar],
-        bars_h1: List[Bar],
+        bars_m15: Bars,
+        bars_h1: Bars,
         context: Optional[dict] = None,
     ) -> Optional[Signal]:
         if not self.cfg.enable:
             return None
 
         context = context or {}
-        bars_by_tf: Dict[str, List[Bar]] = context.get("bars", {})
+        bars_by_tf: Dict[str, Bars] = context.get("bars", {})
         ltf = self.cfg.ltf_timeframe
         htf_list = self.cfg.htf_timeframes
         symbol_info = context.get("symbol_info", {})
         logger = context.get("logger")
+        closed_timeframes = context.get("closed_timeframes")
         digits = int(symbol_info.get("digits", 5))
         point = float(symbol_info.get("point", 0.0001))
         pipsize = pip_size(state.symbol, digits, point)
@@ -69,15 +75,17 @@ class SupplyDemandStrategy:
             return None
 
         # Build HTF zones
-        all_zones: List[Zone] = []
+        last_price = ltf_bars[-1].close
+        active_zones: List[Zone] = []
         for tf in htf_list:
             htf_bars = bars_by_tf.get(tf)
             if not htf_bars:
                 continue
-            zones = self._select_zones(state.symbol, tf, htf_bars, pipsize)
-            all_zones.extend(zones)
+            rescan = closed_timeframes is None or tf in closed_timeframes
+            zones = self._select_zones(state.symbol, tf, htf_bars, pipsize, last_price, rescan)
+            active_zones.extend(zones)
 
-        if not all_zones:
+        if not active_zones:
             if logger:
                 log_event(logger, "snd_skip", symbol=state.symbol, reason="no_zones")
             return None
@@ -88,22 +96,16 @@ class SupplyDemandStrategy:
                 log_event(logger, "snd_skip", symbol=state.symbol, reason="neutral_trend")
             return None
 
-        last_price = ltf_bars[-1].close
-        active_zones: List[Zone] = []
-        for zone in all_zones:
-            zone = update_zone_touches(zone, last_price, self.cfg.zone)
-            if zone.active:
-                active_zones.append(zone)
-
         if logger:
             log_event(
                 logger,
                 "snd_zones",
                 symbol=state.symbol,
-                zones=[{"id": z.id, "type": z.zone_type.value, "lower": z.lower, "upper": z.upper, "score": z.score, "touches": z.touches} for z in active_zones],
+                zones=lambda: [{"id": z.id, "type": z.zone_type.value, "lower": z.lower, "upper": z.upper, "score": z.score, "touches": z.touches} for z in active_zones],
                 trend=trend.direction,
             )
 
+        signals: Optional[ConfirmationSignals] = None
         for zone in sorted(active_zones, key=lambda z: z.score, reverse=True):
             if trend.direction == "BULL" and zone.zone_type != ZoneType.DEMAND:
                 continue
@@ -113,7 +115,10 @@ class SupplyDemandStrategy:
             if not zone.contains(last_price):
                 continue
 
-            if not confirmation_passed(ltf_bars, zone, self.cfg.confirmation):
+            if signals is None:
+                # Only the newest bar's flags are read, so the tail that decides them is enough.
+                signals = confirmation_signals(ltf_bars[-confirmation_window(self.cfg.confirmation) :], self.cfg.confirmation)
+            if not signals.passed(zone.zone_type):
                 if logger:
                     log_event(logger, "snd_skip", symbol=state.symbol, reason="confirmation_failed", zone_id=zone.id)
                 continue
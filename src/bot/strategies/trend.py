@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Optional
 
-from bot.core.models import Bar, MarketState, Signal, OrderSide, OrderType, Regime
-from bot.utils.indicators import atr, ema, rsi, rolling_high_low, trend_strength
+from bot.core.models import MarketState, Signal, OrderSide, OrderType, Regime
+from bot.core.bar_series import Bars
+from bot.utils.indicator_state import indicator_view
 
 
 class TrendStrategy:
@@ -13,22 +14,23 @@ class TrendStrategy:
         self.min_trend = min_trend
         self.rr = rr
 
-    def generate(self, state: MarketState, bars_m15: List[Bar], bars_h1: List[Bar], context: Optional[dict] = None) -> Optional[Signal]:
+    def generate(self, state: MarketState, bars_m15: Bars, bars_h1: Bars, context: Optional[dict] = None) -> Optional[Signal]:
         if state.regime_primary != Regime.TREND:
             return None
         if not bars_m15 or not bars_h1:
             return None
 
-        trend = trend_strength(bars_h1)
+        indicators = (context or {}).get("indicators")
+        trend = indicator_view(indicators, "H1", bars_h1).trend_strength()
         if abs(trend) < self.min_trend:
             return None
 
-        closes = [b.close for b in bars_m15]
-        fast_ema = ema(closes, 20)
+        m15 = indicator_view(indicators, "M15", bars_m15)
+        fast_ema = m15.ema(20)
         last = bars_m15[-1]
-        last_rsi = rsi(closes, 14)
-        atr_val = atr(bars_m15)
-        swing_high, swing_low = rolling_high_low(bars_m15, lookback=12)
+        last_rsi = m15.rsi(14)
+        atr_val = m15.atr()
+        swing_high, swing_low = m15.rolling_high_low(lookback=12)
 
         if trend > 0:
             pullback = last.close <= fast_ema * 1.001 and last.close >= fast_ema * 0.997
@@ -0,0 +1,443 @@
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import Callable, Deque, Dict, Optional, Tuple
+
+import numpy as np
+
+from bot.core.bar_series import BarSeries, Bars, to_epoch
+from bot.utils.indicators import atr, column, ema, ema_weights, range_compression, rolling_high_low, rsi, trend_strength
+
+# (time, open, high, low, close, volume)
+RawBar = Tuple[int, float, float, float, float, float]
+
+
+class _RollingSum:
+    """Sum over the last ``size`` pushes, with a one-step rollback for a re-forming bar."""
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.values: Deque[float] = deque(maxlen=size + 1)
+        self.total = 0.0
+        self.nonzero = 0
+        self._since_resync = 0
+
+    def __len__(self) -> int:
+        return min(len(self.values), self.size)
+
+    def push(self, value: float) -> None:
+        if len(self.values) >= self.size:
+            leaving = self.values[-self.size]
+            self.total -= leaving
+            self.nonzero -= leaving != 0.0
+        self.values.append(value)
+        self.total += value
+        self.nonzero += value != 0.0
+        self._since_resync += 1
+        # Re-summing once per window bounds floating-point drift at O(1) amortized cost.
+        if self._since_resync >= self.size:
+            self.resync()
+
+    def rollback(self) -> None:
+        if self.values:
+            self.values.pop()
+        self.resync()
+
+    def resync(self) -> None:
+        self._since_resync = 0
+        window = list(self.values)[-self.size:]
+        self.total = float(np.sum(window)) if window else 0.0
+        self.nonzero = sum(1 for v in window if v != 0.0)
+
+
+class StreamingATR:
+    def __init__(self, period: int = 14) -> None:
+        self.period = period
+        self.count = 0
+        self._closes: Deque[float] = deque(maxlen=2)
+        self._tr = _RollingSum(period)
+
+    def update(self, high: float, low: float, close: float) -> None:
+        if self._closes:
+            prev_close = self._closes[-1]
+            tr = max(high - low, abs(high - prev_close), abs(low - prev_close))
+        else:
+            tr = high - low
+        self._tr.push(tr)
+        self._closes.append(close)
+        self.count += 1
+
+    def push_bar(self, high: float, low: float, close: float) -> None:
+        self.update(high, low, close)
+
+    def rollback(self) -> None:
+        self._tr.rollback()
+        if self._closes:
+            self._closes.pop()
+        self.count -= 1
+
+    @property
+    def value(self) -> float:
+        if self.count < self.period + 1:
+            return 0.0
+        return self._tr.total / self.period
+
+
+class StreamingEMA:
+    """Incremental form of ``indicators.ema``: a fixed exponential-weight window, not a recursive EMA."""
+
+    def __init__(self, period: int) -> None:
+        self.period = period
+        self.count = 0
+        self._weights = ema_weights(period)
+        self._ratio = float(self._weights[1] / self._weights[0]) if period > 1 else 1.0
+        self._values: Deque[float] = deque(maxlen=period + 1)
+        self._dot = 0.0
+        self._since_resync = 0
+
+    def update(self, value: float) -> None:
+        leaving = self._values[-self.period] if len(self._values) >= self.period else None
+        self._values.append(value)
+        self.count += 1
+        if self.count < self.period:
+            return
+        self._since_resync += 1
+        if leaving is None or self._since_resync >= self.period:
+            self._resync()
+            return
+        # Shifting the window multiplies every weight by the same ratio.
+        self._dot = (self._dot - self._weights[0] * leaving) / self._ratio + self._weights[-1] * value
+
+    def push_bar(self, high: float, low: float, close: float) -> None:
+        self.update(close)
+
+    def rollback(self) -> None:
+        if self._values:
+            self._values.pop()
+        self.count -= 1
+        self._resync()
+
+    def _resync(self) -> None:
+        self._since_resync = 0
+        if self.count >= self.period:
+            self._dot = float(np.sum(np.array(list(self._values)[-self.period:]) * self._weights))
+
+    @property
+    def value(self) -> float:
+        if self.count < self.period:
+            return float(self._values[-1]) if self._values else 0.0
+        return self._dot
+
+
+class StreamingRSI:
+    def __init__(self, period: int = 14) -> None:
+        self.period = period
+        self.count = 0
+        self._closes: Deque[float] = deque(maxlen=2)
+        self._gains = _RollingSum(period)
+        self._losses = _RollingSum(period)
+
+    def update(self, close: float) -> None:
+        if self._closes:
+            diff = close - self._closes[-1]
+            self._gains.push(diff if diff > 0 else 0.0)
+            self._losses.push(-diff if diff < 0 else 0.0)
+        self._closes.append(close)
+        self.count += 1
+
+    def push_bar(self, high: float, low: float, close: float) -> None:
+        self.update(close)
+
+    def rollback(self) -> None:
+        if self.count > 1:
+            self._gains.rollback()
+            self._losses.rollback()
+        if self._closes:
+            self._closes.pop()
+        self.count -= 1
+
+    @property
+    def value(self) -> float:
+        if self.count < self.period + 1:
+            return 50.0
+        # Zero-loss windows are detected exactly, not via a drifting running sum.
+        if not self._losses.nonzero:
+            return 100.0
+        rs = (self._gains.total / self.period) / (self._losses.total / self.period)
+        return 100.0 - (100.0 / (1.0 + rs))
+
+
+class RollingHighLow:
+    def __init__(self, lookback: int = 20) -> None:
+        self.lookback = lookback
+        self.count = 0
+        self._bars: Deque[Tuple[float, float]] = deque(maxlen=lookback + 1)
+        self._max: Deque[Tuple[int, float]] = deque()
+        self._min: Deque[Tuple[int, float]] = deque()
+
+    def update(self, high: float, low: float) -> None:
+        i = self.count
+        self._bars.append((high, low))
+        self.count += 1
+        while self._max and self._max[-1][1] <= high:
+            self._max.pop()
+        self._max.append((i, high))
+        while self._min and self._min[-1][1] >= low:
+            self._min.pop()
+        self._min.append((i, low))
+        oldest = self.count - self.lookback
+        if self._max[0][0] < oldest:
+            self._max.popleft()
+        if self._min[0][0] < oldest:
+            self._min.popleft()
+
+    def push_bar(self, high: float, low: float, close: float) -> None:
+        self.update(high, low)
+
+    def rollback(self) -> None:
+        # Monotonic deques cannot be unwound, so rebuild from the retained window (O(lookback)).
+        self._bars.pop()
+        self.count -= 1
+        bars = list(self._bars)
+        base = self.count - len(bars)
+        self._max.clear()
+        self._min.clear()
+        self._bars.clear()
+        self.count = base
+        for high, low in bars:
+            self.update(high, low)
+
+    @property
+    def value(self) -> Tuple[float, float]:
+        if not self.count:
+            return 0.0, 0.0
+        return self._max[0][1], self._min[0][1]
+
+
+class StreamingTrendStrength:
+    def __init__(self, fast: int = 20, slow: int = 50) -> None:
+        self.slow = slow
+        self.count = 0
+        self._fast = StreamingEMA(fast)
+        self._slow = StreamingEMA(slow)
+
+    def update(self, close: float) -> None:
+        self._fast.update(close)
+        self._slow.update(close)
+        self.count += 1
+
+    def push_bar(self, high: float, low: float, close: float) -> None:
+        self.update(close)
+
+    def rollback(self) -> None:
+        self._fast.rollback()
+        self._slow.rollback()
+        self.count -= 1
+
+    @property
+    def value(self) -> float:
+        if self.count < self.slow:
+            return 0.0
+        slow_ema = self._slow.value
+        return (self._fast.value - slow_ema) / (slow_ema if slow_ema else 1.0)
+
+
+class StreamingRangeCompression:
+    def __init__(self, lookback: int = 20) -> None:
+        self.lookback = lookback
+        self.count = 0
+        self._values: Deque[float] = deque(maxlen=lookback + 1)
+        # Sums are kept around a shift so the variance does not cancel catastrophically.
+        self._shift = 0.0
+        self._sum = 0.0
+        self._sumsq = 0.0
+        self._since_resync = 0
+
+    def update(self, close: float) -> None:
+        if len(self._values) >= self.lookback:
+            leaving = self._values[-self.lookback] - self._shift
+            self._sum -= leaving
+            self._sumsq -= leaving * leaving
+        self._values.append(close)
+        entering = close - self._shift
+        self._sum += entering
+        self._sumsq += entering * entering
+        self.count += 1
+        self._since_resync += 1
+        if self._since_resync >= self.lookback:
+            self._resync()
+
+    def push_bar(self, high: float, low: float, close: float) -> None:
+        self.update(close)
+
+    def rollback(self) -> None:
+        if self._values:
+            self._values.pop()
+        self.count -= 1
+        self._resync()
+
+    def _resync(self) -> None:
+        self._since_resync = 0
+        window = np.array(list(self._values)[-self.lookback:], dtype=np.float64)
+        if not window.size:
+            self._shift = self._sum = self._sumsq = 0.0
+            return
+        self._shift = float(window.mean())
+        centered = window - self._shift
+        self._sum = float(centered.sum())
+        self._sumsq = float(np.dot(centered, centered))
+
+    @property
+    def value(self) -> float:
+        if self.count < self.lookback:
+            return 0.0
+        n = float(self.lookback)
+        mean_offset = self._sum / n
+        mean = self._shift + mean_offset
+        std = math.sqrt(max(self._sumsq / n - mean_offset * mean_offset, 0.0))
+        return std / (mean if mean else 1.0)
+
+
+class IndicatorSet:
+    """Streaming indicators for one (symbol, timeframe); values are read in O(1).
+
+    Indicators are created on first use and seeded from the retained bars, so the
+    method names mirror the functions in ``bot.utils.indicators``.
+    """
+
+    def __init__(self, history: int = 500) -> None:
+        self.history: Deque[RawBar] = deque(maxlen=history)
+        self._indicators: Dict[tuple, object] = {}
+
+    @property
+    def last_time(self) -> Optional[int]:
+        return self.history[-1][0] if self.history else None
+
+    def _get(self, key: tuple, factory: Callable[[], object]):
+        ind = self._indicators.get(key)
+        if ind is None:
+            ind = factory()
+            for _, _, high, low, close, _ in self.history:
+                ind.push_bar(high, low, close)
+            self._indicators[key] = ind
+        return ind
+
+    def update(self, raw: RawBar) -> None:
+        self.history.append(raw)
+        _, _, high, low, close, _ = raw
+        for ind in self._indicators.values():
+            ind.push_bar(high, low, close)
+
+    def replace_last(self, raw: RawBar) -> None:
+        if not self.history:
+            self.update(raw)
+            return
+        self.history.pop()
+        for ind in self._indicators.values():
+            ind.rollback()
+        self.update(raw)
+
+    def reset(self) -> None:
+        self.history.clear()
+        self._indicators.clear()
+
+    def atr(self, period: int = 14) -> float:
+        return self._get(("atr", period), lambda: StreamingATR(period)).value
+
+    def ema(self, period: int) -> float:
+        return self._get(("ema", period), lambda: StreamingEMA(period)).value
+
+    def rsi(self, period: int = 14) -> float:
+        return self._get(("rsi", period), lambda: StreamingRSI(period)).value
+
+    def rolling_high_low(self, lookback: int = 20) -> Tuple[float, float]:
+        return self._get(("high_low", lookback), lambda: RollingHighLow(lookback)).value
+
+    def trend_strength(self, fast: int = 20, slow: int = 50) -> float:
+        return self._get(("trend", fast, slow), lambda: StreamingTrendStrength(fast, slow)).value
+
+    def range_compression(self, lookback: int = 20) -> float:
+        return self._get(("compression", lookback), lambda: StreamingRangeCompression(lookback)).value
+
+
+class ScalarIndicators:
+    """Same interface as ``IndicatorSet`` computed from a bar window; used when no bank is wired in."""
+
+    def __init__(self, bars: Bars) -> None:
+        self.bars = bars
+
+    def atr(self, period: int = 14) -> float:
+        return atr(self.bars, period)
+
+    def ema(self, period: int) -> float:
+        return ema(column(self.bars, "close"), period)
+
+    def rsi(self, period: int = 14) -> float:
+        return rsi(column(self.bars, "close"), period)
+
+    def rolling_high_low(self, lookback: int = 20) -> Tuple[float, float]:
+        return rolling_high_low(self.bars, lookback)
+
+    def trend_strength(self, fast: int = 20, slow: int = 50) -> float:
+        return trend_strength(self.bars, fast, slow)
+
+    def range_compression(self, lookback: int = 20) -> float:
+        return range_compression(self.bars, lookback)
+
+
+def _raw_bar(bars: Bars, index: int) -> RawBar:
+    if isinstance(bars, BarSeries):
+        return (
+            int(bars.time[index]),
+            float(bars.open[index]),
+            float(bars.high[index]),
+            float(bars.low[index]),
+            float(bars.close[index]),
+            float(bars.volume[index]),
+        )
+    bar = bars[index]
+    return (to_epoch(bar.time), bar.open, bar.high, bar.low, bar.close, bar.volume)
+
+
+class IndicatorBank:
+    """Per-(symbol, timeframe) indicator sets kept in step with the bar windows a cycle fetches."""
+
+    def __init__(self, history: int = 500) -> None:
+        self.history = history
+        self.sets: Dict[Tuple[str, str], IndicatorSet] = {}
+
+    def get(self, symbol: str, timeframe: str) -> IndicatorSet:
+        key = (symbol, timeframe)
+        if key not in self.sets:
+            self.sets[key] = IndicatorSet(self.history)
+        return self.sets[key]
+
+    def sync(self, symbol: str, timeframe: str, bars: Bars) -> IndicatorSet:
+        ind = self.get(symbol, timeframe)
+        n = len(bars)
+        if not n:
+            return ind
+        last_time = ind.last_time
+        # Walk back only over bars newer than the last one applied.
+        k = n - 1
+        if last_time is not None:
+            while k >= 0 and _raw_bar(bars, k)[0] > last_time:
+                k -= 1
+        if last_time is None or k < 0 or _raw_bar(bars, k)[0] != last_time:
+            # First sync, a gap wider than the window, or rewritten history: reseed.
+            ind.reset()
+            k = -1
+        else:
+            raw = _raw_bar(bars, k)
+            if raw != ind.history[-1]:
+                ind.replace_last(raw)
+        for i in range(k + 1, n):
+            ind.update(_raw_bar(bars, i))
+        return ind
+
+
+def indicator_view(indicators: Optional[Dict[str, IndicatorSet]], timeframe: str, bars: Bars):
+    if indicators and timeframe in indicators:
+        return indicators[timeframe]
+    return ScalarIndicators(bars)
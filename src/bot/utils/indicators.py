@@ -1,32 +1,44 @@
 from __future__ import annotations
 
-from typing import List
+from typing import Callable, Sequence
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
-from bot.core.models import Bar
+from bot.core.bar_series import BarSeries, Bars
 
 
-def atr(bars: List[Bar], period: int = 14) -> float:
+def column(bars: Bars, name: str) -> np.ndarray:
+    if isinstance(bars, BarSeries):
+        return getattr(bars, name)
+    return np.array([getattr(b, name) for b in bars], dtype=np.float64)
+
+
+def atr(bars: Bars, period: int = 14) -> float:
     if len(bars) < period + 1:
         return 0.0
-    highs = np.array([b.high for b in bars])
-    lows = np.array([b.low for b in bars])
-    closes = np.array([b.close for b in bars])
+    highs = column(bars, "high")
+    lows = column(bars, "low")
+    closes = column(bars, "close")
     prev_close = np.roll(closes, 1)
     tr = np.maximum(highs - lows, np.maximum(np.abs(highs - prev_close), np.abs(lows - prev_close)))
     tr[0] = highs[0] - lows[0]
     return float(np.mean(tr[-period:]))
 
 
-def ema(values: List[float], period: int) -> float:
-    if len(values) < period:
-        return float(values[-1]) if values else 0.0
+def ema_weights(period: int) -> np.ndarray:
     weights = np.exp(np.linspace(-1.0, 0.0, period))
     weights /= weights.sum()
-    return float(np.dot(values[-period:], weights))
+    return weights
 
 
-def rsi(values: List[float], period: int = 14) -> float:
+def ema(values: Sequence[float], period: int) -> float:
+    if len(values) < period:
+        return float(values[-1]) if len(values) else 0.0
+    # Multiply-then-sum (not BLAS dot) so ema_series reproduces this bit for bit.
+    return float(np.sum(np.asarray(values[-period:], dtype=np.float64) * ema_weights(period)))
+
+
+def rsi(values: Sequence[float], period: int = 14) -> float:
     if len(values) < period + 1:
         return 50.0
     diffs = np.diff(values[-(period + 1):])
@@ -40,17 +52,19 @@ def rsi(values: List[float], period: int = 14) -> float:
     return 100.0 - (100.0 / (1.0 + rs))
 
 
-def rolling_high_low(bars: List[Bar], lookback: int = 20) -> tuple[float, float]:
-    if not bars:
+def rolling_high_low(bars: Bars, lookback: int = 20) -> tuple[float, float]:
+    if not len(bars):
         return 0.0, 0.0
     window = bars[-lookback:]
+    if isinstance(window, BarSeries):
+        return float(window.high.max()), float(window.low.min())
     highs = [b.high for b in window]
     lows = [b.low for b in window]
     return max(highs), min(lows)
 
 
-def trend_strength(bars: List[Bar], fast: int = 20, slow: int = 50) -> float:
-    closes = [b.close for b in bars]
+def trend_strength(bars: Bars, fast: int = 20, slow: int = 50) -> float:
+    closes = column(bars, "close")
     if len(closes) < slow:
         return 0.0
     fast_ema = ema(closes, fast)
@@ -58,8 +72,102 @@ def trend_strength(bars: List[Bar], fast: int = 20, slow: int = 50) -> float:
     return (fast_ema - slow_ema) / (slow_ema if slow_ema else 1.0)
 
 
-def range_compression(bars: List[Bar], lookback: int = 20) -> float:
+def range_compression(bars: Bars, lookback: int = 20) -> float:
     if len(bars) < lookback:
         return 0.0
-    closes = np.array([b.close for b in bars[-lookback:]])
+    closes = column(bars[-lookback:], "close")
     return float(np.std(closes) / (np.mean(closes) if np.mean(closes) else 1.0))
+
+
+# Full-history series: element i equals the scalar function applied to bars[: i + 1].
+
+_BLOCK = 16384
+
+
+def _window_apply(values: np.ndarray, window: int, fn: Callable[[np.ndarray], np.ndarray]) -> np.ndarray:
+    # Reduces each trailing window, in blocks so wide windows never materialize n * window temporaries.
+    windows = sliding_window_view(values, window)
+    out = np.empty(windows.shape[0], dtype=np.float64)
+    for start in range(0, windows.shape[0], _BLOCK):
+        out[start : start + _BLOCK] = fn(windows[start : start + _BLOCK])
+    return out
+
+
+def atr_series(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
+    out = np.zeros(high.shape[0], dtype=np.float64)
+    if high.shape[0] < period + 1:
+        return out
+    prev_close = np.roll(close, 1)
+    tr = np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+    tr[0] = high[0] - low[0]
+    out[period:] = _window_apply(tr, period, lambda w: np.mean(w, axis=-1))[1:]
+    return out
+
+
+def ema_series(values: np.ndarray, period: int) -> np.ndarray:
+    values = np.asarray(values, dtype=np.float64)
+    out = values.copy()
+    if values.shape[0] < period:
+        return out
+    weights = ema_weights(period)
+    out[period - 1 :] = _window_apply(values, period, lambda w: np.sum(w * weights, axis=-1))
+    return out
+
+
+def rsi_series(values: np.ndarray, period: int = 14) -> np.ndarray:
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(values.shape[0], 50.0)
+    if values.shape[0] < period + 1:
+        return out
+    diffs = np.diff(values)
+    avg_gain = _window_apply(np.where(diffs > 0, diffs, 0.0), period, lambda w: np.mean(w, axis=-1))
+    avg_loss = _window_apply(np.where(diffs < 0, -diffs, 0.0), period, lambda w: np.mean(w, axis=-1))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = avg_gain / avg_loss
+        out[period:] = np.where(avg_loss == 0, 100.0, 100.0 - (100.0 / (1.0 + rs)))
+    return out
+
+
+def rolling_max(values: np.ndarray, window: int) -> np.ndarray:
+    values = np.asarray(values, dtype=np.float64)
+    if values.shape[0] == 0:
+        return values.copy()
+    out = np.maximum.accumulate(values)
+    if values.shape[0] > window:
+        out[window - 1 :] = sliding_window_view(values, window).max(axis=-1)
+    return out
+
+
+def rolling_min(values: np.ndarray, window: int) -> np.ndarray:
+    values = np.asarray(values, dtype=np.float64)
+    if values.shape[0] == 0:
+        return values.copy()
+    out = np.minimum.accumulate(values)
+    if values.shape[0] > window:
+        out[window - 1 :] = sliding_window_view(values, window).min(axis=-1)
+    return out
+
+
+def trend_strength_series(close: np.ndarray, fast: int = 20, slow: int = 50) -> np.ndarray:
+    close = np.asarray(close, dtype=np.float64)
+    out = np.zeros(close.shape[0], dtype=np.float64)
+    if close.shape[0] < slow:
+        return out
+    fast_ema = ema_series(close, fast)[slow - 1 :]
+    slow_ema = ema_series(close, slow)[slow - 1 :]
+    out[slow - 1 :] = (fast_ema - slow_ema) / np.where(slow_ema != 0, slow_ema, 1.0)
+    return out
+
+
+def range_compression_series(close: np.ndarray, lookback: int = 20) -> np.ndarray:
+    close = np.asarray(close, dtype=np.float64)
+    out = np.zeros(close.shape[0], dtype=np.float64)
+    if close.shape[0] < lookback:
+        return out
+    std = _window_apply(close, lookback, lambda w: np.std(w, axis=-1))
+    mean = _window_apply(close, lookback, lambda w: np.mean(w, axis=-1))
+    out[lookback - 1 :] = std / np.where(mean != 0, mean, 1.0)
+    return out
@@ -1,43 +1,138 @@
 from __future__ import annotations
 
+import atexit
+import copy
+import itertools
 import json
 import logging
+import queue
+from dataclasses import dataclass, field
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Any, Dict
-
+from typing import Any, Dict, Iterator, Optional, Set, Union
 
 class JsonFormatter(logging.Formatter):
     def format(self, record: logging.LogRecord) -> str:
+        # File and console share one formatter; serialise each record once.
+        cached = getattr(record, "_json", None)
+        if cached is not None:
+            return cached
         payload = {
-            "time": datetime.utcnow().isoformat(),
+            "time": datetime.utcfromtimestamp(record.created).isoformat(),
             "level": record.levelname,
             "name": record.name,
             "message": record.getMessage(),
         }
         if hasattr(record, "extra") and isinstance(record.extra, dict):
             payload.update(record.extra)
-        return json.dumps(payload, default=str)
+        record._json = json.dumps(payload, default=str)
+        return record._json
+
+
+@dataclass
+class EventPolicy:
+    """Per-event level, sampling (emit every Nth occurrence) and kill switch for ``log_event``."""
+
+    levels: Dict[str, Union[int, str]] = field(default_factory=dict)
+    sample_every: Dict[str, int] = field(default_factory=dict)
+    disabled: Set[str] = field(default_factory=set)
+    _counters: Dict[str, Iterator[int]] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.levels = {event: logging.getLevelName(level.upper()) if isinstance(level, str) else level for event, level in self.levels.items()}
+        self.disabled = set(self.disabled)
+
+    def level(self, event: str) -> int:
+        return self.levels.get(event, logging.INFO)
+
+    def sampled(self, event: str) -> bool:
+        every = self.sample_every.get(event, 1)
+        if every <= 1:
+            return True
+        counter = self._counters.get(event) or self._counters.setdefault(event, itertools.count())
+        return next(counter) % every == 0
+
 
+_policies: Dict[str, EventPolicy] = {}
+_listeners: Dict[str, QueueListener] = {}
 
-def setup_logging(log_dir: str, name: str = "bot") -> logging.Logger:
+
+class _RecordQueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Cheap snapshot on the caller's thread: resolve the message and copy the record and its
+        # ``extra`` dict shallowly. JSON serialisation happens on the listener thread.
+        if record.exc_info:
+            return super().prepare(record)
+        snapshot = copy.copy(record)
+        snapshot.msg = record.getMessage()
+        snapshot.args = None
+        if isinstance(getattr(record, "extra", None), dict):
+            snapshot.extra = dict(record.extra)
+        return snapshot
+
+
+def set_event_policy(logger: logging.Logger, policy: Optional[EventPolicy]) -> None:
+    if policy is None:
+        _policies.pop(logger.name, None)
+    else:
+        _policies[logger.name] = policy
+
+
+def shutdown_logging(name: str = "bot") -> None:
+    """Drains the queue and stops the listener thread started by ``setup_logging``."""
+    listener = _listeners.pop(name, None)
+    if listener is not None:
+        listener.stop()
+
+
+def setup_logging(log_dir: str, name: str = "bot", policy: Optional[EventPolicy] = None, background: bool = True) -> logging.Logger:
     Path(log_dir).mkdir(parents=True, exist_ok=True)
 
     logger = logging.getLogger(name)
     logger.setLevel(logging.INFO)
+    shutdown_logging(name)
     logger.handlers.clear()
+    set_event_policy(logger, policy)
 
+    formatter = JsonFormatter()
     file_handler = logging.FileHandler(Path(log_dir) / "bot.log", encoding="utf-8")
-    file_handler.setFormatter(JsonFormatter())
+    file_handler.setFormatter(formatter)
 
     console_handler = logging.StreamHandler()
-    console_handler.setFormatter(JsonFormatter())
+    console_handler.setFormatter(formatter)
 
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    if background:
+        records: queue.SimpleQueue = queue.SimpleQueue()
+        listener = QueueListener(records, file_handler, console_handler, respect_handler_level=True)
+        listener.start()
+        _listeners[name] = listener
+        atexit.register(shutdown_logging, name)
+        logger.addHandler(_RecordQueueHandler(records))
+    else:
+        logger.addHandler(file_handler)
+        logger.addHandler(console_handler)
     logger.propagate = False
     return logger
 
 
-def log_event(logger: logging.Logger, message: str, **extra: Dict[str, Any]) -> None:
-    logger.info(message, extra={"extra": extra})
+def log_event(logger: logging.Logger, message: str, /, **extra: Any) -> None:
+    """Logs ``message`` with ``extra`` fields.
+
+    Callable values are only called once the event is known to be emitted, so expensive payloads
+    cost nothing when the event is disabled, below the logger level or sampled out.
+    """
+    policy = _policies.get(logger.name)
+    level = logging.INFO
+    if policy is not None:
+        if message in policy.disabled:
+            return
+        level = policy.level(message)
+    if not logger.isEnabledFor(level):
+        return
+    if policy is not None and not policy.sampled(message):
+        return
+    for key, value in extra.items():
+        if callable(value) and not isinstance(value, type):
+            extra[key] = value()
+    logger.log(level, message, extra={"extra": extra})
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from datetime import tzinfo
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from bot.core.bar_series import BarSeries, BarSeriesBuffer, from_epoch, to_epoch
+from bot.core.models import Bar
+from bot.utils.time import timeframe_seconds
+
+
+def _check_timeframes(source_tf: str, target_tf: str) -> tuple[int, int]:
+    source = timeframe_seconds(source_tf)
+    target = timeframe_seconds(target_tf)
+    if target < source or target % source:
+        raise ValueError(f"Cannot resample {source_tf} into {target_tf}")
+    return source, target
+
+
+class StreamingResampler:
+    """Builds calendar-aligned target bars from closed source bars in O(1) per update.
+
+    A target bar closes as soon as the source bar that ends its period arrives.
+    If a gap skips that bar, the target bar closes when the next period starts.
+    """
+
+    def __init__(self, source_tf: str, target_tf: str, tz: Optional[tzinfo] = None) -> None:
+        self.source_tf = source_tf
+        self.target_tf = target_tf
+        self.tz = tz
+        self._source_seconds, self._target_seconds = _check_timeframes(source_tf, target_tf)
+        self._bucket: Optional[int] = None
+        self._open = self._high = self._low = self._close = self._volume = 0.0
+        self.last_closed: Optional[tuple] = None
+
+    def _emit(self) -> tuple:
+        closed = (self._bucket, self._open, self._high, self._low, self._close, self._volume)
+        self._bucket = None
+        self.last_closed = closed
+        return closed
+
+    def update_raw(self, ts: int, open: float, high: float, low: float, close: float, volume: float) -> List[tuple]:
+        closed = []
+        bucket = ts - ts % self._target_seconds
+        if self._bucket is not None and bucket != self._bucket:
+            closed.append(self._emit())
+        if self._bucket is None:
+            self._bucket = bucket
+            self._open, self._high, self._low, self._close, self._volume = open, high, low, close, volume
+        else:
+            if high > self._high:
+                self._high = high
+            if low < self._low:
+                self._low = low
+            self._close = close
+            self._volume += volume
+        if ts + self._source_seconds >= bucket + self._target_seconds:
+            closed.append(self._emit())
+        return closed
+
+    def update(self, bar: Bar) -> List[Bar]:
+        if self.tz is None and bar.time.tzinfo is not None:
+            self.tz = bar.time.tzinfo
+        closed = self.update_raw(to_epoch(bar.time), bar.open, bar.high, bar.low, bar.close, bar.volume)
+        return [self._to_bar(row) for row in closed]
+
+    @property
+    def forming(self) -> Optional[Bar]:
+        if self._bucket is None:
+            return None
+        return self._to_bar((self._bucket, self._open, self._high, self._low, self._close, self._volume))
+
+    def _to_bar(self, row: tuple) -> Bar:
+        ts, open, high, low, close, volume = row
+        return Bar(time=from_epoch(ts, self.tz), open=open, high=high, low=low, close=close, volume=volume)
+
+
+class MultiTimeframeResampler:
+    """Feeds one source stream into several target timeframes and keeps their closed bars."""
+
+    def __init__(self, source_tf: str, targets: Iterable[str], tz: Optional[tzinfo] = None, capacity: int = 1024) -> None:
+        self.source_tf = source_tf
+        self.resamplers: Dict[str, StreamingResampler] = {}
+        self.buffers: Dict[str, BarSeriesBuffer] = {}
+        for tf in targets:
+            if tf == source_tf or tf in self.resamplers:
+                continue
+            self.resamplers[tf] = StreamingResampler(source_tf, tf, tz=tz)
+            self.buffers[tf] = BarSeriesBuffer(capacity, tz=tz)
+
+    def update_raw(self, ts: int, open: float, high: float, low: float, close: float, volume: float) -> List[str]:
+        closed_tfs = []
+        for tf, resampler in self.resamplers.items():
+            closed = resampler.update_raw(ts, open, high, low, close, volume)
+            if closed:
+                for row in closed:
+                    self.buffers[tf].append_raw(*row)
+                closed_tfs.append(tf)
+        return closed_tfs
+
+    def update(self, bar: Bar) -> List[str]:
+        return self.update_raw(to_epoch(bar.time), bar.open, bar.high, bar.low, bar.close, bar.volume)
+
+    def series(self, timeframe: str) -> BarSeries:
+        return self.buffers[timeframe].view()
+
+
+def resample_series(series: BarSeries, source_tf: str, target_tf: str, include_partial: bool = False) -> BarSeries:
+    """Vectorized batch resample with the same alignment as ``StreamingResampler``."""
+    source_seconds, target_seconds = _check_timeframes(source_tf, target_tf)
+    if not len(series):
+        return BarSeries.empty(tz=series.tz)
+    buckets = series.time - series.time % target_seconds
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(series)] - 1
+    result = BarSeries(
+        time=buckets[starts],
+        open=series.open[starts],
+        high=np.maximum.reduceat(series.high, starts),
+        low=np.minimum.reduceat(series.low, starts),
+        close=series.close[ends],
+        volume=np.add.reduceat(series.volume, starts),
+        tz=series.tz,
+    )
+    if not include_partial and series.time[-1] + source_seconds < buckets[-1] + target_seconds:
+        return result[:-1]
+    return result
@@ -20,3 +20,21 @@ def in_sessions(dt: datetime, sessions: List[SessionConfig], tz: str) -> str:
             if current >= session.start or current <= session.end:
                 return session.name
     return "OFF"
+
+
+TIMEFRAME_SECONDS = {
+    "M1": 60,
+    "M5": 300,
+    "M15": 900,
+    "M30": 1800,
+    "H1": 3600,
+    "H4": 14400,
+    "D1": 86400,
+}
+
+
+def timeframe_seconds(timeframe: str) -> int:
+    try:
+        return TIMEFRAME_SECONDS[timeframe]
+    except KeyError:
+        raise ValueError(f"Unsupported timeframe {timeframe}") from None
@@ -0,0 +1,103 @@
+import os
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from bot.backtest.bar_cache import BarCache, load_bars
+from bot.core.bar_series import BarSeries
+from bot.core.models import Bar
+
+
+def _write_csv(path, rows, stamp="2026-01-05T{h:02d}:{m:02d}:00"):
+    lines = ["time,open,high,low,close,volume"]
+    for i in range(rows):
+        lines.append(f"{stamp.format(h=i // 4, m=15 * (i % 4))},{1.1 + i * 1e-4},{1.1005 + i * 1e-4},{1.0995 + i * 1e-4},{1.1002 + i * 1e-4},{i}")
+    path.write_text("\n".join(lines) + "\n")
+
+
+def _from_rows(path):
+    bars = []
+    for line in path.read_text().splitlines()[1:]:
+        t, o, h, l, c, v = line.split(",")
+        bars.append(Bar(datetime.fromisoformat(t), float(o), float(h), float(l), float(c), float(v)))
+    return BarSeries.from_bars(bars)
+
+
+def test_ingest_round_trips_and_memory_maps(tmp_path):
+    csv_path = tmp_path / "m15.csv"
+    _write_csv(csv_path, 40)
+    cache = BarCache(str(tmp_path / "bars"))
+    meta = cache.ingest(str(csv_path), "eurusd", "m15")
+    assert meta["rows"] == 40 and len(meta["source_sha256"]) == 64
+
+    loaded = cache.load("EURUSD", "M15")
+    expected = _from_rows(csv_path)
+    assert isinstance(loaded.close, np.memmap)
+    for name in ("time", "open", "high", "low", "close", "volume"):
+        assert np.array_equal(getattr(loaded, name), getattr(expected, name))
+    assert loaded[-1] == expected[-1]
+
+
+def test_load_csv_reingests_only_when_the_source_changes(tmp_path):
+    csv_path = tmp_path / "m15.csv"
+    _write_csv(csv_path, 20)
+    root = str(tmp_path / "bars")
+    assert len(load_bars(str(csv_path), "EURUSD", "M15", root)) == 20
+    cache = BarCache(root)
+    meta_file = cache.path("EURUSD", "M15") / "meta.json"
+    written = meta_file.stat().st_mtime_ns
+
+    # Touched but identical: the hash matches, nothing is rewritten.
+    os.utime(csv_path, (1, 1))
+    assert cache.is_fresh(str(csv_path), "EURUSD", "M15")
+    load_bars(str(csv_path), "EURUSD", "M15", root)
+    assert meta_file.stat().st_mtime_ns == written
+
+    _write_csv(csv_path, 24)
+    assert not cache.is_fresh(str(csv_path), "EURUSD", "M15")
+    assert len(load_bars(str(csv_path), "EURUSD", "M15", root)) == 24
+
+
+def test_other_csv_with_same_size_and_mtime_is_not_served_stale_bars(tmp_path):
+    first, second = tmp_path / "a.csv", tmp_path / "b.csv"
+    _write_csv(first, 20)
+    _write_csv(second, 20, stamp="2026-01-06T{h:02d}:{m:02d}:00")
+    os.utime(first, (1_700_000_000, 1_700_000_000))
+    os.utime(second, (1_700_000_000, 1_700_000_000))
+    assert first.stat().st_size == second.stat().st_size
+
+    root = str(tmp_path / "bars")
+    load_bars(str(first), "EURUSD", "M15", root)
+    assert not BarCache(root).is_fresh(str(second), "EURUSD", "M15")
+    assert np.array_equal(load_bars(str(second), "EURUSD", "M15", root).time, _from_rows(second).time)
+
+    # An identical copy elsewhere still hits the cache through the content hash.
+    copy = tmp_path / "copy.csv"
+    copy.write_bytes(second.read_bytes())
+    assert BarCache(root).is_fresh(str(copy), "EURUSD", "M15")
+
+
+def test_timezone_aware_csv_keeps_its_offset(tmp_path):
+    csv_path = tmp_path / "h1.csv"
+    _write_csv(csv_path, 8, stamp="2026-01-05T{h:02d}:{m:02d}:00+02:00")
+    loaded = load_bars(str(csv_path), "EURUSD", "H1", str(tmp_path / "bars"))
+    expected = _from_rows(csv_path)
+    assert np.array_equal(loaded.time, expected.time)
+    assert loaded[0].time == expected[0].time
+    assert loaded[0].time.utcoffset() == expected[0].time.utcoffset()
+
+
+def test_mixed_utc_offsets_are_rejected(tmp_path):
+    csv_path = tmp_path / "m15.csv"
+    csv_path.write_text(
+        "time,open,high,low,close,volume\n"
+        "2026-03-29T00:45:00+00:00,1.1,1.1,1.1,1.1,1\n"
+        "2026-03-29T02:00:00+01:00,1.1,1.1,1.1,1.1,1\n"
+    )
+    with pytest.raises(ValueError, match="several UTC offsets"):
+        load_bars(str(csv_path), "EURUSD", "M15", None)
+
+    csv_path.write_text("time,open,high,low,close,volume\n2026-03-29T00:45:00,1.1,1.1,1.1,1.1,1\n2026-03-29T01:00:00Z,1.1,1.1,1.1,1.1,1\n")
+    with pytest.raises(ValueError, match="naive"):
+        load_bars(str(csv_path), "EURUSD", "M15", None)
@@ -0,0 +1,82 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from bot.adapters.paper_broker import PaperBroker
+from bot.core.bar_series import BarSeries
+from bot.core.models import Bar, MarketState, Regime
+from bot.strategies.trend import TrendStrategy
+from bot.utils.indicators import atr, range_compression, rolling_high_low, trend_strength
+
+
+def _bars(count: int, tz=None) -> list[Bar]:
+    start = datetime(2026, 1, 28, 0, 0, tzinfo=tz)
+    bars = []
+    price = 1.1000
+    for i in range(count):
+        price += 0.00005 if i % 7 else -0.0002
+        bars.append(Bar(time=start + timedelta(minutes=15 * i), open=price - 0.00004, high=price + 0.0002, low=price - 0.0002, close=price, volume=100))
+    return bars
+
+
+def test_bar_series_round_trip():
+    bars = _bars(10)
+    assert BarSeries.from_bars(bars).to_bars() == bars
+    aware = _bars(3, tz=timezone.utc)
+    assert BarSeries.from_bars(aware)[-1] == aware[-1]
+
+
+def test_bar_series_slices_are_views():
+    series = BarSeries.from_bars(_bars(50))
+    prefix = series[:20]
+    assert len(prefix) == 20
+    assert np.shares_memory(prefix.close, series.close)
+    assert prefix[-1] == series[19]
+
+
+def test_paper_broker_serves_series_windows():
+    series = BarSeries.from_bars(_bars(300))
+    broker = PaperBroker()
+    broker.seed_bars("EURUSD", "M15", series)
+    window = broker.get_bars("EURUSD", "M15", 200)
+    assert isinstance(window, BarSeries)
+    assert len(window) == 200
+    assert np.shares_memory(window.close, series.close)
+
+
+def test_indicators_match_for_list_and_series():
+    bars = _bars(120)
+    series = BarSeries.from_bars(bars)
+    assert atr(series) == atr(bars)
+    assert trend_strength(series) == trend_strength(bars)
+    assert range_compression(series) == range_compression(bars)
+    assert rolling_high_low(series, 12) == rolling_high_low(bars, 12)
+
+
+def test_trend_strategy_accepts_series():
+    h1 = _bars(60)
+    m15 = _bars(100)
+    state = MarketState(
+        symbol="EURUSD",
+        time=m15[-1].time,
+        regime_primary=Regime.TREND,
+        regime_secondary=Regime.LOW_VOL,
+        trend_strength=0.001,
+        volatility=0.001,
+        range_compression=0.001,
+        return_1=0.0001,
+        session="LONDON_NY",
+        confidence=0.9,
+    )
+    strat = TrendStrategy()
+    expected = strat.generate(state, m15, h1)
+    assert strat.generate(state, BarSeries.from_bars(m15), BarSeries.from_bars(h1)) == expected
+
+
+def test_paper_broker_array_path_matches_list_path():
+    bars = _bars(120)
+    broker = PaperBroker()
+    broker.seed_bars("EURUSD", "M15", bars)
+    series = broker.get_bars_array("EURUSD", "M15", 50)
+    assert isinstance(series, BarSeries)
+    assert series.to_bars() == broker.get_bars("EURUSD", "M15", 50)
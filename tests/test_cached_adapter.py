@@ -0,0 +1,62 @@
+from datetime import datetime
+
+from bot.adapters.cached_adapter import CachedAdapter
+from bot.adapters.paper_broker import PaperBroker
+from bot.core.models import OrderRequest, OrderSide, OrderType
+
+
+class CountingBroker(PaperBroker):
+    def __init__(self) -> None:
+        super().__init__()
+        self.symbol_info_calls = 0
+        self.account_calls = 0
+
+    def symbol_info(self, symbol):
+        self.symbol_info_calls += 1
+        return super().symbol_info(symbol)
+
+    def get_account_info(self):
+        self.account_calls += 1
+        return super().get_account_info()
+
+
+def test_symbol_info_is_cached_until_ttl_or_invalidation():
+    now = [0.0]
+    broker = CountingBroker()
+    adapter = CachedAdapter(broker, symbol_info_ttl=60.0, clock=lambda: now[0])
+    for _ in range(5):
+        assert adapter.symbol_info("EURUSD")["digits"] == 5
+    assert broker.symbol_info_calls == 1
+    now[0] = 61.0
+    adapter.symbol_info("EURUSD")
+    adapter.invalidate("EURUSD")
+    adapter.symbol_info("EURUSD")
+    assert broker.symbol_info_calls == 3
+    stats = adapter.stats["symbol_info"]
+    assert (stats.hits, stats.misses) == (4, 3)
+
+
+def test_account_info_expires_and_drops_after_orders():
+    now = [0.0]
+    broker = CountingBroker()
+    adapter = CachedAdapter(broker, account_info_ttl=2.0, clock=lambda: now[0])
+    adapter.get_account_info()
+    adapter.get_account_info()
+    assert broker.account_calls == 1
+    order = OrderRequest(
+        symbol="EURUSD",
+        side=OrderSide.BUY,
+        order_type=OrderType.MARKET,
+        volume=0.1,
+        entry_price=1.1,
+        stop_loss=1.09,
+        take_profit=1.12,
+        client_order_id="x",
+        time=datetime(2026, 1, 1),
+    )
+    assert adapter.place_order(order).success
+    adapter.get_account_info()
+    now[0] = 5.0
+    adapter.get_account_info()
+    assert broker.account_calls == 3
+    assert adapter.positions is broker.positions
@@ -0,0 +1,181 @@
+import logging
+import threading
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+import numpy as np
+
+from bot.adapters import mt5_adapter
+from bot.adapters.mt5_adapter import MT5Adapter
+from bot.adapters.paper_broker import PaperBroker
+from bot.adapters.paper_mt5_adapter import PaperMT5Adapter
+from bot.core.bar_series import BarSeries
+from bot.core.config import BotConfig, SessionConfig, SymbolConfig
+from bot.core.engine import BotEngine
+from bot.core.models import Tick
+from bot.db.sqlite_store import SQLiteStore
+from bot.utils.resample import resample_series
+
+SYMBOLS = ["EURUSD", "GBPUSD", "AUDUSD", "NZDUSD"]
+
+
+class ListHandler(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.records = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append((record.getMessage(), getattr(record, "extra", {})))
+
+
+def _config(workers: int) -> BotConfig:
+    symbols = [
+        SymbolConfig(
+            symbol=name,
+            spread_mode="pips",
+            max_spread=2.0,
+            min_spread_checks=2,
+            spread_spike_cooldown_minutes=10,
+            min_atr=0.0001,
+            max_atr=0.01,
+            min_stop_atr=0.1,
+            min_regime_confidence=0.1,
+            risk_per_trade=0.005,
+            max_daily_loss=0.05,
+            max_trades_per_day=5,
+            max_consecutive_losses=5,
+            min_rr=1.0,
+        )
+        for name in SYMBOLS
+    ]
+    sessions = [SessionConfig(name="ALL", start=datetime.strptime("00:00", "%H:%M").time(), end=datetime.strptime("23:59", "%H:%M").time())]
+    return BotConfig(symbols=symbols, sessions=sessions, default_timezone="UTC", max_daily_trades=10, evaluation_workers=workers)
+
+
+def _series(seed: int, count: int) -> BarSeries:
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0.00005, 0.0006, count))
+    open_ = np.r_[close[0], close[:-1]]
+    high = np.maximum(open_, close) + 0.0003
+    low = np.minimum(open_, close) - 0.0003
+    times = int(datetime(2026, 1, 5).timestamp()) + np.arange(count, dtype=np.int64) * 900
+    return BarSeries(times, open_, high, low, close, np.ones(count))
+
+
+def _run(tmp_path, workers: int):
+    logger = logging.getLogger(f"engine-test-{workers}")
+    logger.handlers.clear()
+    logger.propagate = False
+    handler = ListHandler()
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+
+    broker = PaperBroker()
+    engine = BotEngine(_config(workers), broker, logger, SQLiteStore(str(tmp_path / f"trades-{workers}.sqlite")))
+    data = {name: _series(seed, 1200) for seed, name in enumerate(SYMBOLS)}
+    for step in range(900, 1200, 10):
+        for name, series in data.items():
+            window = series[: step + 1]
+            broker.seed_bars(name, "M15", window)
+            broker.seed_bars(name, "H1", resample_series(window, "M15", "H1"))
+            close = float(window.close[-1])
+            broker.seed_tick(name, Tick(datetime.utcfromtimestamp(int(window.time[-1])), close, close + 0.0001))
+        engine.run_once(datetime.utcfromtimestamp(int(data[SYMBOLS[0]].time[step])))
+    engine.close()
+    engine.store.flush()
+    rows = engine.store.conn.execute("SELECT event_type, payload FROM events ORDER BY id").fetchall()
+    return handler.records, [tuple(r) for r in rows]
+
+
+def test_concurrent_evaluation_matches_serial(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    serial_logs, serial_events = _run(tmp_path, 1)
+    pooled_logs, pooled_events = _run(tmp_path, 4)
+    assert any(event_type == "order" for event_type, _ in serial_events)
+    assert pooled_events == serial_events
+    assert pooled_logs == serial_logs
+
+
+class SingleThreadedMT5:
+    """Fake terminal that records any call made while another one is still in flight."""
+
+    TIMEFRAME_M15 = 15
+    TIMEFRAME_H1 = 16385
+
+    def __init__(self) -> None:
+        self.rates = {
+            (name, tf): _rates(series if tf == self.TIMEFRAME_M15 else resample_series(series, "M15", "H1"))
+            for seed, name in enumerate(SYMBOLS)
+            for series in [_series(seed, 1200)]
+            for tf in (self.TIMEFRAME_M15, self.TIMEFRAME_H1)
+        }
+        self.threads = set()
+        self.overlaps = 0
+        self._active = 0
+        self._guard = threading.Lock()
+
+    def _call(self, result):
+        with self._guard:
+            self._active += 1
+            self.overlaps += self._active > 1
+            self.threads.add(threading.current_thread().name)
+        time.sleep(0.001)
+        with self._guard:
+            self._active -= 1
+        return result
+
+    def terminal_info(self):
+        return self._call(SimpleNamespace(trade_allowed=True))
+
+    def copy_rates_from_pos(self, symbol, timeframe, start, count):
+        return self._call(self.rates[(symbol, timeframe)][-count:].copy())
+
+    def symbol_info_tick(self, symbol):
+        last = self.rates[(symbol, self.TIMEFRAME_M15)][-1]
+        return self._call(SimpleNamespace(time=int(last["time"]), bid=float(last["close"]), ask=float(last["close"]) + 0.0001))
+
+    def symbol_info(self, symbol):
+        return self._call(
+            SimpleNamespace(
+                point=0.00001,
+                digits=5,
+                trade_contract_size=100000,
+                trade_tick_size=0.00001,
+                trade_tick_value=1.0,
+                volume_min=0.01,
+                volume_max=100.0,
+                volume_step=0.01,
+                trade_stops_level=0,
+                trade_freeze_level=0,
+                trade_mode=4,
+            )
+        )
+
+    def symbol_select(self, symbol, enable):
+        return self._call(True)
+
+
+def _rates(series: BarSeries):
+    rows = np.zeros(len(series), dtype=[("time", "<i8"), ("open", "<f8"), ("high", "<f8"), ("low", "<f8"), ("close", "<f8"), ("tick_volume", "<u8")])
+    rows["time"], rows["open"], rows["high"], rows["low"], rows["close"] = series.time, series.open, series.high, series.low, series.close
+    rows["tick_volume"] = 1
+    return rows
+
+
+def test_pooled_evaluation_serialises_mt5_calls(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    fake = SingleThreadedMT5()
+    monkeypatch.setattr(mt5_adapter, "mt5", fake)
+    logger = logging.getLogger("engine-test-mt5")
+    logger.handlers.clear()
+    logger.propagate = False
+    logger.addHandler(ListHandler())
+
+    adapter = PaperMT5Adapter(MT5Adapter(), PaperBroker())
+    engine = BotEngine(_config(4), adapter, logger, SQLiteStore(":memory:"))
+    for _ in range(3):
+        engine.run_once(datetime.utcfromtimestamp(int(fake.rates[(SYMBOLS[0], fake.TIMEFRAME_M15)]["time"][-1])))
+    engine.close()
+    assert len(fake.threads - {threading.current_thread().name}) > 1
+    assert fake.overlaps == 0
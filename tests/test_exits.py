@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from bot.backtest.exits import ExtremaTable, simulate_exits
+from bot.core.bar_series import BarSeries
+
+
+def _bars(rows):
+    open_, high, low, close = (np.array(col, dtype=np.float64) for col in zip(*rows))
+    return BarSeries(np.arange(len(rows), dtype=np.int64) * 900, open_, high, low, close, np.ones(len(rows)))
+
+
+def _brute_force(bars, entry, side, stop, take, hold):
+    last = min(entry + hold, len(bars) - 1)
+    for j in range(entry + 1, last + 1):
+        stop_hit = bars.low[j] <= stop if side > 0 else bars.high[j] >= stop
+        take_hit = bars.high[j] >= take if side > 0 else bars.low[j] <= take
+        if stop_hit:
+            return j, "stop_loss"
+        if take_hit:
+            return j, "take_profit"
+    return last, "timeout" if entry + hold <= len(bars) - 1 else "end_of_data"
+
+
+def test_first_touch_matches_bar_by_bar_scan():
+    rng = np.random.default_rng(5)
+    n = 700
+    close = 1.0 + np.cumsum(rng.normal(0, 0.001, n))
+    open_ = np.r_[close[0], close[:-1]]
+    bars = BarSeries(np.arange(n) * 900, open_, np.maximum(open_, close) + 0.0005, np.minimum(open_, close) - 0.0005, close, np.ones(n))
+    entry = rng.integers(0, n, 400)
+    side = rng.choice([-1, 1], 400)
+    distance = rng.uniform(0.001, 0.01, 400)
+    stop, take = close[entry] - side * distance, close[entry] + side * 2 * distance
+
+    exits = simulate_exits(bars, entry, side, stop, take, max_hold_bars=40, table=ExtremaTable.from_series(bars))
+    for k in range(400):
+        assert (exits.index[k], exits.reason[k]) == _brute_force(bars, entry[k], side[k], stop[k], take[k], 40)
+
+
+def test_same_bar_rules_and_gap_fills():
+    bars = _bars(
+        [
+            (1.0000, 1.0005, 0.9995, 1.0000),
+            (1.0002, 1.0030, 0.9970, 1.0010),  # spans both levels, opens nearer the target
+            (0.9950, 0.9960, 0.9940, 0.9955),  # gaps through the stop
+        ]
+    )
+    args = (bars, [0], [1], [0.9980], [1.0020])
+    assert simulate_exits(*args, same_bar="stop").reason[0] == "stop_loss"
+    assert simulate_exits(*args, same_bar="take").price[0] == pytest.approx(1.0020)
+    assert simulate_exits(*args, same_bar="nearest").reason[0] == "take_profit"
+
+    gapped = simulate_exits(bars, [1], [1], [0.9980], [1.0100])
+    assert gapped.index[0] == 2 and gapped.price[0] == pytest.approx(0.9950)
+
+    timed_out = simulate_exits(bars, [0], [-1], [1.0500], [0.9000], max_hold_bars=1)
+    assert (timed_out.index[0], timed_out.reason[0], timed_out.price[0]) == (1, "timeout", pytest.approx(1.0010))
@@ -0,0 +1,76 @@
+from datetime import datetime, timezone
+
+import numpy as np
+
+from bot.backtest.fast_backtest import fast_backtest, h1_release_counts, parity_check, session_names
+from bot.core.bar_series import BarSeries, from_epoch
+from bot.core.config import BotConfig, SessionConfig, SymbolConfig
+from bot.utils.resample import StreamingResampler
+from bot.utils.time import in_sessions
+
+
+def _config() -> BotConfig:
+    symbol = SymbolConfig(
+        symbol="EURUSD",
+        spread_mode="pips",
+        max_spread=2.0,
+        min_spread_checks=2,
+        spread_spike_cooldown_minutes=10,
+        min_atr=0.0001,
+        max_atr=0.01,
+        min_stop_atr=0.1,
+        min_regime_confidence=0.1,
+        risk_per_trade=0.005,
+        max_daily_loss=0.05,
+        max_trades_per_day=5,
+        max_consecutive_losses=5,
+        min_rr=1.0,
+    )
+    sessions = [SessionConfig(name="ALL", start=datetime.strptime("00:00", "%H:%M").time(), end=datetime.strptime("23:59", "%H:%M").time())]
+    return BotConfig(symbols=[symbol], sessions=sessions, default_timezone="UTC", max_daily_trades=10)
+
+
+def _series(count: int, seed: int = 3, gaps: bool = False) -> BarSeries:
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0.00005, 0.0006, count))
+    open_ = np.r_[close[0], close[:-1]]
+    times = int(datetime(2026, 1, 5, tzinfo=timezone.utc).timestamp()) + np.arange(count, dtype=np.int64) * 900
+    if gaps:
+        keep = rng.random(count) > 0.1
+        times, open_, close = times[keep], open_[keep], close[keep]
+    return BarSeries(times, open_, np.maximum(open_, close) + 0.0003, np.minimum(open_, close) - 0.0003, close, np.ones(len(times)))
+
+
+def test_h1_release_counts_follow_streaming_resampler():
+    series = _series(600, gaps=True)
+    resampler = StreamingResampler("M15", "H1")
+    released, expected = 0, []
+    for i in range(len(series)):
+        released += len(resampler.update_raw(int(series.time[i]), 0.0, 0.0, 0.0, 0.0, 0.0))
+        expected.append(released)
+    assert h1_release_counts(series.time).tolist() == expected
+
+
+def test_session_names_match_in_sessions_across_dst():
+    sessions = [
+        SessionConfig(name="LONDON", start=datetime.strptime("07:00", "%H:%M").time(), end=datetime.strptime("16:00", "%H:%M").time()),
+        SessionConfig(name="ASIA", start=datetime.strptime("23:00", "%H:%M").time(), end=datetime.strptime("06:00", "%H:%M").time()),
+    ]
+    start = int(datetime(2026, 3, 27, tzinfo=timezone.utc).timestamp())
+    times = start + np.arange(4 * 96, dtype=np.int64) * 900
+    names = session_names(times, sessions, "Europe/Dublin")
+    assert names.tolist() == [in_sessions(from_epoch(t), sessions, "Europe/Dublin") for t in times]
+
+
+def test_fast_backtest_matches_engine():
+    config = _config()
+    for series in (_series(1500), _series(1500, seed=8, gaps=True)):
+        report = parity_check(config, "EURUSD", series, start=100, length=1300)
+        assert report.slow
+        assert report.ok, report.mismatches
+
+
+def test_dry_run_takes_no_trades():
+    config = _config()
+    config.dry_run = True
+    assert fast_backtest(config, "EURUSD", _series(800)) == []
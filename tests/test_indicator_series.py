@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from bot.core.bar_series import BarSeries
+from bot.utils.indicators import (
+    atr,
+    atr_series,
+    ema,
+    ema_series,
+    range_compression,
+    range_compression_series,
+    rolling_high_low,
+    rolling_max,
+    rolling_min,
+    rsi,
+    rsi_series,
+    trend_strength,
+    trend_strength_series,
+)
+
+
+def _series(count: int, seed: int = 3) -> BarSeries:
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0, 0.0005, count))
+    if count > 230:
+        close[200:230] = close[199]  # flat run: zero-loss RSI windows
+    open_ = np.r_[close[:1], close[:-1]]
+    high = np.maximum(open_, close) + rng.uniform(0, 0.0004, count)
+    low = np.minimum(open_, close) - rng.uniform(0, 0.0004, count)
+    time = 1_767_225_600 + 900 * np.arange(count, dtype=np.int64)
+    return BarSeries(time, open_, high, low, close, np.full(count, 10.0))
+
+
+@pytest.mark.parametrize("count", [0, 10, 60, 600])
+def test_series_match_scalar_at_every_index(count):
+    bars = _series(count)
+    c = bars.close
+    atr_s = atr_series(bars.high, bars.low, c, 14)
+    ema_s = ema_series(c, 20)
+    rsi_s = rsi_series(c, 14)
+    high_s = rolling_max(bars.high, 12)
+    low_s = rolling_min(bars.low, 12)
+    trend_s = trend_strength_series(c, 20, 50)
+    comp_s = range_compression_series(c, 20)
+    for i in range(count):
+        prefix = bars[: i + 1]
+        assert atr_s[i] == atr(prefix, 14)
+        assert ema_s[i] == ema(prefix.close, 20)
+        assert rsi_s[i] == rsi(prefix.close, 14)
+        assert (high_s[i], low_s[i]) == rolling_high_low(prefix, 12)
+        assert trend_s[i] == trend_strength(prefix, 20, 50)
+        assert comp_s[i] == range_compression(prefix, 20)
+
+
+def test_series_match_scalar_on_trailing_windows():
+    # Scalars called on a 200-bar window (as the engine does) agree with the full-history series.
+    bars = _series(1000)
+    atr_s = atr_series(bars.high, bars.low, bars.close)
+    trend_s = trend_strength_series(bars.close)
+    for i in range(199, 1000, 37):
+        window = bars[i - 199 : i + 1]
+        assert atr_s[i] == atr(window)
+        assert trend_s[i] == trend_strength(window)
+
+
+def test_series_accept_plain_sequences():
+    values = [1.0, 2.0, 3.0, 2.5, 2.0]
+    assert rolling_max(values, 2).tolist() == [1.0, 2.0, 3.0, 3.0, 2.5]
+    assert ema_series(values, 10).tolist() == values
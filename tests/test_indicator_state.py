@@ -0,0 +1,63 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from bot.core.bar_series import BarSeries
+from bot.core.models import Bar
+from bot.utils.indicator_state import IndicatorBank, IndicatorSet
+from bot.utils.indicators import atr, ema, range_compression, rolling_high_low, rsi, trend_strength
+
+
+def _bars(count: int, seed: int = 7) -> list[Bar]:
+    rng = random.Random(seed)
+    start = datetime(2026, 1, 5, 0, 0)
+    price = 1.1
+    bars = []
+    for i in range(count):
+        open_ = price
+        price += rng.gauss(0, 0.0005)
+        # Flat stretches exercise the RSI zero-loss branch.
+        if 100 <= i < 120:
+            price = open_
+        bars.append(Bar(time=start + timedelta(minutes=15 * i), open=open_, high=max(open_, price) + 0.0002, low=min(open_, price) - 0.0002, close=price, volume=10))
+    return bars
+
+
+def _assert_matches(ind: IndicatorSet, window: list[Bar]) -> None:
+    closes = [b.close for b in window]
+    assert ind.atr(14) == pytest.approx(atr(window, 14), rel=1e-9, abs=1e-12)
+    assert ind.ema(20) == pytest.approx(ema(closes, 20), rel=1e-9)
+    assert ind.rsi(14) == pytest.approx(rsi(closes, 14), rel=1e-9)
+    assert ind.rolling_high_low(12) == rolling_high_low(window, 12)
+    assert ind.trend_strength(20, 50) == pytest.approx(trend_strength(window, 20, 50), rel=1e-7, abs=1e-12)
+    assert ind.range_compression(20) == pytest.approx(range_compression(window, 20), rel=1e-7, abs=1e-12)
+
+
+def test_streaming_indicators_match_scalar_functions():
+    bars = _bars(400)
+    bank = IndicatorBank()
+    for i in range(1, len(bars) + 1):
+        window = bars[max(0, i - 200) : i]
+        ind = bank.sync("EURUSD", "M15", window)
+        _assert_matches(ind, bars[:i])
+
+
+def test_forming_bar_is_replaced_not_appended():
+    bars = _bars(120)
+    bank = IndicatorBank()
+    bank.sync("EURUSD", "M15", bars[:-1])
+    forming = Bar(time=bars[-1].time, open=bars[-1].open, high=bars[-1].high, low=bars[-1].low, close=bars[-1].open, volume=1)
+    bank.sync("EURUSD", "M15", bars[:-1] + [forming])
+    ind = bank.sync("EURUSD", "M15", bars)
+    assert len(ind.history) == len(bars)
+    _assert_matches(ind, bars)
+
+
+def test_sync_reseeds_after_gap_and_accepts_series():
+    bars = _bars(600)
+    bank = IndicatorBank()
+    bank.sync("EURUSD", "M15", bars[:200])
+    ind = bank.sync("EURUSD", "M15", BarSeries.from_bars(bars[-200:]))
+    assert ind.last_time == int(BarSeries.from_bars(bars[-1:]).time[0])
+    _assert_matches(ind, bars[-200:])
@@ -0,0 +1,97 @@
+import json
+import logging
+import threading
+
+from bot.utils.logging import EventPolicy, JsonFormatter, log_event, set_event_policy, setup_logging, shutdown_logging
+
+
+class ListHandler(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.records = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append((record.getMessage(), record.levelno, dict(record.extra)))
+
+
+def _logger(name: str, policy: EventPolicy):
+    logger = logging.getLogger(name)
+    logger.handlers.clear()
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    handler = ListHandler()
+    logger.addHandler(handler)
+    set_event_policy(logger, policy)
+    return logger, handler
+
+
+def test_disabled_and_gated_events_skip_lazy_payloads():
+    calls = []
+
+    def payload():
+        calls.append(1)
+        return [1, 2, 3]
+
+    logger, handler = _logger("policy-test", EventPolicy(levels={"market_state": "DEBUG"}, disabled={"snd_zones"}))
+    log_event(logger, "snd_zones", zones=payload)
+    log_event(logger, "market_state", zones=payload)
+    assert calls == [] and handler.records == []
+
+    log_event(logger, "no_trade", zones=payload, reason="no_signal")
+    assert calls == [1]
+    assert handler.records == [("no_trade", logging.INFO, {"zones": [1, 2, 3], "reason": "no_signal"})]
+
+
+def test_sampling_emits_every_nth_event():
+    logger, handler = _logger("sample-test", EventPolicy(sample_every={"market_state": 3}))
+    for i in range(7):
+        log_event(logger, "market_state", i=i)
+        log_event(logger, "no_trade", i=i)
+    assert [r[2]["i"] for r in handler.records if r[0] == "market_state"] == [0, 3, 6]
+    assert sum(r[0] == "no_trade" for r in handler.records) == 7
+
+
+def test_queue_logging_writes_json_lines_after_shutdown(tmp_path):
+    logger = setup_logging(str(tmp_path), name="queue-test")
+    for i in range(50):
+        log_event(logger, "market_state", symbol="EURUSD", i=i)
+    shutdown_logging("queue-test")
+    lines = [json.loads(line) for line in (tmp_path / "bot.log").read_text().splitlines()]
+    assert [line["i"] for line in lines] == list(range(50))
+    assert lines[0]["message"] == "market_state" and lines[0]["symbol"] == "EURUSD"
+    for handler in logger.handlers:
+        handler.close()
+    logger.handlers.clear()
+
+
+def test_queued_record_is_snapshotted_at_log_time(tmp_path):
+    logger = setup_logging(str(tmp_path), name="freeze-test")
+    zones = [1]
+    payload = {"zones": 1}
+    logger.info("zones %s", zones, extra={"extra": payload})
+    zones.append(2)
+    payload["zones"] = 2
+    shutdown_logging("freeze-test")
+    line = json.loads((tmp_path / "bot.log").read_text())
+    assert line["message"] == "zones [1]" and line["zones"] == 1
+    for handler in logger.handlers:
+        handler.close()
+    logger.handlers.clear()
+
+
+def test_records_are_serialised_on_the_listener_thread(tmp_path, monkeypatch):
+    threads = []
+    original = JsonFormatter.format
+
+    def spy(self, record):
+        threads.append(threading.current_thread())
+        return original(self, record)
+
+    monkeypatch.setattr(JsonFormatter, "format", spy)
+    logger = setup_logging(str(tmp_path), name="thread-test")
+    log_event(logger, "market_state", symbol="EURUSD")
+    shutdown_logging("thread-test")
+    assert threads and threading.current_thread() not in threads
+    for handler in logger.handlers:
+        handler.close()
+    logger.handlers.clear()
@@ -0,0 +1,116 @@
+import time
+
+import numpy as np
+
+from bot.adapters import mt5_adapter
+from bot.adapters.bar_feed import BarRingBuffer
+from bot.adapters.mt5_adapter import MT5Adapter
+from bot.core.bar_series import BarSeries, from_epoch
+
+RATES_DTYPE = [
+    ("time", "<i8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("tick_volume", "<u8"),
+    ("spread", "<i4"),
+    ("real_volume", "<u8"),
+]
+
+
+class FakeMT5:
+    TIMEFRAME_M15 = 15
+
+    def __init__(self, count: int) -> None:
+        self.history = np.zeros(0, dtype=RATES_DTYPE)
+        self.requests = []
+        self.add(count)
+
+    def add(self, count: int) -> None:
+        start = int(self.history["time"][-1]) + 900 if len(self.history) else 1_700_000_100
+        rows = np.zeros(count, dtype=RATES_DTYPE)
+        rows["time"] = start + np.arange(count) * 900
+        rows["open"] = 1.1 + np.arange(count) * 1e-5
+        rows["close"] = rows["open"] + 2e-5
+        rows["high"] = rows["close"] + 1e-4
+        rows["low"] = rows["open"] - 1e-4
+        rows["tick_volume"] = 10
+        self.history = np.concatenate([self.history, rows])
+
+    def copy_rates_from_pos(self, symbol, timeframe, start, count):
+        self.requests.append(count)
+        return self.history[-count:].copy()
+
+    def symbol_info(self, symbol):
+        return object()
+
+    def symbol_select(self, symbol, enable):
+        return True
+
+
+def _expected(fake: FakeMT5, count: int):
+    return [
+        (from_epoch(r["time"]), float(r["open"]), float(r["high"]), float(r["low"]), float(r["close"]))
+        for r in fake.history[-count:]
+    ]
+
+
+def _actual(bars):
+    return [(b.time, b.open, b.high, b.low, b.close) for b in bars]
+
+
+def test_ring_buffer_views_are_contiguous():
+    buffer = BarRingBuffer(4)
+    for i in range(10):
+        buffer.append(i, i, i, i, float(i), 1.0)
+    view = buffer.view()
+    assert list(view.time) == [6, 7, 8, 9]
+    assert view.close.flags["C_CONTIGUOUS"]
+    buffer.replace_last(9, 0, 0, 0, 99.0, 1.0)
+    assert list(buffer.view(2).close) == [8.0, 99.0]
+
+
+def test_adapter_fetches_only_new_rows(monkeypatch):
+    fake = FakeMT5(1500)
+    monkeypatch.setattr(mt5_adapter, "mt5", fake)
+    adapter = MT5Adapter(bar_buffer_size=1000)
+
+    assert _actual(adapter.get_bars("EURUSD", "M15", 200)) == _expected(fake, 200)
+    assert fake.requests == [1000]
+
+    # Forming bar updates in place.
+    fake.history["close"][-1] += 0.001
+    assert _actual(adapter.get_bars("EURUSD", "M15", 200)) == _expected(fake, 200)
+    fake.add(1)
+    assert _actual(adapter.get_bars("EURUSD", "M15", 200)) == _expected(fake, 200)
+    fake.add(10)
+    assert _actual(adapter.get_bars("EURUSD", "M15", 300)) == _expected(fake, 300)
+    assert fake.requests == [1000, 2, 2, 2, 4, 8, 16]
+
+    view = adapter.get_bars_array("EURUSD", "M15", 300)
+    assert np.array_equal(view.time, fake.history["time"][-300:])
+    assert np.array_equal(view.close, fake.history["close"][-300:])
+    assert np.array_equal(BarSeries.from_rates(fake.history[-300:]).volume, view.volume)
+
+    # A gap wider than the buffer reloads it.
+    fake.add(3000)
+    fake.requests.clear()
+    assert _actual(adapter.get_bars("EURUSD", "M15", 200)) == _expected(fake, 200)
+    assert fake.requests[-1] == 1000
+
+
+def test_bar_and_array_paths_agree_on_times_off_utc(monkeypatch):
+    monkeypatch.setenv("TZ", "Asia/Kolkata")
+    time.tzset()
+    try:
+        fake = FakeMT5(300)
+        monkeypatch.setattr(mt5_adapter, "mt5", fake)
+        adapter = MT5Adapter(bar_buffer_size=300)
+        bars = adapter.get_bars("EURUSD", "M15", 50)
+        view = adapter.get_bars_array("EURUSD", "M15", 50)
+        assert [bar.time for bar in bars] == [view[i].time for i in range(len(view))]
+        assert bars[-1].time == from_epoch(fake.history["time"][-1])
+    finally:
+        monkeypatch.undo()
+        time.tzset()
@@ -0,0 +1,99 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from bot.backtest.fast_backtest import market_arrays
+from bot.backtest.optimizer import ParameterSpace, ResultStore, apply_params, optimize, run_trial
+from bot.backtest.runner import NullJournal, quiet_logger, simulate
+from bot.core.bar_series import BarSeries
+from bot.core.config import BotConfig, SessionConfig, SymbolConfig
+from bot.db.sqlite_store import SQLiteStore
+
+
+def _config() -> BotConfig:
+    symbol = SymbolConfig(
+        symbol="EURUSD",
+        spread_mode="pips",
+        max_spread=2.0,
+        min_spread_checks=2,
+        spread_spike_cooldown_minutes=10,
+        min_atr=0.0001,
+        max_atr=0.01,
+        min_stop_atr=0.1,
+        min_regime_confidence=0.1,
+        risk_per_trade=0.005,
+        max_daily_loss=0.05,
+        max_trades_per_day=5,
+        max_consecutive_losses=5,
+        min_rr=1.0,
+    )
+    sessions = [SessionConfig(name="ALL", start=datetime.strptime("00:00", "%H:%M").time(), end=datetime.strptime("23:59", "%H:%M").time())]
+    return BotConfig(symbols=[symbol], sessions=sessions, default_timezone="UTC", max_daily_trades=10)
+
+
+def _series(count: int) -> BarSeries:
+    rng = np.random.default_rng(3)
+    close = 1.1 + np.cumsum(rng.normal(0.00005, 0.0006, count))
+    open_ = np.r_[close[0], close[:-1]]
+    times = int(datetime(2026, 1, 5).timestamp()) + np.arange(count, dtype=np.int64) * 900
+    return BarSeries(times, open_, np.maximum(open_, close) + 0.0003, np.minimum(open_, close) - 0.0003, close, np.ones(count))
+
+
+def test_parameter_space_grid_and_random():
+    space = ParameterSpace(grid={"trend.rr": [1.5, 2.0], "range.lookback": [10, 20, 30]})
+    assert len(list(space.grid_points())) == 6
+    space.ranges["symbol.min_rr"] = (1.0, 2.0)
+    space.ranges["range.lookback"] = (10, 40)
+    points = space.sample(20, seed=1)
+    assert points == space.sample(20, seed=1)
+    assert all(1.0 <= p["symbol.min_rr"] <= 2.0 and isinstance(p["range.lookback"], int) for p in points)
+    with pytest.raises(ValueError):
+        list(space.grid_points())
+
+
+def test_apply_params_copies_config():
+    config = _config()
+    trial, strategies, sd_cfg = apply_params(config, {"trend.rr": 2.5, "range.lookback": 30, "symbol.min_rr": 1.7, "config.max_daily_trades": 4})
+    assert (strategies[0].rr, strategies[1].lookback) == (2.5, 30)
+    assert trial.symbols[0].min_rr == 1.7 and trial.max_daily_trades == 4
+    assert config.symbols[0].min_rr == 1.0 and config.max_daily_trades == 10
+    assert sd_cfg is None
+    with pytest.raises(ValueError):
+        apply_params(config, {"symbol.no_such_field": 1})
+
+
+def test_pooled_sweep_matches_serial_and_ranks(tmp_path):
+    config, series = _config(), _series(1000)
+    points = list(ParameterSpace(grid={"trend.rr": [1.2, 1.6], "range.lookback": [12, 20]}).grid_points())
+    store = ResultStore(str(tmp_path / "optimizer.sqlite"))
+    serial = optimize(config, "EURUSD", series, points, store, "serial", workers=1)
+    pooled = optimize(config, "EURUSD", series, points, store, "pooled", workers=2)
+    strip = lambda rows: [(r["trial"], r["params"], r["score"], r["trades"]) for r in rows]
+    assert strip(pooled) == strip(serial)
+    assert [r["score"] for r in serial] == sorted((r["score"] for r in serial), reverse=True)
+    assert len(serial) == 4
+
+    optimize(config, "EURUSD", series, points[:1], store, "stopped", max_drawdown=0.0, workers=1)
+    row = store.conn.execute("SELECT status, score FROM optimizer_trials WHERE run_id = 'stopped'").fetchone()
+    assert tuple(row) == ("stopped", None)
+    store.close()
+
+
+def test_trial_matches_engine_and_stops_on_drawdown():
+    config, series = _config(), _series(1500)
+    params = {"trend.rr": 1.4}
+    trial_config, strategies, _ = apply_params(config, params)
+    store = SQLiteStore(":memory:")
+    engine_trades = simulate(trial_config, "EURUSD", series, store, quiet_logger(), journal=NullJournal(), strategies=strategies)
+    first = simulate(trial_config, "EURUSD", series, store, quiet_logger(), journal=NullJournal(), strategies=strategies, on_trade=lambda trade: True)
+    store.close()
+    assert len(first) == 1
+
+    full = run_trial(config, "EURUSD", series, 0, params, market=market_arrays(config, series))
+    assert full.status == "ok"
+    assert (full.metrics["trades"], full.metrics["pnl"]) == (len(engine_trades), pytest.approx(sum(t["pnl"] for t in engine_trades)))
+
+    stopped = run_trial(config, "EURUSD", series, 1, params, max_drawdown=0.0)
+    assert stopped.status == "stopped"
+    assert 0 < stopped.metrics["trades"] < full.metrics["trades"]
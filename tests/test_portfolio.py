@@ -0,0 +1,86 @@
+from collections import Counter
+from dataclasses import replace
+from datetime import datetime, timezone
+
+import numpy as np
+
+from bot.backtest.portfolio import merged_bars, simulate_portfolio
+from bot.backtest.runner import NullJournal, quiet_logger
+from bot.core.bar_series import BarSeries, from_epoch
+from bot.core.config import BotConfig, SessionConfig, SymbolConfig
+from bot.db.sqlite_store import SQLiteStore
+
+
+def _symbol(name: str) -> SymbolConfig:
+    return SymbolConfig(
+        symbol=name,
+        spread_mode="pips",
+        max_spread=2.0,
+        min_spread_checks=2,
+        spread_spike_cooldown_minutes=10,
+        min_atr=0.0001,
+        max_atr=0.01,
+        min_stop_atr=0.1,
+        min_regime_confidence=0.1,
+        risk_per_trade=0.005,
+        max_daily_loss=0.05,
+        max_trades_per_day=5,
+        max_consecutive_losses=5,
+        min_rr=1.0,
+    )
+
+
+def _series(count: int, seed: int, drop: float = 0.0) -> BarSeries:
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0.00005, 0.0006, count))
+    open_ = np.r_[close[0], close[:-1]]
+    times = int(datetime(2026, 1, 5, tzinfo=timezone.utc).timestamp()) + np.arange(count, dtype=np.int64) * 900
+    keep = rng.random(count) >= drop
+    times, open_, close = times[keep], open_[keep], close[keep]
+    return BarSeries(times, open_, np.maximum(open_, close) + 0.0003, np.minimum(open_, close) - 0.0003, close, np.ones(len(times)))
+
+
+def test_merged_bars_group_each_timestamp_once():
+    bars = {"EURUSD": _series(300, 1, drop=0.2), "GBPUSD": _series(300, 2, drop=0.2)}
+    steps = list(merged_bars(bars))
+    times = [ts for ts, _ in steps]
+    assert times == sorted(set(times))
+    for symbol, series in bars.items():
+        indices = [i for _, group in steps for s, i in group if s == symbol]
+        assert indices == list(range(len(series)))
+    assert all(int(bars[s].time[i]) == ts for ts, group in steps for s, i in group)
+
+
+def test_portfolio_shares_global_trade_cap():
+    sessions = [SessionConfig(name="ALL", start=datetime.strptime("00:00", "%H:%M").time(), end=datetime.strptime("23:59", "%H:%M").time())]
+    symbols = ["EURUSD", "GBPUSD", "AUDUSD"]
+    config = BotConfig(symbols=[_symbol(s) for s in symbols], sessions=sessions, default_timezone="UTC", max_daily_trades=10)
+    bars = {symbol: _series(1500, seed) for seed, symbol in enumerate(symbols, start=3)}
+
+    def run(cfg):
+        store = SQLiteStore(":memory:")
+        try:
+            return simulate_portfolio(cfg, bars, store, quiet_logger(), journal=NullJournal())
+        finally:
+            store.close()
+
+    trades = run(config)
+    assert len({t["symbol"] for t in trades}) > 1
+
+    capped = run(replace(config, max_daily_trades=1))
+    per_day = Counter(t["entry_time"][:10] for t in capped)
+    assert capped and max(per_day.values()) == 1
+
+
+def test_portfolio_waits_for_every_symbol_to_start():
+    sessions = [SessionConfig(name="ALL", start=datetime.strptime("00:00", "%H:%M").time(), end=datetime.strptime("23:59", "%H:%M").time())]
+    config = BotConfig(symbols=[_symbol("EURUSD"), _symbol("GBPUSD")], sessions=sessions, default_timezone="UTC", max_daily_trades=10)
+    late = _series(1500, 2)[200:]
+    bars = {"EURUSD": _series(1500, 1), "GBPUSD": late}
+    store = SQLiteStore(":memory:")
+    try:
+        trades = simulate_portfolio(config, bars, store, quiet_logger(), journal=NullJournal())
+    finally:
+        store.close()
+    first = from_epoch(late.time[0]).isoformat()
+    assert trades and all(t["entry_time"] >= first for t in trades)
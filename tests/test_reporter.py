@@ -0,0 +1,76 @@
+import json
+import random
+import sqlite3
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from bot.db.sqlite_store import SQLiteStore
+from bot.reporting.reporter import DailyReporter
+
+
+def _fill(store, rng, days=4, per_day=15):
+    start = datetime(2026, 3, 2, 8)
+    for d in range(days):
+        for i in range(per_day):
+            ts = (start + timedelta(days=d, minutes=15 * i)).isoformat()
+            store.insert_trade({"symbol": "EURUSD", "strategy": "trend", "side": "BUY", "entry_time": ts, "pnl": round(rng.uniform(-40, 30), 2), "rr": 1.5})
+            store.insert_event(ts, "no_trade", f"EURUSD:{rng.choice(['no_signal', 'spread', 'ml_filter'])}")
+            store.insert_event(ts, "order", "trend:FILLED")
+        store.end_cycle()
+
+
+def _reference(conn, first, last):
+    rows = conn.execute("SELECT pnl, rr FROM trades WHERE substr(entry_time, 1, 10) BETWEEN ? AND ? ORDER BY entry_time, id", (first, last)).fetchall()
+    skips = conn.execute("SELECT payload FROM events WHERE event_type = 'no_trade' AND substr(time, 1, 10) BETWEEN ? AND ?", (first, last)).fetchall()
+    equity = peak = max_dd = 0.0
+    for pnl, _ in rows:
+        equity += pnl
+        peak = max(peak, equity)
+        max_dd = max(max_dd, peak - equity)
+    reasons = {}
+    for (payload,) in skips:
+        reason = payload.split(":")[-1]
+        reasons[reason] = reasons.get(reason, 0) + 1
+    return len(rows), sum(p for p, _ in rows), max_dd, reasons
+
+
+@pytest.mark.parametrize("first,last", [(date(2026, 3, 2), date(2026, 3, 2)), (date(2026, 3, 3), date(2026, 3, 5)), (date(2026, 3, 1), date(2026, 3, 9))])
+def test_summary_matches_full_scan(first, last):
+    store = SQLiteStore(":memory:")
+    _fill(store, random.Random(7))
+    summary = DailyReporter(store).summary(first, last)
+    trades, pnl, max_dd, reasons = _reference(store.conn, first.isoformat(), last.isoformat())
+    assert summary["trades"] == trades
+    assert summary["pnl"] == pytest.approx(pnl)
+    assert summary["max_drawdown"] == pytest.approx(max_dd)
+    assert summary["skip_reasons"] == reasons
+    assert summary["trades_skipped"] == sum(reasons.values())
+
+
+def test_daily_report_json_shape():
+    store = SQLiteStore(":memory:")
+    _fill(store, random.Random(1), days=1, per_day=3)
+    payload = json.loads(DailyReporter(store).daily_report_json(datetime(2026, 3, 2)))
+    assert payload["date"] == "2026-03-02"
+    assert payload["trades"] == 3
+    assert payload["trades_skipped"] == 3
+
+
+def test_old_database_is_migrated_and_rolled_up(tmp_path):
+    path = tmp_path / "trades.sqlite"
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE trades (id INTEGER PRIMARY KEY AUTOINCREMENT, symbol TEXT, strategy TEXT, side TEXT, entry_time TEXT, entry_price REAL, exit_time TEXT, exit_price REAL, volume REAL, pnl REAL, reason TEXT, rr REAL, tags TEXT, hold_minutes REAL)")
+        conn.execute("CREATE TABLE events (id INTEGER PRIMARY KEY AUTOINCREMENT, time TEXT, event_type TEXT, payload TEXT)")
+        conn.executemany("INSERT INTO trades (entry_time, pnl, rr) VALUES (?, ?, ?)", [("2026-03-02T09:00:00", 10.0, 2.0), ("2026-03-02T10:00:00", -25.0, 1.0)])
+        conn.executemany("INSERT INTO events (time, event_type, payload) VALUES (?, ?, ?)", [("2026-03-02T09:00:00", "no_trade", "GBPUSD:spread")] * 2)
+
+    store = SQLiteStore(str(path))
+    row = store.conn.execute("SELECT symbol, reason FROM events").fetchone()
+    assert tuple(row) == ("GBPUSD", "spread")
+    summary = DailyReporter(store).summary(date(2026, 3, 2))
+    assert (summary["trades"], summary["pnl"], summary["max_drawdown"]) == (2, -15.0, 25.0)
+    assert summary["skip_reasons"] == {"spread": 2}
+    store.insert_trade({"entry_time": "2026-03-02T11:00:00", "pnl": 5.0, "rr": 1.0})
+    assert DailyReporter(store).summary(date(2026, 3, 2))["trades"] == 3
+    store.close()
@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from bot.core.bar_series import BarSeries
+from bot.core.models import Bar
+from bot.utils.resample import MultiTimeframeResampler, StreamingResampler, resample_series
+
+
+def _m15(start: datetime, count: int, skip: tuple = ()) -> list[Bar]:
+    bars = []
+    for i in range(count):
+        if i in skip:
+            continue
+        price = 1.1 + i * 0.0001
+        bars.append(Bar(time=start + timedelta(minutes=15 * i), open=price, high=price + 0.0005, low=price - 0.0005, close=price + 0.0001, volume=10))
+    return bars
+
+
+def test_streaming_resampler_aligns_to_hour():
+    # Starts mid-hour: the first H1 bar only holds the 00:30 and 00:45 bars.
+    bars = _m15(datetime(2026, 1, 5, 0, 30), 6)
+    resampler = StreamingResampler("M15", "H1")
+    closed = []
+    for bar in bars:
+        closed.extend(resampler.update(bar))
+    assert [b.time for b in closed] == [datetime(2026, 1, 5, 0, 0), datetime(2026, 1, 5, 1, 0)]
+    assert closed[0].open == bars[0].open
+    assert closed[0].close == bars[1].close
+    assert closed[1].high == max(b.high for b in bars[2:6])
+    assert closed[1].volume == 40
+    assert resampler.forming is None
+
+
+def test_streaming_resampler_closes_on_gap():
+    # 01:45 is missing, so the 01:00 bar closes when 02:00 arrives.
+    bars = _m15(datetime(2026, 1, 5, 1, 0), 6, skip=(3,))
+    resampler = StreamingResampler("M15", "H1")
+    closed = []
+    for bar in bars:
+        closed.extend(resampler.update(bar))
+    assert [b.time for b in closed] == [datetime(2026, 1, 5, 1, 0)]
+    assert resampler.forming.time == datetime(2026, 1, 5, 2, 0)
+
+
+def test_batch_resample_matches_streaming():
+    bars = _m15(datetime(2026, 1, 5, 22, 45), 40, skip=(7, 8, 20))
+    multi = MultiTimeframeResampler("M15", ["H1", "H4"])
+    for bar in bars:
+        multi.update(bar)
+    series = BarSeries.from_bars(bars)
+    for tf in ("H1", "H4"):
+        batch = resample_series(series, "M15", tf)
+        assert batch.to_bars() == multi.series(tf).to_bars()
+
+
+def test_resample_rejects_lower_target():
+    with pytest.raises(ValueError):
+        StreamingResampler("H1", "M15")
@@ -0,0 +1,54 @@
+from bot.core.scheduler import BarCloseScheduler
+
+
+class FakeClock:
+    def __init__(self, start: float) -> None:
+        self.now = start
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class RecordingEngine:
+    def __init__(self) -> None:
+        self.calls = []
+        self.closed = []
+
+    def run_once(self, now, closed_timeframes=None) -> None:
+        self.calls.append(("run", now.timestamp()))
+        self.closed.append(closed_timeframes)
+
+    def supervise(self, now) -> None:
+        self.calls.append(("supervise", now.timestamp()))
+
+
+def test_next_close_uses_server_clock():
+    scheduler = BarCloseScheduler(RecordingEngine(), ["M15", "H4"], server_offset_seconds=2 * 3600)
+    # 01:59 UTC is 03:59 server time: the M15 and H4 bars both close at 04:00 server (02:00 UTC).
+    close, closed = scheduler.next_close(3600 + 59 * 60)
+    assert close == 2 * 3600
+    assert closed == ["M15", "H4"]
+    close, closed = scheduler.next_close(2 * 3600)
+    assert close == 2 * 3600 + 900 and closed == ["M15"]
+
+
+def test_runs_after_each_close_and_supervises_between():
+    clock = FakeClock(1000.0)
+    engine = RecordingEngine()
+    scheduler = BarCloseScheduler(engine, ["M15"], grace_seconds=2.0, supervise_interval=300.0, clock=clock.time, sleep=clock.sleep)
+    scheduler.run(max_closes=2)
+    runs = [ts for kind, ts in engine.calls if kind == "run"]
+    assert runs == [1000.0, 1802.0, 2702.0]
+    supervised = [ts for kind, ts in engine.calls if kind == "supervise"]
+    assert supervised == [1300.0, 1600.0, 2102.0, 2402.0]
+
+
+def test_cycles_receive_closed_timeframes():
+    clock = FakeClock(3 * 3600 + 1000.0)
+    engine = RecordingEngine()
+    scheduler = BarCloseScheduler(engine, ["M15", "H1"], grace_seconds=1.0, supervise_interval=900.0, clock=clock.time, sleep=clock.sleep)
+    scheduler.run(max_closes=4)
+    assert engine.closed == [None, ["M15"], ["M15"], ["M15", "H1"], ["M15"]]
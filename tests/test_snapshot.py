@@ -0,0 +1,57 @@
+from collections import Counter
+from datetime import datetime, timedelta
+
+from bot.adapters.paper_broker import PaperBroker
+from bot.core.models import Bar, Tick
+from bot.core.snapshot import MarketSnapshot
+
+
+class CountingBroker(PaperBroker):
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = Counter()
+
+    def get_bars_array(self, symbol, timeframe, count):
+        self.calls["get_bars"] += 1
+        return super().get_bars_array(symbol, timeframe, count)
+
+    def get_tick(self, symbol):
+        self.calls["get_tick"] += 1
+        return super().get_tick(symbol)
+
+    def get_account_info(self):
+        self.calls["get_account_info"] += 1
+        return super().get_account_info()
+
+    def symbol_info(self, symbol):
+        self.calls["symbol_info"] += 1
+        return super().symbol_info(symbol)
+
+
+def _bars(count: int):
+    start = datetime(2026, 1, 28)
+    return [Bar(time=start + timedelta(minutes=15 * i), open=1.1, high=1.1002, low=1.0998, close=1.1 + i * 1e-6, volume=1) for i in range(count)]
+
+
+def test_snapshot_fetches_each_item_once():
+    broker = CountingBroker()
+    broker.seed_bars("EURUSD", "M15", _bars(400))
+    broker.seed_tick("EURUSD", Tick(datetime(2026, 1, 28), 1.1, 1.1001))
+    snapshot = MarketSnapshot(broker)
+
+    assert len(snapshot.get_bars("EURUSD", "M15", 300)) == 300
+    window = snapshot.get_bars("EURUSD", "M15", 200)
+    assert window.to_bars() == broker.get_bars("EURUSD", "M15", 200)
+    snapshot.get_tick("EURUSD")
+    snapshot.get_tick("EURUSD")
+    snapshot.symbol_info("EURUSD")
+    snapshot.symbol_info("EURUSD")
+    snapshot.get_account_info()
+    snapshot.get_account_info()
+    assert broker.calls == Counter(get_bars=1, get_tick=1, symbol_info=1, get_account_info=1)
+
+    # A larger window than any fetched so far goes back to the broker.
+    assert len(snapshot.get_bars("EURUSD", "M15", 400)) == 400
+    snapshot.invalidate_account()
+    snapshot.get_account_info()
+    assert broker.calls["get_bars"] == 2 and broker.calls["get_account_info"] == 2
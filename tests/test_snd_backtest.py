@@ -0,0 +1,38 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from bot.backtest.snd_backtest import backtest_snd
+from bot.core.bar_series import BarSeries, from_epoch
+from bot.snd.config import load_supply_demand_config
+
+
+def _series(count: int, seed: int = 1) -> BarSeries:
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0, 0.0007, count))
+    open_ = np.r_[close[0], close[:-1]]
+    times = int(datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp()) + np.arange(count, dtype=np.int64) * 900
+    high = np.maximum(open_, close) + rng.random(count) * 0.0004
+    low = np.minimum(open_, close) - rng.random(count) * 0.0004
+    return BarSeries(times, open_, high, low, close, np.ones(count))
+
+
+def test_zones_are_used_only_after_their_impulse_closes():
+    cfg = load_supply_demand_config("configs/supply_demand.json")
+    trades = backtest_snd("EURUSD", cfg, _series(20000))
+    assert trades
+    impulse_close = timedelta(hours=4) * (cfg.zone.impulsive_min_candles + 1)
+    for trade in trades:
+        created = from_epoch(int(trade.zone_id.rsplit("-", 1)[1]))
+        assert trade.entry_time + timedelta(minutes=15) >= created + impulse_close
+
+
+def test_results_do_not_depend_on_future_bars_or_chunking():
+    cfg = load_supply_demand_config("configs/supply_demand.json")
+    series = _series(20000)
+    full = backtest_snd("EURUSD", cfg, series, max_hold_minutes=0)
+    assert backtest_snd("EURUSD", cfg, series, max_hold_minutes=0, chunk_size=777) == full
+
+    prefix = backtest_snd("EURUSD", cfg, series[:12000], max_hold_minutes=0)
+    closed = [t for t in prefix if t.reason != "end_of_data"]
+    assert closed and full[: len(closed)] == closed
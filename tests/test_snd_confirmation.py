@@ -1,8 +1,10 @@
 from datetime import datetime, timedelta
 
+import numpy as np
+
 from bot.core.models import Bar
 from bot.snd.zone_models import Zone, ZoneType
-from bot.snd.confirmation import ConfirmationConfig, bos_confirmed, rejection_confirmed
+from bot.snd.confirmation import ConfirmationConfig, bos_confirmed, confirmation_passed, confirmation_signals, confirmation_window, rejection_confirmed
 
 
 def _bars_bos():
@@ -58,3 +60,25 @@ def test_rejection_confirmation():
     )
     cfg = ConfirmationConfig(require_rejection=True, wick_body_ratio=2.0)
     assert rejection_confirmed([bar], zone, cfg) is True
+
+
+def test_confirmation_signals_match_per_bar_checks():
+    rng = np.random.default_rng(2)
+    t = datetime(2026, 1, 1, 0, 0)
+    bars, price = [], 1.1
+    for i in range(200):
+        open_ = price
+        price += rng.normal(0, 0.0005)
+        wick = rng.random(2) * 0.0015
+        bars.append(Bar(time=t + timedelta(minutes=15 * i), open=open_, high=max(open_, price) + wick[0], low=min(open_, price) - wick[1], close=price, volume=100))
+    zones = [
+        Zone(id=f"z-{side.value}", symbol="EURUSD", zone_type=side, timeframe="H4", created_at=t, lower=1.0, upper=1.2, base_start=t, base_end=t, impulse_size=0.01, atr=0.001, score=0.5)
+        for side in (ZoneType.DEMAND, ZoneType.SUPPLY)
+    ]
+    for cfg in (ConfirmationConfig(), ConfirmationConfig(require_bos=False, require_rejection=True), ConfirmationConfig(require_rejection=True, swing_lookback=3)):
+        signals = confirmation_signals(bars, cfg)
+        for i in range(len(bars)):
+            tail = confirmation_signals(bars[max(0, i + 1 - confirmation_window(cfg)) : i + 1], cfg)
+            for zone in zones:
+                assert signals.passed(zone.zone_type, i) == confirmation_passed(bars[: i + 1], zone, cfg)
+                assert tail.passed(zone.zone_type) == signals.passed(zone.zone_type, i)
@@ -1,8 +1,12 @@
 from datetime import datetime, timedelta
 
+import numpy as np
+
+from bot.core.bar_series import BarSeries
 from bot.core.models import Bar
 from bot.snd.zone_detector import detect_zones, update_zone_touches
 from bot.snd.zone_models import ZoneConfig, ZoneType
+from zone_detector_reference import detect_zones_loop
 
 
 def _bars_db_rally(count: int = 10):
@@ -41,3 +45,33 @@ def test_zone_touches_disable():
     zone = update_zone_touches(zone, (zone.lower + zone.upper) / 2, cfg)
     zone = update_zone_touches(zone, (zone.lower + zone.upper) / 2, cfg)
     assert zone.active is False
+
+
+def _random_bars(count: int, seed: int):
+    rng = np.random.default_rng(seed)
+    t = datetime(2026, 1, 1, 0, 0)
+    price = 1.1000
+    bars = []
+    for _ in range(count):
+        open_ = price
+        price += rng.normal(0, 0.0008)
+        high = max(open_, price) + abs(rng.normal(0, 0.0003))
+        low = min(open_, price) - abs(rng.normal(0, 0.0003))
+        bars.append(Bar(time=t, open=open_, high=high, low=low, close=price, volume=100))
+        t += timedelta(hours=4)
+    return bars
+
+
+def test_vectorized_detection_matches_loop():
+    configs = [
+        ZoneConfig(),
+        ZoneConfig(base_min=1, base_max=4, impulsive_min_candles=1, impulse_atr_mult=0.5, impulse_min_pips=3),
+        ZoneConfig(base_min=2, base_max=3, impulsive_min_candles=2, zone_body_rule="wick", max_base_atr_mult=5.0),
+    ]
+    for seed in range(4):
+        bars = _random_bars(400, seed)
+        for cfg in configs:
+            expected = detect_zones_loop("EURUSD", "H4", bars, cfg)
+            assert detect_zones("EURUSD", "H4", bars, cfg) == expected
+            assert detect_zones("EURUSD", "H4", BarSeries.from_bars(bars), cfg) == expected
+    assert detect_zones("EURUSD", "H4", _bars_db_rally(), ZoneConfig(base_max=8)).zones == []
@@ -0,0 +1,74 @@
+from datetime import datetime
+
+import numpy as np
+
+from bot.snd.zone_detector import _overlap_ratio, dedupe_zones
+from bot.snd.zone_index import ZoneIndex
+from bot.snd.zone_models import Zone, ZoneConfig, ZoneType
+
+
+def _zones(count: int, seed: int = 11):
+    rng = np.random.default_rng(seed)
+    t = datetime(2026, 1, 1)
+    zones = []
+    for i in range(count):
+        lower = float(np.round(1.1 + rng.uniform(0, 0.02), 5))
+        width = float(np.round(rng.choice([0.0, rng.uniform(0.0001, 0.002)]), 5))
+        zones.append(
+            Zone(
+                id=f"Z{i}",
+                symbol="EURUSD",
+                zone_type=ZoneType.DEMAND,
+                timeframe="H4",
+                created_at=t,
+                lower=lower,
+                upper=lower + width,
+                base_start=t,
+                base_end=t,
+                impulse_size=0.001,
+                atr=0.001,
+                score=float(rng.uniform()),
+            )
+        )
+    return zones
+
+
+def test_index_queries_match_brute_force():
+    zones = _zones(400)
+    index = ZoneIndex(zones[:200])
+    for zone in zones[200:]:
+        index.add(zone)
+    rng = np.random.default_rng(5)
+    for price in list(rng.uniform(1.099, 1.123, 200)) + [z.lower for z in zones[:20]] + [z.upper for z in zones[:20]]:
+        assert {z.id for z in index.containing(price)} == {z.id for z in zones if z.contains(price)}
+    for zone in zones[:100]:
+        expected = {z.id for z in zones if z.lower < zone.upper and z.upper > zone.lower}
+        assert {z.id for z in index.overlapping(zone.lower, zone.upper)} == expected
+
+
+def test_indexed_dedupe_matches_pairwise():
+    zones = _zones(600, seed=4)
+    for threshold in (0.0, 0.2, 0.4, 0.9):
+        cfg = ZoneConfig(overlap_threshold=threshold)
+        filtered = []
+        for z in sorted(zones, key=lambda x: x.score, reverse=True):
+            if not any(_overlap_ratio(z, other) >= threshold for other in filtered):
+                filtered.append(z)
+        assert dedupe_zones(zones, cfg) == filtered
+
+
+def test_one_wide_zone_does_not_widen_every_query(monkeypatch):
+    zones = _zones(2000, seed=7)
+    for i, zone in enumerate(zones):
+        zone.lower = 1.1 + i * 0.0001
+        zone.upper = zone.lower + 0.00005
+    zones[500].upper = 1.5
+    index = ZoneIndex(zones)
+
+    checked = []
+    contains = Zone.contains
+    monkeypatch.setattr(Zone, "contains", lambda self, price: checked.append(self.id) or contains(self, price))
+    for price in (1.12502, 1.15002, 1.29):
+        checked.clear()
+        assert {z.id for z in index.containing(price)} == {z.id for z in zones if contains(z, price)}
+        assert len(checked) < 100
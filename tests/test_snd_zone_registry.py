@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from bot.core.bar_series import BarSeries
+from bot.core.models import Bar
+from bot.snd.zone_detector import detect_zones
+from bot.snd.zone_models import ZoneConfig
+from bot.snd.zone_registry import ZoneRegistry
+
+
+def _bars(count: int, seed: int = 3):
+    rng = np.random.default_rng(seed)
+    t = datetime(2026, 1, 1, 0, 0)
+    price = 1.1000
+    bars = []
+    for _ in range(count):
+        open_ = price
+        price += rng.normal(0, 0.0008)
+        high = max(open_, price) + abs(rng.normal(0, 0.0003))
+        low = min(open_, price) - abs(rng.normal(0, 0.0003))
+        bars.append(Bar(time=t, open=open_, high=high, low=low, close=price, volume=100))
+        t += timedelta(hours=4)
+    return bars
+
+
+def _keys(zones):
+    return sorted((z.id, z.base_start, z.lower, z.upper) for z in zones)
+
+
+def test_first_update_matches_full_detection():
+    bars = _bars(300)
+    cfg = ZoneConfig()
+    registry = ZoneRegistry(cfg)
+    zones = registry.update("EURUSD", "H4", BarSeries.from_bars(bars), 0.0001)
+    assert zones == detect_zones("EURUSD", "H4", bars, cfg).zones
+
+
+def test_incremental_scan_finds_the_same_bases():
+    # ATR-independent thresholds and no de-duplication, so every cycle sees the same candidates.
+    cfg = ZoneConfig(impulse_atr_mult=1e9, max_base_atr_mult=1e9, impulse_min_pips=5, overlap_threshold=2.0)
+    bars = _bars(260)
+    registry = ZoneRegistry(cfg)
+    for end in range(40, len(bars) + 1):
+        registry.update("EURUSD", "H4", bars[:end], 0.0001)
+        # Repeated calls within the same bar are no-ops.
+        registry.update("EURUSD", "H4", bars[:end], 0.0001)
+    expected = detect_zones("EURUSD", "H4", bars, cfg).zones
+    assert expected
+    assert _keys(registry.book("EURUSD", "H4").zones) == _keys(expected)
+
+
+def test_touches_count_entries_and_persist():
+    cfg = ZoneConfig(max_touches=2)
+    bars = _bars(300)
+    registry = ZoneRegistry(cfg)
+    zone = registry.update("EURUSD", "H4", bars, 0.0001)[0]
+    mid = (zone.lower + zone.upper) / 2
+    outside = zone.upper + 1.0
+    for price in (mid, mid, outside, mid, mid):
+        registry.touch("EURUSD", "H4", price)
+    assert zone.touches == 2 and zone.active
+    registry.update("EURUSD", "H4", bars, 0.0001)
+    registry.touch("EURUSD", "H4", outside)
+    registry.touch("EURUSD", "H4", mid)
+    assert zone.touches == 3
+    assert zone not in registry.active_zones("EURUSD", "H4")
@@ -0,0 +1,46 @@
+import sqlite3
+
+from bot.db.sqlite_store import SQLiteStore
+
+
+def _trade(i: int) -> dict:
+    return {"symbol": "EURUSD", "strategy": "trend", "side": "BUY", "entry_time": f"2026-01-01T00:{i:02d}:00", "pnl": float(i), "tags": ["a", "b"]}
+
+
+def test_cycles_are_written_in_order_by_the_background_writer(tmp_path):
+    path = tmp_path / "trades.sqlite"
+    store = SQLiteStore(str(path))
+    assert store.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    for cycle in range(20):
+        for symbol in ("EURUSD", "GBPUSD"):
+            store.insert_event(f"2026-01-01T00:{cycle:02d}:00", "no_trade", f"{symbol}:no_signal")
+        if cycle % 5 == 0:
+            store.insert_trade(_trade(cycle))
+        store.end_cycle()
+    store.flush()
+    events = store.conn.execute("SELECT time, payload FROM events ORDER BY id").fetchall()
+    assert len(events) == 40
+    assert [tuple(r) for r in events[:2]] == [("2026-01-01T00:00:00", "EURUSD:no_signal"), ("2026-01-01T00:00:00", "GBPUSD:no_signal")]
+    trades = store.conn.execute("SELECT pnl, tags FROM trades ORDER BY id").fetchall()
+    assert [tuple(r) for r in trades] == [(0.0, "a,b"), (5.0, "a,b"), (10.0, "a,b"), (15.0, "a,b")]
+    store.close()
+
+
+def test_close_flushes_rows_from_an_unfinished_cycle(tmp_path):
+    path = tmp_path / "trades.sqlite"
+    store = SQLiteStore(str(path))
+    store.insert_event("2026-01-01T00:00:00", "order", "trend:FILLED")
+    store.insert_trade(_trade(1))
+    store.close()
+    store.close()
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM events").fetchone()[0] == 1
+        assert conn.execute("SELECT COUNT(*) FROM trades").fetchone()[0] == 1
+
+
+def test_in_memory_store_writes_inline():
+    store = SQLiteStore(":memory:")
+    store.insert_event("2026-01-01T00:00:00", "no_trade", "EURUSD:no_signal")
+    store.end_cycle()
+    assert store.conn.execute("SELECT COUNT(*) FROM events").fetchone()[0] == 1
+    store.close()
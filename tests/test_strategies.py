@@ -3,6 +3,8 @@ from datetime import datetime, timedelta
 from bot.core.models import Bar, MarketState, Regime
 from bot.strategies.trend import TrendStrategy
 from bot.strategies.range import RangeStrategy
+from bot.strategies.supply_demand_strategy import SupplyDemandStrategy
+from bot.snd.config import SupplyDemandConfig
 
 
 def _bars(start: datetime, count: int, step: float, base: float = 1.1000) -> list[Bar]:
@@ -70,3 +72,27 @@ def test_range_strategy_generates_signal():
     strat = RangeStrategy()
     signal = strat.generate(state, bars, [])
     assert signal is not None
+
+
+def test_supply_demand_rescans_zones_only_on_htf_close():
+    strategy = SupplyDemandStrategy(SupplyDemandConfig(enable=True, htf_timeframes=["H4"]))
+    scans = []
+    update = strategy.zones.update
+    strategy.zones.update = lambda *args: scans.append(args[1]) or update(*args)
+    h4 = _bars(datetime(2026, 1, 1, 0, 0), 60, 0.0003)
+    m15 = _bars(datetime(2026, 1, 10, 0, 0), 60, 0.0001)
+    state = MarketState(
+        symbol="EURUSD",
+        time=m15[-1].time,
+        regime_primary=Regime.TREND,
+        regime_secondary=Regime.LOW_VOL,
+        trend_strength=0.001,
+        volatility=0.001,
+        range_compression=0.001,
+        return_1=0.0001,
+        session="LONDON",
+        confidence=0.9,
+    )
+    for closed in (None, {"M15"}, {"M15"}, {"M15", "H4"}):
+        strategy.generate(state, m15, [], context={"bars": {"M15": m15, "H4": h4}, "closed_timeframes": closed})
+    assert scans == ["H4", "H4"]
@@ -0,0 +1,87 @@
+import gzip
+import json
+import threading
+from datetime import date
+
+from bot.storage import trade_journal
+from bot.storage.trade_journal import TradeJournal
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_writes_are_buffered_until_a_threshold(tmp_path):
+    clock = Clock()
+    path = tmp_path / "trades.jsonl"
+    journal = TradeJournal(str(path), flush_bytes=10_000, flush_interval=5.0, clock=clock)
+    journal.write({"symbol": "EURUSD", "action": "skip"})
+    journal.write({"symbol": "GBPUSD", "action": "skip"})
+    assert path.read_text() == ""
+    clock.now = 6.0
+    journal.write({"symbol": "USDJPY", "action": "enter"})
+    assert [r["symbol"] for r in _lines(path)] == ["EURUSD", "GBPUSD", "USDJPY"]
+    journal.write({"symbol": "EURUSD", "action": "skip"})
+    journal.close()
+    assert len(_lines(path)) == 4
+
+
+def test_rotates_by_size_and_day_with_compression(tmp_path):
+    day = [date(2026, 3, 2)]
+    path = tmp_path / "trades.jsonl"
+    journal = TradeJournal(str(path), max_bytes=200, compress=True, flush_bytes=0, today=lambda: day[0])
+    for i in range(10):
+        journal.write({"i": i, "reason": "no_signal"})
+    day[0] = date(2026, 3, 3)
+    journal.write({"i": 10, "reason": "no_signal"})
+    journal.close()
+
+    segments = sorted(tmp_path.glob("trades.2026-03-02.*.jsonl.gz"), key=lambda p: int(p.name.split(".")[2]))
+    assert len(segments) >= 2
+    rotated = [json.loads(line) for seg in segments for line in gzip.open(seg, "rt")]
+    assert all(seg.stat().st_size > 0 for seg in segments)
+    assert [r["i"] for r in rotated] == list(range(10))
+    assert [r["i"] for r in _lines(path)] == [10]
+
+
+def test_flush_if_due_writes_out_a_quiet_buffer(tmp_path):
+    clock = Clock()
+    path = tmp_path / "trades.jsonl"
+    journal = TradeJournal(str(path), flush_bytes=10_000, flush_interval=5.0, clock=clock)
+    journal.write({"symbol": "EURUSD", "action": "skip"})
+    journal.flush_if_due()
+    assert path.read_text() == ""
+    clock.now = 5.0
+    journal.flush_if_due()
+    assert [r["symbol"] for r in _lines(path)] == ["EURUSD"]
+    journal.close()
+
+
+def test_rotation_does_not_wait_for_compression(tmp_path, monkeypatch):
+    release = threading.Event()
+    original = trade_journal._gzip_segment
+
+    def slow_gzip(segment):
+        release.wait(5)
+        original(segment)
+
+    monkeypatch.setattr(trade_journal, "_gzip_segment", slow_gzip)
+    path = tmp_path / "trades.jsonl"
+    journal = TradeJournal(str(path), max_bytes=100, compress=True, flush_bytes=0)
+    for i in range(4):
+        journal.write({"i": i, "reason": "no_signal"})
+    assert not release.is_set() and list(tmp_path.glob("*.gz")) == []
+    release.set()
+    journal.close()
+    segments = list(tmp_path.glob("trades.*.jsonl.gz"))
+    assert segments and list(tmp_path.glob("trades.*.1.jsonl")) == []
+    rotated = sorted(json.loads(line)["i"] for seg in segments for line in gzip.open(seg, "rt"))
+    assert rotated + [r["i"] for r in _lines(path)] == [0, 1, 2, 3]
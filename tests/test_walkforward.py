@@ -0,0 +1,58 @@
+from datetime import datetime
+
+import numpy as np
+
+from bot.backtest.shared_bars import SharedBarArrays
+from bot.backtest.walkforward import generate_splits, run_walkforward
+from bot.core.bar_series import BarSeries
+from bot.core.config import BotConfig, SessionConfig, SymbolConfig
+
+
+def _config() -> BotConfig:
+    symbol = SymbolConfig(
+        symbol="EURUSD",
+        spread_mode="pips",
+        max_spread=2.0,
+        min_spread_checks=2,
+        spread_spike_cooldown_minutes=10,
+        min_atr=0.0001,
+        max_atr=0.01,
+        min_stop_atr=0.1,
+        min_regime_confidence=0.1,
+        risk_per_trade=0.005,
+        max_daily_loss=0.05,
+        max_trades_per_day=5,
+        max_consecutive_losses=5,
+        min_rr=1.0,
+    )
+    sessions = [SessionConfig(name="ALL", start=datetime.strptime("00:00", "%H:%M").time(), end=datetime.strptime("23:59", "%H:%M").time())]
+    return BotConfig(symbols=[symbol], sessions=sessions, default_timezone="UTC", max_daily_trades=10)
+
+
+def _series(count: int) -> BarSeries:
+    rng = np.random.default_rng(3)
+    close = 1.1 + np.cumsum(rng.normal(0.00005, 0.0006, count))
+    open_ = np.r_[close[0], close[:-1]]
+    times = int(datetime(2026, 1, 5).timestamp()) + np.arange(count, dtype=np.int64) * 900
+    return BarSeries(times, open_, np.maximum(open_, close) + 0.0003, np.minimum(open_, close) - 0.0003, close, np.ones(count))
+
+
+def test_shared_bars_round_trip():
+    series = _series(50)
+    with SharedBarArrays.create(series) as shared:
+        attached = SharedBarArrays.attach(shared.handle)
+        view = attached.series()
+        assert np.array_equal(view.time, series.time)
+        assert np.array_equal(view.close, series.close)
+        assert view[10] == series[10]
+        del view
+        attached.close()
+
+
+def test_pooled_walkforward_matches_serial():
+    config, series = _config(), _series(1400)
+    serial = run_walkforward(config, "EURUSD", series, train_size=600, test_size=200, step=200, workers=1)
+    pooled = run_walkforward(config, "EURUSD", series, train_size=600, test_size=200, step=200, workers=2)
+    assert len(serial.splits) == len(generate_splits(1400, 600, 200, 200)) == 4
+    assert pooled.to_dict() == serial.to_dict()
+    assert serial.aggregate["trades"] == sum(len(r.test_trades) for r in serial.splits) > 0